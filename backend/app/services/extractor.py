@@ -1,4 +1,5 @@
 import re
+from app.services.skill_matcher import SkillMatcher
 
 KNOWN_SKILLS = [
     "python", "java", "c++", "sql",
@@ -7,6 +8,8 @@ KNOWN_SKILLS = [
     "scikit-learn"
 ]
 
+SKILL_MATCHER = SkillMatcher(KNOWN_SKILLS)
+
 LOCATIONS = ["bhubaneswar", "delhi", "mumbai", "cuttack"]
 
 def extract_candidate_profile(resume_text: str):
@@ -14,7 +17,7 @@ def extract_candidate_profile(resume_text: str):
     text = resume_text.lower()
 
     # Skill extraction
-    skills = [skill for skill in KNOWN_SKILLS if skill in text]
+    skills = SKILL_MATCHER.extract(text)
 
     # Experience extraction
     exp_match = re.search(r"(\\d+)\\s+(years|year)", text)
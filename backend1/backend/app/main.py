@@ -4,6 +4,7 @@ from fastapi import FastAPI, UploadFile, File
 import pdfplumber
 import os
 import re
+from app.skill_matcher import SkillMatcher
 
 print("RUNNING ADVANCED SINGLE-FILE ATS")
 
@@ -25,6 +26,8 @@ KNOWN_SKILLS = [
     "spring boot", "django"
 ]
 
+SKILL_MATCHER = SkillMatcher(KNOWN_SKILLS)
+
 LOCATIONS = ["delhi", "mumbai", "bangalore", "remote"]
 
 # ----------------------------
@@ -74,8 +77,7 @@ def extract_text_from_pdf(file_path: str) -> str:
 
 
 def extract_skills(text):
-    text = text.lower()
-    return [skill for skill in KNOWN_SKILLS if skill in text]
+    return SKILL_MATCHER.extract(text)
 
 
 def extract_experience(text):
@@ -0,0 +1,161 @@
+"""
+DomainX AI — Dynamic micro-batching for resume embeddings
+
+Concurrent /analyze-text requests each need one MiniLM forward pass. Instead of
+encoding them one after another, requests are queued and flushed together as a
+single batched encode as soon as either `max_batch_size` texts are waiting or
+the oldest one has waited `max_wait_ms`. Every caller gets its own embedding
+row back through an asyncio future.
+
+The queue is bounded: when `max_queue` texts are already waiting, `encode`
+raises `InferenceQueueFull` straight away.
+"""
+
+import asyncio
+import logging
+import time
+
+from prometheus_client import Histogram
+
+from inference import InferenceQueueFull
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# METRICS — used to tune batch size / wait time
+# ============================================================
+BATCH_SIZE = Histogram(
+    "ml_encode_batch_size",
+    "Number of resumes encoded per micro-batch flush",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+QUEUE_WAIT = Histogram(
+    "ml_encode_queue_wait_seconds",
+    "Time a resume waited in the micro-batch queue before its batch was flushed",
+    buckets=(0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25),
+)
+
+
+class MicroBatcher:
+    """
+    Coalesces single-text encode requests into batched encode calls.
+
+    Args:
+        encode_fn: Blocking callable taking a list of texts and returning an
+            (N, dim) numpy array. It runs off the event loop.
+        max_batch_size (int): Flush as soon as this many texts are queued.
+        max_wait_ms (float): Flush once the oldest queued text waited this long.
+        max_queue (int): Texts allowed to wait for a flush; 0 means unbounded.
+        executor (InferenceExecutor | None): Where `encode_fn` runs. Defaults
+            to the event loop's default thread pool.
+    """
+
+    def __init__(self, encode_fn, max_batch_size=32, max_wait_ms=5.0,
+                 max_queue=0, executor=None):
+        self.encode_fn = encode_fn
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, float(max_wait_ms)) / 1000.0
+        self.max_queue = max(0, int(max_queue))
+        self.executor = executor
+        self._queue = None
+        self._worker = None
+
+    async def start(self):
+        """Start the background flush loop on the running event loop."""
+        if self._worker is not None:
+            return
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._worker = asyncio.create_task(self._run())
+        logger.info(
+            f"✅ Micro-batcher started (max_batch_size={self.max_batch_size}, "
+            f"max_wait_ms={self.max_wait * 1000:g})"
+        )
+
+    async def stop(self):
+        """Stop the flush loop; queued requests are failed."""
+        if self._worker is None:
+            return
+        self._worker.cancel()
+        try:
+            await self._worker
+        except asyncio.CancelledError:
+            pass
+        self._worker = None
+
+        while not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Micro-batcher stopped"))
+
+    async def encode(self, text):
+        """
+        Queue one text and wait for its embedding (1-D numpy array).
+
+        Raises:
+            InferenceQueueFull: If the batch queue is at `max_queue`.
+        """
+        if self._worker is None:
+            raise RuntimeError("Micro-batcher is not running")
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((text, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            retry_after = self.executor.retry_after if self.executor else 1
+            raise InferenceQueueFull(retry_after)
+        return await future
+
+    async def _collect(self):
+        """Wait for the first request, then gather more until size or time limit."""
+        loop = asyncio.get_running_loop()
+        batch = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                # Still drain anything that is already waiting
+                if self._queue.empty():
+                    break
+                batch.append(self._queue.get_nowait())
+                continue
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _flush(self, batch):
+        loop = asyncio.get_running_loop()
+        flushed_at = time.perf_counter()
+
+        # Callers that already gave up (client disconnect) are dropped
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+
+        BATCH_SIZE.observe(len(batch))
+        for _, _, enqueued_at in batch:
+            QUEUE_WAIT.observe(flushed_at - enqueued_at)
+
+        texts = [text for text, _, _ in batch]
+        try:
+            if self.executor is not None:
+                embeddings = await self.executor.run(self.encode_fn, texts)
+            else:
+                embeddings = await loop.run_in_executor(None, self.encode_fn, texts)
+        except Exception as e:
+            logger.error(f"❌ Batched encode failed ({len(texts)} texts): {e}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for row, (_, future, _) in enumerate(batch):
+            if not future.done():
+                future.set_result(embeddings[row])
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            await self._flush(batch)
@@ -0,0 +1,135 @@
+"""
+DomainX AI — Job embedding compression report
+
+Compares every compressed storage setting against the exact float32 ranking:
+memory per job, top-5 / top-1 agreement and search latency. Use it to pick
+ML_EMBEDDING_DTYPE / ML_EMBEDDING_PCA_DIM knowing the accuracy cost.
+
+Run from ml-service/:
+    python benchmarks/compression_report.py --embeddings jobs.npy --queries resumes.npy
+    python benchmarks/compression_report.py --jobs 200000      # synthetic data
+
+Real embeddings give the meaningful numbers; the synthetic mode (clustered
+random vectors) only exercises the code paths and latency.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from embedding_codec import fit_codec  # noqa: E402
+from job_index import ExactJobIndex, normalize_embeddings  # noqa: E402
+
+TOP_K = 5
+
+
+def synthetic(n, dim, clusters, seed, rank=64):
+    """
+    Clustered unit vectors, roughly shaped like sentence embeddings: most of
+    the energy lives in a `rank`-dimensional subspace, plus isotropic noise.
+    """
+    basis = np.linalg.qr(np.random.default_rng(42).standard_normal((dim, rank)))[0].T
+    centers = np.random.default_rng(43).standard_normal((clusters, rank))
+    rng = np.random.default_rng(seed)
+    labels = rng.integers(0, clusters, n)
+    latent = centers[labels] + 0.7 * rng.standard_normal((n, rank))
+    noise = 0.15 * rng.standard_normal((n, dim))
+    return normalize_embeddings((latent @ basis + noise).astype(np.float32))
+
+
+def parse_settings(value):
+    """'float16,int8,int8:128' -> [("float16", 0), ("int8", 0), ("int8", 128)]"""
+    settings = []
+    for item in value.split(","):
+        dtype, _, pca_dim = item.strip().partition(":")
+        settings.append((dtype, int(pca_dim or 0)))
+    return settings
+
+
+def evaluate(jobs, queries, reference, dtype, pca_dim):
+    codec = fit_codec(jobs, dtype=dtype, pca_dim=pca_dim)
+    index = ExactJobIndex(jobs, normalized=True, codec=codec)
+
+    started = time.perf_counter()
+    rows, _ = index.search(queries, TOP_K)
+    elapsed = time.perf_counter() - started
+
+    overlap = np.mean([
+        len(set(a) & set(b)) / TOP_K for a, b in zip(rows, reference)
+    ])
+    same_set = np.mean([set(a) == set(b) for a, b in zip(rows, reference)])
+    top1 = np.mean(rows[:, 0] == reference[:, 0])
+    bytes_per_job = codec.bytes_per_row(jobs.shape[1])
+    return {
+        "setting": codec.name,
+        "bytes/job": bytes_per_job,
+        "MB": bytes_per_job * len(jobs) / 2**20,
+        "top5 overlap": overlap,
+        "top5 same set": same_set,
+        "top1 agree": top1,
+        "ms/query": 1000 * elapsed / len(queries),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embeddings", help=".npy job embeddings (J, dim)")
+    parser.add_argument("--queries", help=".npy resume embeddings (Q, dim)")
+    parser.add_argument("--jobs", type=int, default=100000, help="Synthetic job count")
+    parser.add_argument("--num-queries", type=int, default=500, help="Synthetic query count")
+    parser.add_argument("--dim", type=int, default=384, help="Synthetic embedding size")
+    parser.add_argument(
+        "--settings",
+        default="float16,int8,float32:192,float32:128,int8:192,int8:128,int8:64",
+        help="Comma-separated dtype[:pca_dim] settings",
+    )
+    args = parser.parse_args()
+
+    if args.embeddings:
+        jobs = normalize_embeddings(np.load(args.embeddings))
+        if args.queries:
+            queries = normalize_embeddings(np.load(args.queries))
+        else:
+            # Perturbed jobs stand in for resumes
+            rng = np.random.default_rng(1)
+            picks = rng.choice(len(jobs), min(args.num_queries, len(jobs)), replace=False)
+            queries = normalize_embeddings(jobs[picks] + 0.3 * rng.standard_normal((len(picks), jobs.shape[1])))
+    else:
+        jobs = synthetic(args.jobs, args.dim, clusters=max(8, args.jobs // 500), seed=0)
+        queries = synthetic(args.num_queries, args.dim, clusters=max(8, args.jobs // 500), seed=1)
+
+    exact = ExactJobIndex(jobs, normalized=True)
+    started = time.perf_counter()
+    reference, _ = exact.search(queries, TOP_K)
+    baseline_ms = 1000 * (time.perf_counter() - started) / len(queries)
+
+    rows = [{
+        "setting": "float32",
+        "bytes/job": jobs.shape[1] * 4,
+        "MB": jobs.nbytes / 2**20,
+        "top5 overlap": 1.0,
+        "top5 same set": 1.0,
+        "top1 agree": 1.0,
+        "ms/query": baseline_ms,
+    }]
+    for dtype, pca_dim in parse_settings(args.settings):
+        rows.append(evaluate(jobs, queries, reference, dtype, pca_dim))
+
+    print(f"\n{len(jobs)} jobs x {jobs.shape[1]} dims, {len(queries)} queries, top-{TOP_K}\n")
+    header = f"{'setting':<16}{'bytes/job':>10}{'MB':>10}{'top5 overlap':>14}{'top5 same set':>15}{'top1 agree':>12}{'ms/query':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['setting']:<16}{r['bytes/job']:>10}{r['MB']:>10.1f}{r['top5 overlap']:>14.3f}"
+            f"{r['top5 same set']:>15.3f}{r['top1 agree']:>12.3f}{r['ms/query']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+DomainX AI — Encoder backend benchmark
+
+Compares the ONNX Runtime backends (fp32 and dynamic int8) against the
+PyTorch sentence-transformers backend on the same texts:
+
+- latency: one text per call, p50 / p95
+- throughput: texts/sec for batched encodes
+- drift: cosine between each backend's embedding and the torch embedding,
+  and top-5 job agreement against the torch ranking
+
+Run from ml-service/:
+    python benchmarks/encoder_benchmark.py
+    python benchmarks/encoder_benchmark.py --threads 4 --texts 512 --max-tokens 8192
+
+The first run exports the model to ONNX (needs torch + onnx).
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from encoders import build_encoder, default_onnx_dir  # noqa: E402
+from job_index import ExactJobIndex, normalize_embeddings  # noqa: E402
+from ml_service import JOB_DATASET, KNOWN_SKILLS, MODEL_NAME, job_document  # noqa: E402
+
+TOP_K = 5
+
+
+def sample_resumes(n, seed=0):
+    """Resume-like texts of varied length built from known skills."""
+    rng = random.Random(seed)
+    roles = ["backend developer", "frontend engineer", "data scientist", "devops engineer",
+             "full stack developer", "mobile developer", "ML engineer", "QA engineer"]
+    texts = []
+    for _ in range(n):
+        skills = rng.sample(KNOWN_SKILLS, rng.randint(3, 25))
+        years = rng.randint(0, 12)
+        sentences = [f"{rng.choice(roles).capitalize()} with {years} years of experience."]
+        sentences += [f"Built and shipped projects using {s}." for s in skills]
+        texts.append(" ".join(sentences))
+    return texts
+
+
+def percentile(values, q):
+    return float(np.percentile(values, q)) * 1000
+
+
+def benchmark(encoder, texts, latency_samples):
+    encoder.encode(texts[:32])  # warm-up
+
+    latencies = []
+    for text in texts[:latency_samples]:
+        started = time.perf_counter()
+        encoder.encode([text])
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    embeddings = encoder.encode(texts)
+    elapsed = time.perf_counter() - started
+    return {
+        "p50 ms": percentile(latencies, 50),
+        "p95 ms": percentile(latencies, 95),
+        "texts/s": len(texts) / elapsed,
+        "embeddings": normalize_embeddings(embeddings),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", default=MODEL_NAME)
+    parser.add_argument("--onnx-dir", default=None, help="Exported model directory")
+    parser.add_argument("--texts", type=int, default=256, help="Resume texts to encode")
+    parser.add_argument("--max-tokens", type=int, default=4096, help="Padded-token budget per batch")
+    parser.add_argument("--latency-samples", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=0, help="Intra-op threads for both runtimes (0 = default)")
+    args = parser.parse_args()
+
+    onnx_dir = args.onnx_dir or default_onnx_dir(
+        os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "onnx_model"),
+        args.model,
+    )
+    if args.threads:
+        import torch
+        torch.set_num_threads(args.threads)
+
+    backends = {
+        "torch": build_encoder("torch", args.model, max_tokens=args.max_tokens),
+        "onnx fp32": build_encoder("onnx", args.model, model_dir=onnx_dir, quantize=False,
+                                   threads=args.threads or None, max_tokens=args.max_tokens),
+        "onnx int8": build_encoder("onnx", args.model, model_dir=onnx_dir, quantize=True,
+                                   threads=args.threads or None, max_tokens=args.max_tokens),
+    }
+
+    texts = sample_resumes(args.texts)
+    jobs = [job_document(job) for job in JOB_DATASET]
+
+    results = {}
+    rankings = {}
+    for name, encoder in backends.items():
+        results[name] = benchmark(encoder, texts, args.latency_samples)
+        index = ExactJobIndex(encoder.encode(jobs), normalized=False)
+        rankings[name], _ = index.search(results[name]["embeddings"], TOP_K)
+
+    reference = results["torch"]["embeddings"]
+    print(f"\n{args.model}: {len(texts)} texts, {args.max_tokens} tokens/batch, "
+          f"threads {args.threads or 'default'}, top-{TOP_K} over {len(jobs)} jobs\n")
+    header = (f"{'backend':<12}{'p50 ms':>9}{'p95 ms':>9}{'texts/s':>10}{'speedup':>9}"
+              f"{'cos mean':>10}{'cos min':>9}{'top5 overlap':>14}")
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        cosine = np.sum(r["embeddings"] * reference, axis=1)
+        overlap = np.mean([
+            len(set(a) & set(b)) / TOP_K for a, b in zip(rankings[name], rankings["torch"])
+        ])
+        print(
+            f"{name:<12}{r['p50 ms']:>9.2f}{r['p95 ms']:>9.2f}{r['texts/s']:>10.1f}"
+            f"{r['texts/s'] / results['torch']['texts/s']:>8.2f}x"
+            f"{cosine.mean():>10.4f}{cosine.min():>9.4f}{overlap:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+DomainX AI — Persistent job catalog change log
+
+Every /jobs change is appended to one JSON-lines file shared by all uvicorn
+workers on the host, and applied from there rather than straight to the
+catalog. Each worker applies the entries in file order:
+- on startup, on top of JOB_DATASET, before the catalog is built
+- after appending its own change, so the response reflects it
+- when polling, to pick up changes made through the other workers
+
+All workers therefore converge on the same catalog, and changes survive a
+restart. Appends take an exclusive file lock and write one complete line;
+a reader only consumes lines that end in a newline.
+
+Every change ever made is kept and replayed on startup. The log is small
+next to the job text it carries, but nothing compacts it yet.
+
+Each entry is {"upsert": [job, ...], "delete": [job id, ...]}; either key
+may be missing. Upserts are applied before deletes.
+"""
+
+import fcntl
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+
+def apply_entry_to_jobs(jobs: dict, entry: dict) -> None:
+    """Apply one entry to {job id: job dict}; insertion order is kept for new ids."""
+    for job in entry.get("upsert", ()):
+        jobs[job["id"]] = job
+    for job_id in entry.get("delete", ()):
+        jobs.pop(job_id, None)
+
+
+class CatalogLog:
+    """
+    Append-only change log of the job catalog.
+
+    Args:
+        path (str): JSON-lines file (created on the first append)
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._offset = 0
+        # Entries are read and applied by one thread at a time
+        self.lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def replay(self, jobs: list) -> list:
+        """
+        Jobs after applying every logged change to `jobs`; later reads
+        start after the entries replayed here.
+
+        Args:
+            jobs (list): Initial job dicts (e.g. JOB_DATASET)
+
+        Returns:
+            list: Job dicts, initial order first, then added jobs
+        """
+        by_id = {job["id"]: job for job in jobs}
+        with self.lock:
+            entries = self.read_new()
+        for _, entry in entries:
+            apply_entry_to_jobs(by_id, entry)
+        if entries:
+            logger.info(f"✅ Replayed {len(entries)} job catalog changes ({len(by_id)} jobs)")
+        return list(by_id.values())
+
+    def append(self, entry: dict) -> int:
+        """
+        Append one change and make it durable.
+
+        Returns:
+            int: File offset just past the entry; read_new reports the
+                entry with this offset
+        """
+        line = (json.dumps(entry, separators=(",", ":")) + "\n").encode("utf-8")
+        with open(self.path, "ab") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+                return f.tell()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def has_new(self) -> bool:
+        """Cheap check for entries not read yet."""
+        try:
+            return os.path.getsize(self.path) > self._offset
+        except OSError:
+            return False
+
+    def read_new(self) -> list:
+        """
+        Complete entries appended since the last read; call with `lock` held.
+
+        Returns:
+            list: (offset just past the entry, entry dict) in file order
+        """
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self._offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+
+        entries = []
+        offset = self._offset
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # being written; picked up next time
+            offset += len(line)
+            if line.strip():
+                entries.append((offset, json.loads(line)))
+        self._offset = offset
+        return entries
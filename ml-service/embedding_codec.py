@@ -0,0 +1,195 @@
+"""
+DomainX AI — Compressed job embeddings
+
+A float32 MiniLM row costs 1.5 KB (384 dims). With millions of jobs and
+several uvicorn workers per host that is the limiting resource, so the job
+index can store rows in a compressed form instead:
+
+    float32   no compression (default)
+    float16   half precision; 2x smaller
+    int8      scalar quantisation with one scale per row; ~4x smaller
+
+Optionally the rows are first projected onto the top `pca_dim` principal
+directions of the job matrix (uncentred, so dot products are preserved) and
+re-normalised. Settings combine, e.g. int8 + PCA 128 is ~12x smaller.
+
+An int8 row is scaled by its own largest component, so no row is ever
+clipped and rows added long after the fit quantise as well as the first
+ones. The float32 scale is stored in SCALE_BYTES trailing bytes of the row.
+The PCA projection does depend on the rows it was fitted on; it is refused
+for fewer rows than `pca_dim`, and JobCatalog refits it as the catalog grows.
+
+Similarities are computed directly against the stored codes: the query is
+projected once, and the codes are widened to float32 one block of rows at a
+time (then multiplied by their row scales), so the full float32 matrix never
+exists in memory.
+
+Use benchmarks/compression_report.py to measure top-5 agreement against the
+exact float32 ranking before picking a setting.
+"""
+
+import logging
+
+import numpy as np
+
+from job_index import normalize_embeddings
+
+logger = logging.getLogger(__name__)
+
+DTYPES = {
+    "float32": np.float32,
+    "float16": np.float16,
+    "int8": np.int8,
+}
+
+# Rows widened to float32 per matmul; bounds the scratch buffer
+# (16k rows x 384 dims x 4 bytes = 25 MB)
+BLOCK_ROWS = 16384
+
+# Rows sampled to fit the PCA projection
+PCA_SAMPLE_ROWS = 50000
+
+# Trailing bytes of an int8 row holding its float32 scale
+SCALE_BYTES = 4
+
+
+class EmbeddingCodec:
+    """
+    Encodes normalised embeddings into their stored form and scores queries
+    against stored rows.
+
+    Build one with `fit_codec`; the projection is fixed at fit time so rows
+    added later share the same code space.
+
+    Args:
+        dtype (str): One of DTYPES
+        components (np.ndarray | None): (pca_dim, dim) projection, or None
+    """
+
+    def __init__(self, dtype="float32", components=None):
+        if dtype not in DTYPES:
+            raise ValueError(
+                f"Unknown embedding dtype: {dtype}. Supported: {', '.join(DTYPES)}"
+            )
+        self.dtype = dtype
+        self.components = components
+
+    @property
+    def name(self):
+        return self.dtype + (f"+pca{self.components.shape[0]}" if self.components is not None else "")
+
+    @property
+    def is_identity(self):
+        return self.dtype == "float32" and self.components is None
+
+    def stored_dim(self, dim):
+        return self.components.shape[0] if self.components is not None else dim
+
+    def bytes_per_row(self, dim):
+        if self.dtype == "int8":
+            return self.stored_dim(dim) + SCALE_BYTES
+        return self.stored_dim(dim) * np.dtype(DTYPES[self.dtype]).itemsize
+
+    def project(self, vectors: np.ndarray) -> np.ndarray:
+        """Normalised float32 vectors in the (possibly reduced) code space."""
+        vectors = normalize_embeddings(vectors)
+        if self.components is None:
+            return vectors
+        return normalize_embeddings(vectors @ self.components.T)
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """Stored form of original-space vectors."""
+        projected = self.project(vectors)
+        if self.dtype == "int8":
+            # Largest component maps to +-127; floor avoids zero scales
+            scales = np.maximum(np.abs(projected).max(axis=1, keepdims=True), 1e-6) / 127.0
+            codes = np.rint(projected / scales).astype(np.int8)
+            return np.hstack([codes, scales.astype(np.float32).view(np.int8)])
+        return projected.astype(DTYPES[self.dtype])
+
+    @staticmethod
+    def _row_scales(codes: np.ndarray) -> np.ndarray:
+        """(rows,) float32 scales stored at the end of int8 rows."""
+        return np.ascontiguousarray(codes[:, -SCALE_BYTES:]).view(np.float32)[:, 0]
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Approximate original-space vectors for stored rows (used on compaction)."""
+        if self.dtype == "int8":
+            vectors = codes[:, :-SCALE_BYTES].astype(np.float32)
+            vectors *= self._row_scales(codes)[:, None]
+        else:
+            vectors = codes.astype(np.float32)
+        if self.components is not None:
+            vectors = vectors @ self.components
+        return normalize_embeddings(vectors)
+
+    def prepare_queries(self, queries: np.ndarray) -> np.ndarray:
+        """Project queries into the code space, once per search."""
+        return self.project(queries)
+
+    def scores(self, prepared: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """(N, rows) similarities of prepared queries against stored rows."""
+        if self.dtype == "float32":
+            return prepared @ codes.T
+
+        out = np.empty((prepared.shape[0], codes.shape[0]), dtype=np.float32)
+        for start in range(0, codes.shape[0], BLOCK_ROWS):
+            rows = codes[start:start + BLOCK_ROWS]
+            end = start + rows.shape[0]
+            if self.dtype == "int8":
+                np.matmul(prepared, rows[:, :-SCALE_BYTES].astype(np.float32).T, out=out[:, start:end])
+                out[:, start:end] *= self._row_scales(rows)
+            else:
+                np.matmul(prepared, rows.astype(np.float32).T, out=out[:, start:end])
+        return out
+
+
+def fit_codec(embeddings: np.ndarray, dtype: str = "float32", pca_dim: int = 0) -> EmbeddingCodec:
+    """
+    Fit the PCA projection on the job embedding matrix.
+
+    Args:
+        embeddings (np.ndarray): (J, dim) normalised job embeddings
+        dtype (str): Stored dtype, one of DTYPES
+        pca_dim (int): Target dimension; 0 (or >= dim) disables PCA. Also
+            disabled while there are fewer than `pca_dim` jobs to fit on
+
+    Returns:
+        EmbeddingCodec
+    """
+    dtype = (dtype or "float32").lower()
+    if dtype not in DTYPES:
+        raise ValueError(
+            f"Unknown embedding dtype: {dtype}. Supported: {', '.join(DTYPES)}"
+        )
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    dim = embeddings.shape[1]
+
+    components = None
+    pca_dim = int(pca_dim or 0)
+    if 0 < pca_dim < dim and len(embeddings) < pca_dim:
+        # Most directions of the basis would be arbitrary
+        logger.warning(
+            f"⚠️  PCA to {pca_dim} dims needs at least {pca_dim} jobs to fit on, "
+            f"got {len(embeddings)}; storing full {dim}-dim rows"
+        )
+    elif 0 < pca_dim < dim:
+        sample = embeddings
+        if sample.shape[0] > PCA_SAMPLE_ROWS:
+            rows = np.random.default_rng(0).choice(sample.shape[0], PCA_SAMPLE_ROWS, replace=False)
+            sample = sample[np.sort(rows)]
+        # Eigenvectors of the (dim x dim) second-moment matrix; no centring so
+        # inner products (not variances) are what is preserved
+        eigvals, eigvecs = np.linalg.eigh(sample.T @ sample)
+        order = np.argsort(eigvals)[::-1][:pca_dim]
+        components = np.ascontiguousarray(eigvecs[:, order].T, dtype=np.float32)
+        kept = eigvals[order].sum() / max(eigvals.sum(), 1e-12)
+        logger.info(f"✅ PCA {dim} -> {pca_dim} dims keeps {kept:.1%} of the energy")
+
+    codec = EmbeddingCodec(dtype, components)
+    if not codec.is_identity:
+        logger.info(
+            f"✅ Job embeddings stored as {codec.name}: "
+            f"{codec.bytes_per_row(dim)} bytes/job (float32: {dim * 4})"
+        )
+    return codec
@@ -0,0 +1,187 @@
+"""
+DomainX AI — Persistent job embedding store
+
+Job embeddings are cached on disk so a restart does not re-encode the whole
+catalog. Rows are keyed by a SHA-256 hash of each job's text and stored per
+model, so switching models never mixes vectors from different encoders.
+
+Layout in ML_EMBEDDING_CACHE_DIR:
+    <model>.json               manifest: row keys + name of the current matrix
+    <model>-<digest>.npy       L2-normalised float32 matrix, never modified
+
+Matrices are immutable and the manifest is swapped atomically, so readers need
+no lock. They open the matrix with mmap, and every worker process on the host
+shares the same page-cache copy. Only a rebuild (some job text changed) takes
+an exclusive file lock, and it re-encodes just the changed jobs.
+"""
+
+import fcntl
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from job_index import normalize_embeddings
+
+logger = logging.getLogger(__name__)
+
+
+def text_key(text: str) -> str:
+    """Content hash identifying one job text."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """
+    On-disk, memory-mapped cache of normalised job embeddings for one model.
+
+    Args:
+        directory (str): Cache directory (created if missing)
+        model_name (str): Encoder name; part of every file name
+    """
+
+    def __init__(self, directory: str, model_name: str):
+        self.directory = directory
+        self.model_name = model_name
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.manifest_path = os.path.join(directory, f"{slug}.json")
+        self.lock_path = os.path.join(directory, f"{slug}.lock")
+        self._slug = slug
+        os.makedirs(directory, exist_ok=True)
+
+    # ------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------
+    def load(self, texts: list, encode_fn) -> np.ndarray:
+        """
+        Return normalised embeddings for `texts`, in order.
+
+        Rows for unchanged texts come straight from the mapped cache file;
+        only new or edited texts are passed to `encode_fn`.
+
+        Args:
+            texts (list): Job texts, one per row
+            encode_fn: Callable(list[str]) -> (N, dim) array
+
+        Returns:
+            np.ndarray: (len(texts), dim) float32, read-only memmap when the
+                cache already matched
+        """
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        keys = [text_key(t) for t in texts]
+
+        cached = self._open(keys)
+        if cached is not None:
+            logger.info(f"✅ Loaded {len(keys)} job embeddings from cache (mmap)")
+            return cached
+
+        with self._exclusive_lock():
+            # Another worker may have rebuilt the cache while we waited
+            cached = self._open(keys)
+            if cached is not None:
+                logger.info(f"✅ Loaded {len(keys)} job embeddings from cache (mmap)")
+                return cached
+            return self._rebuild(texts, keys, encode_fn)
+
+    # ------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------
+    def _read_manifest(self):
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if manifest.get("model") != self.model_name:
+            return None
+        return manifest
+
+    def _map(self, manifest):
+        path = os.path.join(self.directory, manifest["file"])
+        try:
+            return np.load(path, mmap_mode="r")
+        except (OSError, ValueError) as e:
+            logger.warning(f"⚠️  Embedding cache file unreadable ({path}): {e}")
+            return None
+
+    def _open(self, keys):
+        """Mapped matrix if the cache holds exactly `keys` in this order."""
+        manifest = self._read_manifest()
+        if manifest is None or manifest.get("keys") != keys:
+            return None
+        return self._map(manifest)
+
+    def _rebuild(self, texts, keys, encode_fn):
+        started = time.perf_counter()
+        manifest = self._read_manifest()
+        old = self._map(manifest) if manifest else None
+        old_rows = {}
+        if old is not None and old.shape[0] == len(manifest["keys"]):
+            old_rows = {key: row for row, key in enumerate(manifest["keys"])}
+
+        missing = [i for i, key in enumerate(keys) if key not in old_rows]
+        encoded = None
+        if missing:
+            logger.info(f"⏳ Encoding {len(missing)}/{len(keys)} new or changed jobs...")
+            encoded = normalize_embeddings(encode_fn([texts[i] for i in missing]))
+
+        dim = encoded.shape[1] if encoded is not None else old.shape[1]
+        matrix = np.empty((len(keys), dim), dtype=np.float32)
+        if encoded is not None:
+            matrix[missing] = encoded
+        reused = [i for i, key in enumerate(keys) if key in old_rows]
+        if reused:
+            matrix[reused] = old[[old_rows[keys[i]] for i in reused]]
+
+        digest = hashlib.sha256("".join(keys).encode("ascii")).hexdigest()[:16]
+        file_name = f"{self._slug}-{digest}.npy"
+        self._atomic_write(file_name, lambda f: np.save(f, matrix))
+        self._atomic_write(
+            os.path.basename(self.manifest_path),
+            lambda f: f.write(json.dumps({
+                "model": self.model_name,
+                "file": file_name,
+                "keys": keys,
+            }).encode("utf-8")),
+        )
+        self._remove_stale(keep=file_name)
+
+        logger.info(
+            f"✅ Embedding cache rebuilt: {len(reused)} reused, {len(missing)} encoded "
+            f"({time.perf_counter() - started:.2f}s)"
+        )
+        return np.load(os.path.join(self.directory, file_name), mmap_mode="r")
+
+    def _atomic_write(self, file_name, write_fn):
+        path = os.path.join(self.directory, file_name)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            write_fn(f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    def _remove_stale(self, keep):
+        # Processes still mapping an old file keep their pages after unlink
+        prefix = f"{self._slug}-"
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(".npy") and name != keep:
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    @contextmanager
+    def _exclusive_lock(self):
+        with open(self.lock_path, "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
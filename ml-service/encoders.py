@@ -0,0 +1,342 @@
+"""
+DomainX AI — Sentence encoder backends
+
+Every backend turns a list of texts into a (N, dim) float32 matrix of
+mean-pooled MiniLM embeddings. Selected with ML_ENCODER:
+
+    torch  sentence-transformers on PyTorch (default).
+    onnx   ONNX Runtime running the same transformer, exported once and
+           dynamically int8-quantised (weights int8, activations quantised
+           on the fly). Only onnxruntime + tokenizers are needed at runtime;
+           torch is imported just for the one-off export.
+           Requires `pip install onnxruntime onnx`.
+
+Both backends tokenise a whole call up front and batch by length: inputs are
+sorted by token count and cut into batches whose padded size (rows x longest
+row) stays under a token budget, so short texts are not padded up to the
+longest resume in the call. Embeddings are returned in input order.
+
+The ONNX graph outputs token embeddings and mean pooling is applied here,
+exactly as sentence-transformers' Pooling module does, so embeddings match
+the torch backend up to quantisation noise. Run
+benchmarks/encoder_benchmark.py to measure latency, throughput and drift.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Texts compared against the torch model right after an ONNX export
+_EXPORT_CHECK_TEXTS = [
+    "Senior Python developer with Django, FastAPI and AWS experience",
+    "Frontend engineer: React, TypeScript, Redux, CSS and accessibility",
+    "Data scientist skilled in machine learning, pandas and SQL",
+]
+_EXPORT_MIN_COSINE = 0.98
+
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average token embeddings over non-padding positions."""
+    mask = attention_mask[..., None].astype(np.float32)
+    summed = (token_embeddings * mask).sum(axis=1)
+    return (summed / np.clip(mask.sum(axis=1), 1e-9, None)).astype(np.float32)
+
+
+def plan_batches(lengths, max_tokens: int = 4096, max_batch_size: int = 256) -> list:
+    """
+    Group inputs into length-sorted batches under a padded-token budget.
+
+    Args:
+        lengths (list[int]): Token count per input (after truncation)
+        max_tokens (int): Budget for rows x longest row in one batch; a
+            single input longer than the budget still gets its own batch
+        max_batch_size (int): Upper bound on rows per batch
+
+    Returns:
+        list: Arrays of input positions, one per batch, shortest batch first
+    """
+    order = np.argsort(np.asarray(lengths, dtype=np.int64), kind="stable")
+    batches, current = [], []
+    for position in order:
+        # Sorted ascending, so this input sets the batch's padded length
+        longest = max(int(lengths[position]), 1)
+        if current and ((len(current) + 1) * longest > max_tokens or len(current) >= max_batch_size):
+            batches.append(np.array(current))
+            current = []
+        current.append(position)
+    if current:
+        batches.append(np.array(current))
+    return batches
+
+
+def _embedding_dimension(st_model) -> int:
+    # Renamed in sentence-transformers 5.x
+    getter = getattr(st_model, "get_embedding_dimension", None) or st_model.get_sentence_embedding_dimension
+    return getter()
+
+
+class TorchEncoder:
+    """
+    sentence-transformers `SentenceTransformer.encode` on PyTorch.
+
+    Args:
+        model_name (str): sentence-transformers model name
+        max_tokens (int): Padded-token budget per forward pass
+        max_batch_size (int): Upper bound on texts per forward pass
+    """
+
+    kind = "torch"
+
+    def __init__(self, model_name: str, max_tokens: int = 4096, max_batch_size: int = 256):
+        from sentence_transformers import SentenceTransformer  # pulls in torch
+
+        self.model_name = model_name
+        self.max_tokens = int(max_tokens)
+        self.max_batch_size = int(max_batch_size)
+        self.model = SentenceTransformer(model_name)
+        self.dimension = _embedding_dimension(self.model)
+
+    def encode(self, texts: list) -> np.ndarray:
+        import torch
+
+        if not texts:
+            return np.empty((0, self.dimension), dtype=np.float32)
+        # Tokenised once, like SentenceTransformer.encode does (stripped,
+        # truncated); each batch is padded to its own longest row and run
+        # through the model directly instead of being tokenised again
+        tokenizer = self.model.tokenizer
+        texts = [str(text).strip() for text in texts]
+        if getattr(self.model[0], "do_lower_case", False):
+            texts = [text.lower() for text in texts]
+        encoded = tokenizer(texts, truncation=True, max_length=self.model.max_seq_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        for batch in plan_batches(lengths, self.max_tokens, self.max_batch_size):
+            features = tokenizer.pad(
+                {key: [values[i] for i in batch] for key, values in encoded.items()},
+                return_tensors="pt",
+            )
+            features = {key: value.to(self.model.device) for key, value in features.items()}
+            with torch.inference_mode():
+                embeddings = self.model(features)["sentence_embedding"]
+            out[batch] = embeddings.float().cpu().numpy()
+        return out
+
+
+class OnnxEncoder:
+    """
+    ONNX Runtime encoder with mean pooling.
+
+    Args:
+        model_name (str): sentence-transformers model to export on first use
+        model_dir (str): Where the exported graph and tokenizer live
+        quantize (bool): Use the dynamically int8-quantised graph
+        threads (int | None): ONNX Runtime intra-op threads; None = all cores
+        max_tokens (int): Padded-token budget per forward pass
+        max_batch_size (int): Upper bound on texts per forward pass
+    """
+
+    kind = "onnx"
+
+    def __init__(self, model_name: str, model_dir: str, quantize: bool = True, threads=None,
+                 max_tokens: int = 4096, max_batch_size: int = 256):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        self.model_name = model_name
+        self.quantize = quantize
+        self.max_tokens = int(max_tokens)
+        self.max_batch_size = int(max_batch_size)
+        meta = _read_export(model_dir, model_name)
+        if meta is None:
+            meta = export_onnx(model_name, model_dir)
+        self.dimension = meta["dimension"]
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=meta["max_seq_length"])
+        # Padding is done per batch in `encode`
+        self.tokenizer.no_padding()
+        self.pad_id = meta["pad_id"]
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if threads:
+            options.intra_op_num_threads = int(threads)
+        graph = meta["int8_file"] if quantize else meta["file"]
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, graph), options, providers=["CPUExecutionProvider"]
+        )
+        self._inputs = {i.name for i in self.session.get_inputs()}
+        logger.info(f"✅ ONNX Runtime encoder ready ({graph})")
+
+    def encode(self, texts: list) -> np.ndarray:
+        out = np.empty((len(texts), self.dimension), dtype=np.float32)
+        if not texts:
+            return out
+        # Tokenised once; each batch is padded only to its own longest row
+        encodings = self.tokenizer.encode_batch(list(texts))
+        lengths = [len(e.ids) for e in encodings]
+        for batch in plan_batches(lengths, self.max_tokens, self.max_batch_size):
+            width = lengths[batch[-1]]
+            input_ids = np.full((len(batch), width), self.pad_id, dtype=np.int64)
+            attention_mask = np.zeros((len(batch), width), dtype=np.int64)
+            token_type_ids = np.zeros((len(batch), width), dtype=np.int64)
+            for row, position in enumerate(batch):
+                e = encodings[position]
+                input_ids[row, :len(e.ids)] = e.ids
+                attention_mask[row, :len(e.ids)] = 1
+                token_type_ids[row, :len(e.ids)] = e.type_ids
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self._inputs:
+                feeds["token_type_ids"] = token_type_ids
+            token_embeddings = self.session.run(["last_hidden_state"], feeds)[0]
+            out[batch] = mean_pool(token_embeddings, attention_mask)
+        return out
+
+
+# ============================================================
+# ONE-OFF EXPORT (needs torch + onnx)
+# ============================================================
+def _read_export(model_dir, model_name):
+    try:
+        with open(os.path.join(model_dir, "encoder.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("model") == model_name else None
+
+
+def _is_mean_pooling(config: dict) -> bool:
+    # sentence-transformers 3.x/4.x use one flag per mode, 5.x a single name
+    if "pooling_mode" in config:
+        return config["pooling_mode"] == "mean"
+    modes = {k for k, v in config.items() if k.startswith("pooling_mode_") and v}
+    return modes == {"pooling_mode_mean_tokens"}
+
+
+def export_onnx(model_name: str, model_dir: str) -> dict:
+    """
+    Export the transformer of a sentence-transformers model to ONNX, write a
+    dynamically int8-quantised copy and the fast tokenizer next to it.
+
+    Raises:
+        ValueError: If the model does not use plain mean pooling
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from sentence_transformers import SentenceTransformer
+
+    started = time.perf_counter()
+    logger.info(f"⏳ Exporting {model_name} to ONNX (one-off)...")
+    st_model = SentenceTransformer(model_name, device="cpu")
+    if len(st_model) != 2 or not _is_mean_pooling(st_model[1].get_config_dict()):
+        raise ValueError(
+            f"ONNX backend implements transformer + mean pooling only; "
+            f"{model_name} uses {[type(m).__name__ for m in st_model]}"
+        )
+
+    os.makedirs(model_dir, exist_ok=True)
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                token_type_ids=token_type_ids,
+            ).last_hidden_state
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    token_type_ids = sample.get("token_type_ids", torch.zeros_like(sample["input_ids"]))
+    axes = {0: "batch", 1: "sequence"}
+    fp32_path = os.path.join(model_dir, "model.onnx")
+    int8_path = os.path.join(model_dir, "model-int8.onnx")
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(transformer),
+            (sample["input_ids"], sample["attention_mask"], token_type_ids),
+            fp32_path,
+            input_names=["input_ids", "attention_mask", "token_type_ids"],
+            output_names=["last_hidden_state"],
+            dynamic_axes={
+                "input_ids": axes,
+                "attention_mask": axes,
+                "token_type_ids": axes,
+                "last_hidden_state": axes,
+            },
+            opset_version=14,
+            dynamo=False,
+        )
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    tokenizer.backend_tokenizer.save(os.path.join(model_dir, "tokenizer.json"))
+
+    meta = {
+        "model": model_name,
+        "file": "model.onnx",
+        "int8_file": "model-int8.onnx",
+        "dimension": _embedding_dimension(st_model),
+        "max_seq_length": st_model.max_seq_length,
+        "pad_id": tokenizer.pad_token_id,
+        "pad_token": tokenizer.pad_token,
+    }
+    # Written last: its presence marks a complete export
+    tmp_path = os.path.join(model_dir, f"encoder.json.{os.getpid()}.tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, os.path.join(model_dir, "encoder.json"))
+
+    # Sanity check the int8 graph against the torch model it came from
+    reference = st_model.encode(_EXPORT_CHECK_TEXTS, convert_to_numpy=True)
+    exported = OnnxEncoder(model_name, model_dir, quantize=True).encode(_EXPORT_CHECK_TEXTS)
+    cosine = np.sum(reference * exported, axis=1) / (
+        np.linalg.norm(reference, axis=1) * np.linalg.norm(exported, axis=1)
+    )
+    if cosine.min() < _EXPORT_MIN_COSINE:
+        logger.warning(f"⚠️  int8 ONNX embeddings drift from torch: min cosine {cosine.min():.4f}")
+    logger.info(
+        f"✅ ONNX export done in {time.perf_counter() - started:.1f}s "
+        f"(int8 vs torch min cosine {cosine.min():.4f})"
+    )
+    return meta
+
+
+ENCODER_BACKENDS = {
+    "torch": TorchEncoder,
+    "onnx": OnnxEncoder,
+}
+
+
+def default_onnx_dir(base_dir: str, model_name: str) -> str:
+    return os.path.join(base_dir, re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name))
+
+
+def build_encoder(backend: str, model_name: str, **params):
+    """
+    Build a sentence encoder with the configured backend.
+
+    Args:
+        backend (str): One of ENCODER_BACKENDS
+        model_name (str): sentence-transformers model name
+        **params: Backend-specific options (see each backend)
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = (backend or "torch").lower()
+    if backend not in ENCODER_BACKENDS:
+        raise ValueError(
+            f"Unknown encoder backend: {backend}. "
+            f"Supported: {', '.join(sorted(ENCODER_BACKENDS))}"
+        )
+    return ENCODER_BACKENDS[backend](model_name, **params)
@@ -0,0 +1,118 @@
+"""
+DomainX AI — Off-loop inference executor
+
+MiniLM encodes and job scoring are CPU-bound and must never run on uvicorn's
+event loop thread, otherwise /health and every other request stall behind a
+long resume. All inference work is submitted here instead: a dedicated thread
+pool with a bounded number of pending jobs. Once the bound is reached new work
+is rejected immediately with `InferenceQueueFull` so the API can answer 503 +
+Retry-After instead of letting latency grow without limit.
+"""
+
+import asyncio
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from prometheus_client import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# METRICS
+# ============================================================
+PENDING = Gauge(
+    "ml_inference_pending",
+    "Inference jobs queued or running on the inference executor",
+)
+REJECTED = Counter(
+    "ml_inference_rejected_total",
+    "Inference jobs rejected because the submission queue was full",
+)
+
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference executor cannot accept more work."""
+
+    def __init__(self, retry_after=1):
+        super().__init__("Inference queue is full, retry later")
+        self.retry_after = retry_after
+
+
+class InferenceExecutor:
+    """
+    Thread pool for blocking inference calls with a bounded submission queue.
+
+    Args:
+        max_workers (int): Inference threads. Each torch forward pass already
+            uses `torch_threads` intra-op threads, so 1-2 is usually right.
+        max_queue (int): Jobs allowed to wait behind the running ones before
+            submissions are rejected.
+        torch_threads (int | None): torch intra-op thread count; None keeps
+            torch's default (all cores).
+        retry_after (int): Seconds suggested to rejected clients.
+    """
+
+    def __init__(self, max_workers=1, max_queue=64, torch_threads=None, retry_after=1):
+        self.max_workers = max(1, int(max_workers))
+        self.max_queue = max(0, int(max_queue))
+        self.retry_after = int(retry_after)
+        self.torch_threads = int(torch_threads) if torch_threads else None
+        # Taken on the event loop, released by the pool thread that finishes
+        # the job, so it also counts jobs whose caller stopped waiting
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        # torch is imported lazily by the first inference thread, not at
+        # service import time
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix="inference",
+            initializer=self._init_thread,
+        )
+
+    def _init_thread(self):
+        if self.torch_threads:
+            import torch
+            torch.set_num_threads(self.torch_threads)
+            logger.info(f"🧵 torch intra-op threads set to {torch.get_num_threads()}")
+
+    @property
+    def capacity(self):
+        return self.max_workers + self.max_queue
+
+    @property
+    def pending(self):
+        return self._pending
+
+    async def run(self, fn, *args, **kwargs):
+        """
+        Run `fn(*args, **kwargs)` on the inference pool and await its result.
+
+        Raises:
+            InferenceQueueFull: If `capacity` jobs are already queued or running.
+        """
+        with self._pending_lock:
+            if self._pending >= self.capacity:
+                REJECTED.inc()
+                raise InferenceQueueFull(self.retry_after)
+            self._pending += 1
+            PENDING.set(self._pending)
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release()
+            raise
+        # A cancelled request (client disconnect) cannot stop a running job;
+        # the slot is freed when the job itself ends
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future=None):
+        with self._pending_lock:
+            self._pending -= 1
+            PENDING.set(self._pending)
+
+    def shutdown(self, wait=True):
+        self._pool.shutdown(wait=wait)
@@ -0,0 +1,236 @@
+"""
+DomainX AI — Mutable job catalog
+
+Owns everything derived from the job list: the job dicts, their embeddings
+(inside the job index) and the columnar score features. Jobs can be added,
+updated and deleted at runtime; only the changed jobs are encoded.
+
+Concurrency model:
+- Writers (add/update/delete) are serialised by a lock and run on the
+  inference executor, never on the event loop. Encoding happens before the
+  lock is taken.
+- Rows are append-only. An update appends a new row and tombstones the old
+  one; a delete only tombstones. A row becomes searchable only after its job
+  dict and features are written, so readers need no lock.
+- Readers take a `view()` once per request. When tombstones pile up the
+  catalog is compacted into fresh objects, and views taken earlier keep
+  working on the old ones.
+- With PCA storage (pca_dim > 0) the projection is refitted once the live
+  job count reaches `refit_growth` times the count it was last fitted on.
+  Stored rows have lost the directions the old projection dropped, so a
+  refit re-encodes every live job; growth is geometric, so that cost is
+  amortised over the jobs added in between.
+
+A JobCatalog lives in one process. ml_service.py keeps the catalogs of its
+uvicorn workers in step, and persists changes, through catalog_log.py.
+"""
+
+import logging
+import threading
+from collections import namedtuple
+
+import numpy as np
+
+from embedding_codec import fit_codec
+from job_index import build_job_index, normalize_embeddings
+from scoring import JobFeatures
+
+logger = logging.getLogger(__name__)
+
+# Consistent read-only handle for one request
+CatalogView = namedtuple("CatalogView", ["jobs", "features", "index", "version"])
+
+
+class JobCatalog:
+    """
+    Args:
+        jobs (list): Initial job dicts (each with a unique "id")
+        embeddings (np.ndarray): Normalised embeddings for `jobs`
+        encode_fn: Callable(list[job dict]) -> (N, dim) normalised embeddings
+        index_backend (str): Job index backend name
+        index_params (dict): Backend tuning parameters
+        compact_ratio (float): Compact once tombstoned rows exceed this
+            fraction of live rows
+        embedding_dtype (str): Stored row dtype (float32 / float16 / int8)
+        pca_dim (int): Reduce rows to this many dimensions; 0 disables
+        refit_growth (float): Refit the PCA projection once the catalog has
+            grown by this factor since the last fit
+    """
+
+    def __init__(self, jobs, embeddings, encode_fn, index_backend="exact",
+                 index_params=None, compact_ratio=1.0, embedding_dtype="float32",
+                 pca_dim=0, refit_growth=2.0):
+        self.encode_fn = encode_fn
+        self.index_backend = index_backend
+        self.index_params = index_params or {}
+        self.compact_ratio = compact_ratio
+        self.embedding_dtype = embedding_dtype
+        self.pca_dim = pca_dim
+        self.refit_growth = refit_growth
+        # Reused on compaction so codes of surviving rows do not drift;
+        # replaced only by _maybe_refit
+        self.codec = fit_codec(embeddings, dtype=embedding_dtype, pca_dim=pca_dim)
+        self._fit_rows = len(embeddings)
+        self._lock = threading.Lock()
+        self.version = 1
+        self._install(list(jobs), embeddings)
+
+    def _install(self, jobs, embeddings):
+        """Build fresh row storage for `jobs` (initial load and compaction)."""
+        row_by_id = {job["id"]: row for row, job in enumerate(jobs)}
+        features = JobFeatures(jobs)
+        index = build_job_index(
+            embeddings, backend=self.index_backend, normalized=True,
+            codec=self.codec, **self.index_params
+        )
+        # Swapped in one assignment so readers never mix old and new storage
+        self._storage = (jobs, row_by_id, features, index)
+
+    # ------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------
+    def __len__(self):
+        return len(self._storage[1])
+
+    def __contains__(self, job_id):
+        return job_id in self._storage[1]
+
+    @property
+    def kind(self):
+        return self._storage[3].kind
+
+    def view(self) -> CatalogView:
+        jobs, _, features, index = self._storage
+        return CatalogView(jobs, features, index, self.version)
+
+    def get(self, job_id):
+        jobs, row_by_id, _, _ = self._storage
+        row = row_by_id.get(job_id)
+        return None if row is None else jobs[row]
+
+    def list_jobs(self) -> list:
+        jobs, row_by_id, _, _ = self._storage
+        return [jobs[row] for row in sorted(row_by_id.values())]
+
+    @staticmethod
+    def search(view: CatalogView, queries: np.ndarray, k: int):
+        """
+        Top-k live jobs per query.
+
+        Returns:
+            list: One (rows, similarities) pair of 1-D arrays per query
+        """
+        rows, sims = view.index.search(queries, k)
+        results = []
+        for r, s in zip(rows, sims):
+            # A delete racing with the search can leave masked (-inf) rows
+            keep = np.isfinite(s)
+            results.append((r[keep], s[keep]))
+        return results
+
+    # ------------------------------------------------------------
+    # Writes (blocking; run them on the inference executor)
+    # ------------------------------------------------------------
+    def upsert(self, jobs: list) -> dict:
+        """
+        Add new jobs and replace existing ones (matched by "id").
+
+        Returns:
+            dict: {"added": [...ids], "updated": [...ids], "version": int}
+        """
+        if not jobs:
+            return {"added": [], "updated": [], "version": self.version}
+
+        # Last occurrence wins if an id repeats within one call
+        jobs = list({job["id"]: job for job in jobs}.values())
+        embeddings = normalize_embeddings(self.encode_fn(jobs))
+
+        with self._lock:
+            all_jobs, row_by_id, features, index = self._storage
+            added, updated = [], []
+            old_rows = []
+            for job in jobs:
+                row = row_by_id.get(job["id"])
+                if row is None:
+                    added.append(job["id"])
+                else:
+                    updated.append(job["id"])
+                    old_rows.append(row)
+
+            # Job dicts and features first; index.add publishes the rows
+            start = len(all_jobs)
+            new_rows = range(start, start + len(jobs))
+            all_jobs.extend(jobs)
+            features.set_rows(new_rows, jobs)
+
+            # Drop replaced rows first so a job never shows up twice
+            index.remove(old_rows)
+            rows = index.add(embeddings)
+            assert rows[0] == start, "job index rows out of sync with catalog"
+
+            for job, row in zip(jobs, new_rows):
+                row_by_id[job["id"]] = row
+            self.version += 1
+            if not self._maybe_refit():
+                self._maybe_compact()
+
+            logger.info(
+                f"✅ Job catalog v{self.version}: +{len(added)} added, "
+                f"{len(updated)} updated ({len(self)} live)"
+            )
+            return {"added": added, "updated": updated, "version": self.version}
+
+    def delete(self, job_ids: list) -> dict:
+        """
+        Remove jobs by id; unknown ids are ignored.
+
+        Returns:
+            dict: {"deleted": [...ids], "version": int}
+        """
+        with self._lock:
+            _, row_by_id, _, index = self._storage
+            deleted = [job_id for job_id in dict.fromkeys(job_ids) if job_id in row_by_id]
+            if not deleted:
+                return {"deleted": [], "version": self.version}
+
+            index.remove([row_by_id.pop(job_id) for job_id in deleted])
+            self.version += 1
+            self._maybe_compact()
+
+            logger.info(f"✅ Job catalog v{self.version}: -{len(deleted)} deleted ({len(self)} live)")
+            return {"deleted": deleted, "version": self.version}
+
+    def _maybe_refit(self):
+        """
+        Refit the PCA projection on every live job once the catalog has
+        outgrown the rows it was fitted on. Also drops tombstoned rows.
+
+        Returns:
+            bool: True if the storage was rebuilt
+        """
+        live = len(self)
+        if not self.pca_dim or live < self.refit_growth * max(self._fit_rows, 1):
+            return False
+
+        all_jobs, row_by_id, _, _ = self._storage
+        jobs = [all_jobs[row] for row in sorted(row_by_id.values())]
+        embeddings = normalize_embeddings(self.encode_fn(jobs))
+        self.codec = fit_codec(embeddings, dtype=self.embedding_dtype, pca_dim=self.pca_dim)
+        self._fit_rows = live
+        self._install(jobs, embeddings)
+        logger.info(f"🧹 Job catalog refitted {self.codec.name} on {live} jobs")
+        return True
+
+    def _maybe_compact(self):
+        """Rebuild storage without tombstoned rows once they outweigh live ones."""
+        all_jobs, row_by_id, _, index = self._storage
+        live = len(row_by_id)
+        dead = len(all_jobs) - live
+        if live == 0 or dead <= max(64, self.compact_ratio * live):
+            return
+
+        live_rows = sorted(row_by_id.values())
+        jobs = [all_jobs[row] for row in live_rows]
+        embeddings = index.vectors(live_rows)
+        self._install(jobs, embeddings)
+        logger.info(f"🧹 Job catalog compacted: dropped {dead} stale rows")
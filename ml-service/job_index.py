@@ -0,0 +1,281 @@
+"""
+DomainX AI — Job embedding index
+
+Pluggable nearest-neighbour search over job embeddings. Both backends work on
+L2-normalised float32 vectors, so cosine similarity is a plain dot product.
+
+Backends (selected with ML_JOB_INDEX):
+    exact  Pre-normalised matrix, one matmul per query batch, argpartition
+           top-k. Exact results; O(J) per query.
+    hnsw   hnswlib HNSW graph (inner-product space). Sub-linear queries with
+           recall traded against latency via M / ef_construction / ef_search.
+           Requires `pip install hnswlib`.
+
+Both accept an `EmbeddingCodec` (see embedding_codec.py) to store rows in a
+compressed form: PCA-reduced and/or float16 / int8. The exact backend scores
+queries directly against the compressed codes; hnswlib only stores float32,
+so it supports PCA reduction but not quantisation.
+
+Indexes are append-only: rows are numbered in insertion order, `add` appends
+new rows and `remove` tombstones rows so they are never returned again. The
+row count is published only after a row is fully written, so searches running
+on other threads never see a half-added row.
+"""
+
+import logging
+import threading
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_embeddings(embeddings: np.ndarray) -> np.ndarray:
+    """Return a float32, row-wise L2-normalised copy of `embeddings`."""
+    embeddings = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+    norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+    return embeddings / np.maximum(norms, 1e-12)
+
+
+def top_k_rows(scores: np.ndarray, k: int):
+    """
+    Top-k columns per row of a score matrix, best first.
+
+    Uses argpartition so only the k winners are sorted.
+
+    Returns:
+        tuple: (indices, scores), both shaped (N, k)
+    """
+    n_cols = scores.shape[1]
+    k = min(k, n_cols)
+    if k < n_cols:
+        idx = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        idx = np.broadcast_to(np.arange(n_cols), scores.shape)
+    top = np.take_along_axis(scores, idx, axis=1)
+    order = np.argsort(-top, axis=1, kind="stable")
+    return np.take_along_axis(idx, order, axis=1), np.take_along_axis(top, order, axis=1)
+
+
+class ExactJobIndex:
+    """
+    Brute-force cosine index over a pre-normalised matrix.
+
+    Args:
+        codec (EmbeddingCodec | None): Store rows compressed; None keeps the
+            float32 matrix as given (a shared memmap stays mapped).
+    """
+
+    kind = "exact"
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False, codec=None):
+        self._codec = None if codec is None or codec.is_identity else codec
+        if self._codec is not None:
+            self._matrix = self._codec.encode(embeddings)
+        else:
+            # May be a read-only memmap; it is copied to RAM on the first `add`
+            self._matrix = (
+                np.asarray(embeddings, dtype=np.float32) if normalized
+                else normalize_embeddings(embeddings)
+            )
+        self._size = self._matrix.shape[0]
+        self._active = np.ones(self._size, dtype=bool)
+        self._deleted = 0
+
+    def __len__(self):
+        """Number of live (not removed) rows."""
+        return self._size - self._deleted
+
+    @property
+    def size(self):
+        """Number of rows ever added, including removed ones."""
+        return self._size
+
+    def search(self, queries: np.ndarray, k: int):
+        """
+        Find the k most similar jobs for each query embedding.
+
+        Args:
+            queries (np.ndarray): (N, dim) or (dim,) resume embeddings
+            k (int): Neighbours per query (capped at the live row count)
+
+        Returns:
+            tuple: (row indices, cosine similarities), both shaped (N, k)
+        """
+        # Read the published size first; rows below it are complete
+        size = self._size
+        matrix, active, deleted = self._matrix, self._active, self._deleted
+
+        if self._codec is not None:
+            prepared = self._codec.prepare_queries(queries)
+            scores = self._codec.scores(prepared, matrix[:size])
+        else:
+            scores = normalize_embeddings(queries) @ matrix[:size].T
+        if deleted:
+            scores[:, ~active[:size]] = -np.inf
+        return top_k_rows(scores, min(k, size - deleted))
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        """Append normalised vectors; returns their row numbers."""
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self._codec is not None:
+            vectors = self._codec.encode(vectors)
+        start, end = self._size, self._size + vectors.shape[0]
+
+        if isinstance(self._matrix, np.memmap) or end > self._matrix.shape[0]:
+            capacity = max(end, 2 * self._matrix.shape[0], 16)
+            matrix = np.empty((capacity, vectors.shape[1]), dtype=self._matrix.dtype)
+            matrix[:start] = self._matrix[:start]
+            active = np.zeros(capacity, dtype=bool)
+            active[:start] = self._active[:start]
+            self._matrix, self._active = matrix, active
+
+        self._matrix[start:end] = vectors
+        self._active[start:end] = True
+        self._size = end
+        return np.arange(start, end)
+
+    def remove(self, rows) -> None:
+        rows = [r for r in rows if self._active[r]]
+        self._active[rows] = False
+        self._deleted += len(rows)
+
+    def vectors(self, rows) -> np.ndarray:
+        """Original-space vectors for `rows` (approximate when compressed)."""
+        stored = np.asarray(self._matrix[np.asarray(rows, dtype=np.int64)])
+        return stored if self._codec is None else self._codec.decode(stored)
+
+
+class HnswJobIndex:
+    """
+    Approximate index backed by an hnswlib HNSW graph.
+
+    Args:
+        M (int): Graph degree. Higher = better recall, more memory.
+        ef_construction (int): Build-time candidate list size.
+        ef_search (int): Query-time candidate list size; the main
+            recall/latency knob. Always raised to at least k.
+        codec (EmbeddingCodec | None): PCA projection applied before
+            indexing; its dtype must be float32.
+    """
+
+    kind = "hnsw"
+
+    def __init__(self, embeddings: np.ndarray, normalized: bool = False,
+                 M: int = 16, ef_construction: int = 200, ef_search: int = 64,
+                 codec=None):
+        import hnswlib
+
+        if codec is not None and codec.dtype != "float32":
+            raise ValueError(
+                f"hnsw stores float32 vectors; embedding dtype {codec.dtype} "
+                "is only supported by the exact index"
+            )
+        self._codec = None if codec is None or codec.is_identity else codec
+        if self._codec is not None:
+            matrix = self._codec.project(embeddings)
+        else:
+            matrix = (
+                np.asarray(embeddings, dtype=np.float32) if normalized
+                else normalize_embeddings(embeddings)
+            )
+        self.ef_search = int(ef_search)
+        self._size = matrix.shape[0]
+        self._deleted = 0
+        # hnswlib calls are short; the lock mainly guards resize_index, which
+        # reallocates the graph and must not overlap a query
+        self._lock = threading.Lock()
+        self._index = hnswlib.Index(space="ip", dim=matrix.shape[1])
+        self._index.init_index(
+            max_elements=max(self._size, 16),
+            ef_construction=int(ef_construction),
+            M=int(M),
+        )
+        if self._size:
+            self._index.add_items(matrix, np.arange(self._size))
+        self._index.set_ef(self.ef_search)
+
+    def __len__(self):
+        return self._size - self._deleted
+
+    @property
+    def size(self):
+        return self._size
+
+    def search(self, queries: np.ndarray, k: int):
+        """Same contract as `ExactJobIndex.search`, approximately."""
+        queries = (
+            self._codec.project(queries) if self._codec is not None
+            else normalize_embeddings(queries)
+        )
+        with self._lock:
+            k = min(k, self._size - self._deleted)
+            if k <= 0:
+                empty = np.empty((queries.shape[0], 0))
+                return empty.astype(np.int64), empty.astype(np.float32)
+            self._index.set_ef(max(self.ef_search, k))
+            labels, distances = self._index.knn_query(queries, k=k)
+        # hnswlib "ip" distance is 1 - dot product
+        return labels.astype(np.int64), (1.0 - distances).astype(np.float32)
+
+    def add(self, vectors: np.ndarray) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        if self._codec is not None:
+            vectors = self._codec.project(vectors)
+        start, end = self._size, self._size + vectors.shape[0]
+        rows = np.arange(start, end)
+        with self._lock:
+            capacity = self._index.get_max_elements()
+            if end > capacity:
+                self._index.resize_index(max(end, 2 * capacity))
+            self._index.add_items(vectors, rows)
+            self._size = end
+        return rows
+
+    def remove(self, rows) -> None:
+        with self._lock:
+            for row in rows:
+                try:
+                    self._index.mark_deleted(int(row))
+                    self._deleted += 1
+                except RuntimeError:
+                    pass  # already deleted
+
+    def vectors(self, rows) -> np.ndarray:
+        with self._lock:
+            stored = np.asarray(self._index.get_items(list(map(int, rows))), dtype=np.float32)
+        return stored if self._codec is None else self._codec.decode(stored)
+
+
+INDEX_BACKENDS = {
+    "exact": ExactJobIndex,
+    "hnsw": HnswJobIndex,
+}
+
+
+def build_job_index(embeddings: np.ndarray, backend: str = "exact",
+                    normalized: bool = False, codec=None, **params):
+    """
+    Build a job index with the configured backend.
+
+    Args:
+        embeddings (np.ndarray): (J, dim) job embeddings
+        backend (str): One of INDEX_BACKENDS
+        normalized (bool): Embeddings are already L2-normalised float32
+        codec (EmbeddingCodec | None): Compressed row storage
+        **params: Backend-specific tuning parameters
+
+    Raises:
+        ValueError: If the backend name is unknown
+    """
+    backend = (backend or "exact").lower()
+    if backend not in INDEX_BACKENDS:
+        raise ValueError(
+            f"Unknown job index backend: {backend}. "
+            f"Supported: {', '.join(sorted(INDEX_BACKENDS))}"
+        )
+
+    index = INDEX_BACKENDS[backend](embeddings, normalized=normalized, codec=codec, **params)
+    storage = f" ({codec.name})" if codec is not None and not codec.is_identity else ""
+    logger.info(f"✅ Built {backend} job index over {len(index)} jobs{storage}")
+    return index
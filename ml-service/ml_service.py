@@ -5,29 +5,63 @@ Semantic Job Matching using sentence-transformers (MiniLM)
 Run with:
     uvicorn ml_service:app --reload --port 8001
 
+The port is bound immediately; the model, job embeddings and job index load
+in the background. /health reports liveness, /ready turns 200 once inference
+is warm.
+
 Install:
-    pip install fastapi uvicorn sentence-transformers scikit-learn
+    pip install fastapi uvicorn sentence-transformers scikit-learn prometheus-client
+    pip install hnswlib            # optional, for ML_JOB_INDEX=hnsw
+    pip install onnxruntime onnx   # optional, for ML_ENCODER=onnx
 """
 
-from fastapi import FastAPI
+import time
+
+_IMPORT_STARTED = time.perf_counter()
+
+from fastapi import FastAPI, HTTPException, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from prometheus_client import CONTENT_TYPE_LATEST, Gauge, generate_latest
 from pydantic import BaseModel
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+from contextlib import asynccontextmanager
+from typing import List
+import asyncio
 import numpy as np
+import os
 import re
 import logging
 
+from batching import MicroBatcher
+from catalog_log import CatalogLog
+from encoders import build_encoder, default_onnx_dir
+from inference import InferenceExecutor, InferenceQueueFull
+from embedding_store import EmbeddingStore
+from job_catalog import JobCatalog
+from resume_cache import ResumeCache, cache_key, normalize_text
+from scoring import score_jobs, top_k_positions
+from skill_matcher import SkillMatcher
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
 # ============================================================
 # APP SETUP
 # ============================================================
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Defined with the background warm-up below
+    await start_background_work()
+    try:
+        yield
+    finally:
+        await stop_background_work()
+
 app = FastAPI(
     title="DomainX ML Job Matcher",
     description="Semantic resume-to-job matching using MiniLM",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -38,11 +72,46 @@ app.add_middleware(
 )
 
 # ============================================================
-# LOAD MODEL ONCE AT STARTUP
+# STARTUP STATE — model + index are loaded in the background
 # ============================================================
-logger.info("⏳ Loading MiniLM model (first run may take ~30s)...")
-model = SentenceTransformer("paraphrase-MiniLM-L3-v2")
-logger.info("✅ Model loaded successfully")
+MODEL_NAME = "paraphrase-MiniLM-L3-v2"
+
+# torch (sentence-transformers) or onnx (ONNX Runtime, int8 by default)
+ENCODER_BACKEND = os.getenv("ML_ENCODER", "torch").lower()
+# Encodes are tokenised first and batched by length under a padded-token
+# budget (rows x longest row), instead of a fixed number of texts
+ENCODER_PARAMS = {
+    "max_tokens": int(os.getenv("ML_ENCODE_MAX_TOKENS", "4096")),
+    "max_batch_size": int(os.getenv("ML_ENCODE_MAX_BATCH", "256")),
+    **{
+        "onnx": {
+            "model_dir": os.getenv("ML_ONNX_DIR") or default_onnx_dir(
+                os.path.join(os.path.dirname(os.path.abspath(__file__)), "onnx_model"), MODEL_NAME
+            ),
+            "quantize": os.getenv("ML_ONNX_QUANTIZE", "1") != "0",
+            "threads": os.getenv("ML_ONNX_THREADS") or os.getenv("ML_TORCH_THREADS") or None,
+        },
+    }.get(ENCODER_BACKEND, {}),
+}
+
+# Backends produce slightly different vectors, so cached job embeddings are
+# kept apart per backend
+ENCODER_ID = MODEL_NAME if ENCODER_BACKEND == "torch" else (
+    f"{MODEL_NAME}-{ENCODER_BACKEND}" + ("-int8" if ENCODER_PARAMS.get("quantize") else "")
+)
+
+# Set by load_inference_stack() once the encoder and catalog are warm
+encoder = None
+job_catalog = None
+
+# phase: starting -> loading_model -> indexing -> warming_up -> ready | failed
+startup_state = {"phase": "starting", "error": None, "timings": {}}
+
+STARTUP_SECONDS = Gauge(
+    "ml_startup_seconds",
+    "Duration of each startup phase",
+    ["phase"],
+)
 
 # ============================================================
 # JOB DATASET — 20 curated tech jobs
@@ -253,20 +322,228 @@ JOB_DATASET = [
 # ============================================================
 # PRECOMPUTE JOB EMBEDDINGS AT STARTUP
 # ============================================================
-logger.info("⏳ Precomputing job embeddings...")
-job_descriptions = [
-    f"{job['title']} {job['description']} {' '.join(job['required_skills'])}"
-    for job in JOB_DATASET
-]
-JOB_EMBEDDINGS = model.encode(job_descriptions, convert_to_numpy=True)
-logger.info(f"✅ Precomputed embeddings for {len(JOB_DATASET)} jobs")
+# Cached on disk per model + job text hash and memory-mapped, so restarts
+# only re-encode jobs that changed and workers share one copy of the matrix.
+EMBEDDING_CACHE_DIR = os.getenv(
+    "ML_EMBEDDING_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "embedding_cache"),
+)
+embedding_store = EmbeddingStore(EMBEDDING_CACHE_DIR, ENCODER_ID)
+
+# Every /jobs change is appended here and applied from the log, so all
+# uvicorn workers converge on the same catalog and changes survive restarts
+job_log = CatalogLog(os.getenv(
+    "ML_JOB_CATALOG_LOG",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "job_catalog.jsonl"),
+))
+# How often each worker picks up changes made through the other workers
+JOB_LOG_POLL_SECONDS = float(os.getenv("ML_JOB_LOG_POLL_SECONDS", "2"))
+
+def job_document(job: dict) -> str:
+    """Text embedded for a job posting."""
+    return f"{job['title']} {job['description']} {' '.join(job['required_skills'])}"
+
+def encode_jobs(jobs: list) -> np.ndarray:
+    return encoder.encode([job_document(job) for job in jobs])
+
+# ============================================================
+# JOB CATALOG — jobs + exact or approximate nearest-neighbour index
+# ============================================================
+JOB_INDEX_BACKEND = os.getenv("ML_JOB_INDEX", "exact").lower()
+JOB_INDEX_PARAMS = {
+    "hnsw": {
+        "M": int(os.getenv("ML_HNSW_M", "16")),
+        "ef_construction": int(os.getenv("ML_HNSW_EF_CONSTRUCTION", "200")),
+        "ef_search": int(os.getenv("ML_HNSW_EF_SEARCH", "64")),
+    },
+}.get(JOB_INDEX_BACKEND, {})
+
+# Compressed job embedding storage: float32 | float16 | int8, plus optional
+# PCA reduction. See benchmarks/compression_report.py for the accuracy cost.
+JOB_EMBEDDING_DTYPE = os.getenv("ML_EMBEDDING_DTYPE", "float32").lower()
+JOB_EMBEDDING_PCA_DIM = int(os.getenv("ML_EMBEDDING_PCA_DIM", "0"))
+
+# Jobs retrieved by semantic similarity and then fully scored per resume.
+# Catalogs smaller than this are scored exhaustively.
+INDEX_CANDIDATES = int(os.getenv("ML_INDEX_CANDIDATES", "500"))
+
+TOP_K_MATCHES = 5
 
 # ============================================================
-# REQUEST MODEL
+# REQUEST MODELS
 # ============================================================
 class ResumeText(BaseModel):
     text: str
 
+class ResumeBatch(BaseModel):
+    texts: List[str]
+
+class JobFields(BaseModel):
+    title: str
+    company: str
+    location: str
+    salary_lpa: float
+    required_skills: List[str]
+    experience_years: int
+    description: str = ""
+
+class JobPosting(JobFields):
+    id: str
+
+class JobBulkChange(BaseModel):
+    upsert: List[JobPosting] = []
+    delete: List[str] = []
+
+# Upper bound on resumes accepted by a single /analyze-batch call
+MAX_BATCH_RESUMES = int(os.getenv("ML_MAX_BATCH_RESUMES", "1000"))
+MIN_RESUME_CHARS = 30
+
+# ============================================================
+# INFERENCE EXECUTOR — keeps encode/scoring off the event loop
+# ============================================================
+inference_executor = InferenceExecutor(
+    max_workers=int(os.getenv("ML_INFERENCE_WORKERS", "1")),
+    max_queue=int(os.getenv("ML_INFERENCE_QUEUE_SIZE", "64")),
+    torch_threads=os.getenv("ML_TORCH_THREADS") or None,
+    retry_after=int(os.getenv("ML_RETRY_AFTER_SECONDS", "1")),
+)
+
+def is_ready() -> bool:
+    return startup_state["phase"] == "ready"
+
+def not_ready_response(body: dict) -> JSONResponse:
+    return JSONResponse(
+        status_code=503,
+        content={**body, "error": f"Service is starting up ({startup_state['phase']})"},
+        headers={"Retry-After": "5"},
+    )
+
+def overloaded_response(error: InferenceQueueFull, body: dict) -> JSONResponse:
+    logger.warning(f"⚠️  Inference queue full ({inference_executor.pending} pending), rejecting request")
+    return JSONResponse(
+        status_code=503,
+        content=body,
+        headers={"Retry-After": str(error.retry_after)},
+    )
+
+# ============================================================
+# MICRO-BATCHING — coalesce concurrent /analyze-text encodes
+# ============================================================
+def encode_texts(texts: list) -> np.ndarray:
+    return encoder.encode(texts)
+
+batcher = MicroBatcher(
+    encode_texts,
+    max_batch_size=int(os.getenv("ML_BATCH_MAX_SIZE", "32")),
+    max_wait_ms=float(os.getenv("ML_BATCH_MAX_WAIT_MS", "5")),
+    max_queue=int(os.getenv("ML_BATCH_MAX_QUEUE", "256")),
+    executor=inference_executor,
+)
+
+# ============================================================
+# RESUME CACHE — repeated resume texts skip encode + scoring
+# ============================================================
+resume_cache = ResumeCache(
+    max_entries=int(os.getenv("ML_RESUME_CACHE_SIZE", "2048")),
+    ttl_seconds=float(os.getenv("ML_RESUME_CACHE_TTL_SECONDS", "3600")),
+)
+
+# ============================================================
+# BACKGROUND WARM-UP
+# ============================================================
+WARMUP_TEXT = (
+    "Senior Python developer with 5 years of experience building REST APIs "
+    "with Django and FastAPI, deploying on AWS with Docker and Kubernetes."
+)
+
+def _timed_phase(phase: str, started: float) -> float:
+    elapsed = time.perf_counter() - started
+    startup_state["timings"][f"{phase}_seconds"] = round(elapsed, 3)
+    STARTUP_SECONDS.labels(phase=phase).set(elapsed)
+    return time.perf_counter()
+
+def load_inference_stack():
+    """Load the model, job embeddings and job index, then warm them up (blocking)."""
+    global encoder, job_catalog
+
+    startup_state["phase"] = "loading_model"
+    started = time.perf_counter()
+    logger.info(f"⏳ Loading MiniLM model on {ENCODER_BACKEND} (first run may take ~30s)...")
+    loaded_encoder = build_encoder(ENCODER_BACKEND, MODEL_NAME, **ENCODER_PARAMS)
+    logger.info("✅ Model loaded successfully")
+    started = _timed_phase("model_load", started)
+
+    startup_state["phase"] = "indexing"
+    jobs = job_log.replay(JOB_DATASET)
+    logger.info("⏳ Precomputing job embeddings...")
+    job_embeddings = embedding_store.load(
+        [job_document(job) for job in jobs],
+        loaded_encoder.encode,
+    )
+    logger.info(f"✅ Precomputed embeddings for {len(jobs)} jobs")
+
+    # Owns job dicts, embeddings (in the index) and columnar score features,
+    # and applies add/update/delete in place. Its version is bumped on every
+    # change, so cached match results from an older version are rescored.
+    catalog = JobCatalog(
+        jobs,
+        job_embeddings,
+        encode_jobs,
+        index_backend=JOB_INDEX_BACKEND,
+        index_params=JOB_INDEX_PARAMS,
+        embedding_dtype=JOB_EMBEDDING_DTYPE,
+        pca_dim=JOB_EMBEDDING_PCA_DIM,
+    )
+    started = _timed_phase("index", started)
+
+    # First encode pays tokenizer / torch lazy-init costs; running it through
+    # the full match path also warms the index search and scoring kernels
+    startup_state["phase"] = "warming_up"
+    encoder = loaded_encoder
+    warmup_embedding = loaded_encoder.encode([WARMUP_TEXT])[0]
+    match_embedding(catalog.view(), WARMUP_TEXT, warmup_embedding)
+    _timed_phase("warmup", started)
+
+    job_catalog = catalog
+    startup_state["phase"] = "ready"
+    logger.info(f"✅ Inference ready {startup_state['timings']}")
+
+async def warm_up():
+    try:
+        # On the inference executor so torch thread settings apply from the start
+        await inference_executor.run(load_inference_stack)
+    except Exception as e:
+        startup_state.update(phase="failed", error=str(e))
+        logger.exception(f"❌ Inference warm-up failed: {e}")
+
+async def follow_job_log():
+    """Apply catalog changes made through the other workers."""
+    while True:
+        await asyncio.sleep(JOB_LOG_POLL_SECONDS)
+        if not is_ready() or not job_log.has_new():
+            continue
+        try:
+            await inference_executor.run(sync_job_catalog)
+        except InferenceQueueFull:
+            pass  # busy; next round
+        except Exception as e:
+            logger.exception(f"❌ Applying job catalog changes failed: {e}")
+
+_warmup_task = None
+_job_log_task = None
+
+async def start_background_work():
+    global _warmup_task, _job_log_task
+    await batcher.start()
+    # Not awaited: uvicorn binds the port while the model loads
+    _warmup_task = asyncio.create_task(warm_up())
+    _job_log_task = asyncio.create_task(follow_job_log())
+
+async def stop_background_work():
+    _job_log_task.cancel()
+    await batcher.stop()
+    inference_executor.shutdown(wait=False)
+
 # ============================================================
 # HELPER: EXTRACT SKILLS FROM TEXT
 # ============================================================
@@ -281,9 +558,11 @@ KNOWN_SKILLS = [
     "solidity", "blockchain", "spark", "hadoop", "terraform", "ansible"
 ]
 
+# Compiled once; whole-token matches only, in KNOWN_SKILLS order
+SKILL_MATCHER = SkillMatcher(KNOWN_SKILLS)
+
 def extract_skills_from_text(text: str) -> list:
-    text_lower = text.lower()
-    return [skill for skill in KNOWN_SKILLS if skill in text_lower]
+    return SKILL_MATCHER.extract(text)
 
 # ============================================================
 # HELPER: EXTRACT EXPERIENCE YEARS
@@ -304,113 +583,346 @@ def extract_experience_years(text: str) -> int:
     return 2  # default
 
 # ============================================================
-# SCORING FUNCTIONS
+# SCORING FUNCTIONS — sub-scores are vectorised in scoring.py
 # ============================================================
-def calculate_skill_score(resume_skills: list, job_skills: list) -> float:
-    if not job_skills:
-        return 50.0
-    matched = sum(1 for s in job_skills if s.lower() in resume_skills)
-    return round((matched / len(job_skills)) * 100, 1)
-
-def calculate_experience_score(resume_exp: int, job_exp: int) -> float:
-    if resume_exp >= job_exp:
-        return min(100.0, 70.0 + (resume_exp - job_exp) * 5)
-    gap = job_exp - resume_exp
-    return max(10.0, 70.0 - gap * 20)
-
-def calculate_location_score(job_location: str) -> float:
-    if job_location.lower() == "remote":
-        return 100.0
-    return 75.0  # Willing-to-relocate default
-
-def calculate_salary_score(salary_lpa: int, resume_exp: int) -> float:
-    expected = 4 + (resume_exp * 3)  # rough expected LPA
-    if salary_lpa >= expected:
-        return min(100.0, 60.0 + (salary_lpa - expected) * 2)
-    return max(20.0, 60.0 - (expected - salary_lpa) * 3)
-
 def calculate_hiring_probability(final_score: float) -> float:
     if final_score >= 85: return round(0.85 + (final_score - 85) * 0.01, 2)
     if final_score >= 70: return round(0.60 + (final_score - 70) * 0.016, 2)
     if final_score >= 50: return round(0.30 + (final_score - 50) * 0.015, 2)
     return round(final_score * 0.005, 2)
 
+# ============================================================
+# CORE MATCHING — score one resume against every job
+# ============================================================
+def score_resume(view, text: str, candidates: np.ndarray, similarities: np.ndarray) -> list:
+    """Score one resume against candidate jobs (catalog rows + their similarities)."""
+    # Empty catalog (e.g. every job deleted): nothing to rank
+    if len(candidates) == 0:
+        return []
+
+    # Extract resume features
+    resume_skills = extract_skills_from_text(text)
+    resume_exp = extract_experience_years(text)
+
+    # All sub-scores + weighted final score for every candidate at once
+    scores = score_jobs(view.features, resume_skills, resume_exp, candidates, similarities)
+
+    # Only the top 5 are turned into response dicts
+    top_matches = []
+    for pos in top_k_positions(scores["final"], TOP_K_MATCHES):
+        job = view.jobs[candidates[pos]]
+        final_score = float(scores["final"][pos])
+        top_matches.append({
+            "id":                  job["id"],
+            "title":               job["title"],
+            "company":             job["company"],
+            "location":            job["location"],
+            "salary_lpa":          job["salary_lpa"],
+            "final_score":         final_score,
+            "hiring_probability":  calculate_hiring_probability(final_score),
+            "breakdown": {
+                "skill_score":     float(scores["skill"][pos]),
+                "experience_score": float(scores["experience"][pos]),
+                "location_score":  float(scores["location"][pos]),
+                "salary_score":    float(scores["salary"][pos]),
+                "semantic_score":  float(scores["semantic"][pos])
+            }
+        })
+
+    return top_matches
+
+def match_embedding(view, text: str, resume_embedding: np.ndarray) -> list:
+    """Similarity + scoring for one already-embedded resume (runs on the executor)."""
+    [(candidates, similarities)] = JobCatalog.search(view, resume_embedding, INDEX_CANDIDATES)
+    return score_resume(view, text, candidates, similarities)
+
+def match_batch(view, texts: list) -> tuple:
+    """
+    Encode and score several resumes in one pass (runs on the executor).
+
+    Returns:
+        tuple: (embeddings, per-resume top_matches)
+    """
+    # One forward pass over the whole batch, one index query for all of it
+    embeddings = encoder.encode(texts)
+    hits = JobCatalog.search(view, embeddings, INDEX_CANDIDATES)
+    matches = [
+        score_resume(view, text, candidates, similarities)
+        for text, (candidates, similarities) in zip(texts, hits)
+    ]
+    return embeddings, matches
+
+async def match_resume_cached(text: str) -> list:
+    """
+    Top matches for one resume, served from the resume cache when possible.
+
+    Identical concurrent requests share one computation. A cached embedding
+    is reused even when the job index changed since it was scored.
+    """
+    key = cache_key(text)
+    entry = resume_cache.get(key)
+    if entry is not None and entry.index_version == job_catalog.version:
+        resume_cache.record("hit")
+        return entry.top_matches
+
+    async def compute():
+        view = job_catalog.view()
+        if entry is not None:
+            resume_cache.record("embedding")
+            resume_embedding = entry.embedding
+        else:
+            resume_cache.record("miss")
+            # Generate resume embedding (batched with concurrent requests)
+            resume_embedding = await batcher.encode(text)
+
+        # Cosine similarity + weighted scoring, off the event loop
+        top_matches = await inference_executor.run(match_embedding, view, text, resume_embedding)
+        resume_cache.put(key, resume_embedding, top_matches, view.version)
+        return top_matches
+
+    return await resume_cache.single_flight(key, compute)
+
 # ============================================================
 # MAIN ENDPOINT — POST /analyze-text
 # ============================================================
 @app.post("/analyze-text")
 async def analyze_resume_text(resume: ResumeText):
+    if not is_ready():
+        return not_ready_response({"top_matches": []})
     try:
         text = resume.text.strip()
-        if not text or len(text) < 30:
+        if not text or len(text) < MIN_RESUME_CHARS:
             return {"top_matches": [], "error": "Resume text too short"}
 
         logger.info(f"📄 Analyzing resume text ({len(text)} chars)...")
 
-        # Extract resume features
-        resume_skills = extract_skills_from_text(text)
-        resume_exp = extract_experience_years(text)
-
-        # Generate resume embedding
-        resume_embedding = model.encode([text], convert_to_numpy=True)
-
-        # Cosine similarity against all jobs
-        similarities = cosine_similarity(resume_embedding, JOB_EMBEDDINGS)[0]
-
-        # Score each job with weighted formula
-        job_scores = []
-        for i, job in enumerate(JOB_DATASET):
-            skill_score    = calculate_skill_score(resume_skills, job["required_skills"])
-            exp_score      = calculate_experience_score(resume_exp, job["experience_years"])
-            location_score = calculate_location_score(job["location"])
-            salary_score   = calculate_salary_score(job["salary_lpa"], resume_exp)
-            semantic_score = round(float(similarities[i]) * 100, 1)
-
-            # Weighted final score
-            final_score = (
-                skill_score    * 0.40 +
-                exp_score      * 0.20 +
-                location_score * 0.15 +
-                salary_score   * 0.15 +
-                semantic_score * 0.10
-            )
-            final_score = round(min(100.0, max(0.0, final_score)), 1)
-
-            job_scores.append({
-                "id":                  job["id"],
-                "title":               job["title"],
-                "company":             job["company"],
-                "location":            job["location"],
-                "salary_lpa":          job["salary_lpa"],
-                "final_score":         final_score,
-                "hiring_probability":  calculate_hiring_probability(final_score),
-                "breakdown": {
-                    "skill_score":     skill_score,
-                    "experience_score": exp_score,
-                    "location_score":  location_score,
-                    "salary_score":    salary_score,
-                    "semantic_score":  semantic_score
-                }
-            })
-
-        # Sort by final score, return top 5
-        top_matches = sorted(job_scores, key=lambda x: x["final_score"], reverse=True)[:5]
-
-        logger.info(f"✅ Top match: {top_matches[0]['title']} ({top_matches[0]['final_score']}%)")
+        top_matches = await match_resume_cached(normalize_text(text))
+
+        if top_matches:
+            logger.info(f"✅ Top match: {top_matches[0]['title']} ({top_matches[0]['final_score']}%)")
+        else:
+            logger.info("✅ No jobs in the catalog to match against")
 
         return {"top_matches": top_matches}
 
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"top_matches": [], "error": str(e)})
+
     except Exception as e:
         logger.error(f"❌ ML analysis error: {e}")
         return {"top_matches": [], "error": str(e)}
 
+# ============================================================
+# BATCH ENDPOINT — POST /analyze-batch
+# ============================================================
+@app.post("/analyze-batch")
+async def analyze_resume_batch(batch: ResumeBatch):
+    """
+    Score many resumes in one call.
+
+    Resumes already in the resume cache are answered from it; all others are
+    embedded with a single batched `encoder.encode` call and looked up in the job
+    index in one query. Results are returned in input order, each shaped like
+    an /analyze-text response.
+    """
+    if not is_ready():
+        return not_ready_response({"results": []})
+    if len(batch.texts) > MAX_BATCH_RESUMES:
+        return {
+            "results": [],
+            "error": f"Batch too large: {len(batch.texts)} resumes (max {MAX_BATCH_RESUMES})"
+        }
+
+    try:
+        texts = [t.strip() for t in batch.texts]
+        results = [{"top_matches": [], "error": "Resume text too short"} for _ in texts]
+        valid = [i for i, t in enumerate(texts) if len(t) >= MIN_RESUME_CHARS]
+
+        logger.info(f"📦 Analyzing batch of {len(texts)} resumes ({len(valid)} valid)...")
+
+        # Serve cached results; everything else goes through one batched pass
+        view = job_catalog.view()
+        pending = {}
+        for i in valid:
+            normalized = normalize_text(texts[i])
+            key = cache_key(normalized)
+            entry = resume_cache.get(key)
+            if entry is not None and entry.index_version == view.version:
+                resume_cache.record("hit")
+                results[i] = {"top_matches": entry.top_matches}
+            else:
+                pending.setdefault(key, (normalized, []))[1].append(i)
+
+        if pending:
+            for _ in pending:
+                resume_cache.record("miss")
+            keys = list(pending)
+            embeddings, matches = await inference_executor.run(
+                match_batch, view, [pending[key][0] for key in keys]
+            )
+            for row, key in enumerate(keys):
+                resume_cache.put(key, embeddings[row], matches[row], view.version)
+                for i in pending[key][1]:
+                    results[i] = {"top_matches": matches[row]}
+
+        logger.info(f"✅ Batch complete: {len(valid)}/{len(texts)} resumes scored")
+
+        return {"results": results}
+
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"results": [], "error": str(e)})
+
+    except Exception as e:
+        logger.error(f"❌ ML batch analysis error: {e}")
+        return {"results": [], "error": str(e)}
+
+# ============================================================
+# JOB MANAGEMENT — add / update / delete without restart
+# ============================================================
+# Only changed jobs are encoded (on the inference executor); the embedding
+# matrix, score features and ANN index are updated in place while in-flight
+# /analyze-* requests keep scoring against the catalog view they started with.
+# Changes go through job_log (see catalog_log.py): a change is appended, then
+# this worker applies every entry up to and including it, in log order.
+
+def _apply_job_log():
+    """
+    Apply log entries not applied yet, in log order; call with job_log.lock held.
+
+    Returns:
+        dict: Catalog result (or the exception) by log offset
+    """
+    results = {}
+    for offset, entry in job_log.read_new():
+        try:
+            result = {}
+            if "upsert" in entry:
+                result.update(job_catalog.upsert(entry["upsert"]))
+            if "delete" in entry:
+                result.update(job_catalog.delete(entry["delete"]))
+        except Exception as e:
+            logger.exception(f"❌ Job catalog change at offset {offset} failed: {e}")
+            result = e
+        results[offset] = result
+    return results
+
+def sync_job_catalog():
+    """Apply changes logged by other workers (blocking)."""
+    with job_log.lock:
+        _apply_job_log()
+
+def change_job_catalog(entry: dict) -> dict:
+    """Log one change, then apply it and everything logged before it (blocking)."""
+    with job_log.lock:
+        offset = job_log.append(entry)
+        result = _apply_job_log()[offset]
+    if isinstance(result, Exception):
+        raise result
+    return result
+
+def require_ready():
+    if not is_ready():
+        raise HTTPException(
+            status_code=503,
+            detail=f"Service is starting up ({startup_state['phase']})",
+            headers={"Retry-After": "5"},
+        )
+
+@app.get("/jobs")
+async def list_jobs():
+    require_ready()
+    return {"jobs": job_catalog.list_jobs(), "version": job_catalog.version}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    require_ready()
+    job = job_catalog.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+@app.post("/jobs", status_code=201)
+async def create_job(job: JobPosting):
+    require_ready()
+    if job.id in job_catalog:
+        raise HTTPException(status_code=409, detail=f"Job already exists: {job.id}")
+    try:
+        return await inference_executor.run(change_job_catalog, {"upsert": [dict(job)]})
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"error": str(e)})
+
+@app.put("/jobs/{job_id}")
+async def update_job(job_id: str, job: JobFields):
+    require_ready()
+    if job_id not in job_catalog:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    try:
+        return await inference_executor.run(change_job_catalog, {"upsert": [{"id": job_id, **dict(job)}]})
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"error": str(e)})
+
+@app.delete("/jobs/{job_id}")
+async def delete_job(job_id: str):
+    require_ready()
+    if job_id not in job_catalog:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    try:
+        return await inference_executor.run(change_job_catalog, {"delete": [job_id]})
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"error": str(e)})
+
+@app.post("/jobs/bulk")
+async def bulk_change_jobs(change: JobBulkChange):
+    """Upsert and delete many jobs in one call; deletes are applied after upserts."""
+    require_ready()
+    entry = {"upsert": [dict(job) for job in change.upsert], "delete": change.delete}
+    try:
+        return await inference_executor.run(change_job_catalog, entry)
+    except InferenceQueueFull as e:
+        return overloaded_response(e, {"error": str(e)})
+
 # ============================================================
 # HEALTH CHECK
 # ============================================================
 @app.get("/health")
 async def health():
+    """Liveness: answers as soon as the port is bound, even while warming up."""
+    ready = is_ready()
     return {
         "status": "healthy",
-        "model": "paraphrase-MiniLM-L3-v2",
-        "jobs_indexed": len(JOB_DATASET)
+        "ready": ready,
+        "startup": startup_state,
+        "model": MODEL_NAME,
+        "encoder": ENCODER_BACKEND,
+        "jobs_indexed": len(job_catalog) if ready else 0,
+        "job_index": job_catalog.kind if ready else JOB_INDEX_BACKEND,
+        "job_embeddings": job_catalog.codec.name if ready else JOB_EMBEDDING_DTYPE,
+        "catalog_version": job_catalog.version if ready else 0,
+        "inference_pending": inference_executor.pending,
+        "inference_capacity": inference_executor.capacity,
+        "resume_cache": resume_cache.stats()
     }
+
+# ============================================================
+# READINESS — green only once inference is warm
+# ============================================================
+@app.get("/ready")
+async def ready():
+    if is_ready():
+        return {"status": "ready", "timings": startup_state["timings"]}
+    return JSONResponse(
+        status_code=503,
+        content={"status": startup_state["phase"], "error": startup_state["error"]},
+        headers={"Retry-After": "5"},
+    )
+
+# ============================================================
+# METRICS — Prometheus scrape endpoint
+# ============================================================
+@app.get("/metrics")
+async def metrics():
+    return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
+
+startup_state["timings"]["import_seconds"] = round(time.perf_counter() - _IMPORT_STARTED, 3)
+STARTUP_SECONDS.labels(phase="import").set(startup_state["timings"]["import_seconds"])
+logger.info(f"✅ ml_service imported in {startup_state['timings']['import_seconds']}s")
@@ -0,0 +1,137 @@
+"""
+DomainX AI — Content-addressed resume cache
+
+The same resume text arrives again and again (re-uploads, page refreshes,
+gateway retries). Entries are keyed by a SHA-256 of the whitespace-normalised
+text and hold both the resume embedding and the final `top_matches`.
+
+- LRU eviction once `max_entries` is reached, plus a per-entry TTL.
+- `top_matches` are tagged with the job index version they were scored
+  against; after the index changes only the embedding is reused.
+- Single-flight: identical concurrent requests share one computation.
+
+All methods must be called from the event loop thread.
+"""
+
+import asyncio
+import functools
+import hashlib
+import time
+from collections import OrderedDict
+
+from prometheus_client import Counter
+
+# ============================================================
+# METRICS
+# ============================================================
+LOOKUPS = Counter(
+    "ml_resume_cache_lookups_total",
+    "Resume cache lookups by outcome "
+    "(hit = full result, embedding = rescored cached embedding, "
+    "shared = joined an identical in-flight request, miss)",
+    ["result"],
+)
+
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace runs so formatting-only differences share a key."""
+    return " ".join(text.split())
+
+
+def cache_key(normalized_text: str) -> str:
+    return hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+
+
+class CacheEntry:
+    __slots__ = ("embedding", "top_matches", "index_version", "expires_at")
+
+    def __init__(self, embedding, top_matches, index_version, expires_at):
+        self.embedding = embedding
+        self.top_matches = top_matches
+        self.index_version = index_version
+        self.expires_at = expires_at
+
+
+class ResumeCache:
+    """
+    In-process LRU + TTL cache of resume embeddings and match results.
+
+    Args:
+        max_entries (int): Entries kept before evicting the least recently
+            used one. 0 disables caching (single-flight still applies).
+        ttl_seconds (float): Lifetime of an entry.
+    """
+
+    def __init__(self, max_entries=2048, ttl_seconds=3600):
+        self.max_entries = max(0, int(max_entries))
+        self.ttl = float(ttl_seconds)
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def get(self, key):
+        """Live entry for `key` (refreshing its LRU position) or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def put(self, key, embedding, top_matches, index_version):
+        if self.max_entries == 0:
+            return
+        self._entries[key] = CacheEntry(
+            embedding, top_matches, index_version, time.monotonic() + self.ttl
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def record(self, result):
+        """Count a lookup outcome (hit / embedding / shared / miss)."""
+        LOOKUPS.labels(result=result).inc()
+        if result == "miss":
+            self.misses += 1
+        else:
+            self.hits += 1
+
+    async def single_flight(self, key, compute):
+        """
+        Run `compute()` once per key at a time.
+
+        Callers arriving while the same key is being computed await the
+        first caller's result instead of starting their own. The
+        computation runs in its own task, so a cancelled caller (client
+        disconnect) - the first one included - never cancels it for the
+        others.
+        """
+        task = self._inflight.get(key)
+        if task is not None:
+            self.record("shared")
+        else:
+            task = asyncio.ensure_future(compute())
+            self._inflight[key] = task
+            task.add_done_callback(functools.partial(self._finished, key))
+        return await asyncio.shield(task)
+
+    def _finished(self, key, task):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark retrieved so a failure nobody waited for is not logged as unhandled
+        if not task.cancelled():
+            task.exception()
+
+    def stats(self):
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
@@ -0,0 +1,107 @@
+"""
+Compiled skill dictionary matcher.
+
+Replaces `[skill for skill in SKILLS if skill in text_lower]` style loops,
+which cost O(skills x text length) and match inside other words ("c" in
+"cloud", "go" in "google", "r" in "react").
+
+The dictionary is compiled once into a token trie. Matching lowercases the
+text, splits it into tokens with one regex and walks the trie from each
+token, so every skill is found in a single pass, whatever the dictionary
+size. Tokens are runs of word characters (letters, digits, "_", "+", "#",
+so "c++" and "c#" are whole tokens) or single punctuation characters
+("node.js" is node / . / js). A skill therefore only matches whole tokens:
+"go" matches "go" but not "google" or "golang".
+
+Whitespace between tokens is ignored, so "spring  boot" and "spring\\nboot"
+(common in PDF text) match "spring boot". Two common resume spellings are
+accepted as well: a plural last word ("rest apis" -> "rest api") and a
+version number on a one-word skill ("python3" -> "python", "html5" -> "html").
+
+The source of truth is shared/skill_matcher.py. Every service that extracts
+skills imports its own copy, written by shared/sync_skill_matcher.py:
+ml-service (skill_matcher), python-worker (utils.skill_matcher), backend
+(app.services.skill_matcher) and backend1 (app.skill_matcher). Edit the
+shared file only, then run `npm run sync:skill-matcher`.
+"""
+
+import re
+
+# Word runs (incl. + and #) or single punctuation characters
+_TOKEN = re.compile(r"[\w+#]+|[^\s\w+#]")
+_END = None  # trie key holding the skill that ends at a node
+_DIGITS = "0123456789"
+
+
+def tokenize(text):
+    """Lowercase `text` and split it into matcher tokens."""
+    return _TOKEN.findall(text.lower())
+
+
+class SkillMatcher:
+    """
+    Word-boundary skill matcher compiled from a fixed dictionary.
+
+    Args:
+        skills (iterable): Skill names (matched case-insensitively).
+            Results come back in this order.
+    """
+
+    def __init__(self, skills):
+        self.skills = list(dict.fromkeys(s.lower().strip() for s in skills if s and s.strip()))
+        self._rank = {skill: rank for rank, skill in enumerate(self.skills)}
+        self._root = {}
+        compiled = [(skill, tokenize(skill)) for skill in self.skills]
+        for skill, tokens in compiled:
+            self._node(tokens)[_END] = skill
+        # Plural variants never shadow a real dictionary entry
+        for skill, tokens in compiled:
+            last = tokens[-1]
+            if len(last) >= 3 and last.isalpha() and not last.endswith("s"):
+                self._node(tokens[:-1] + [last + "s"]).setdefault(_END, skill)
+
+    def _node(self, tokens):
+        node = self._root
+        for token in tokens:
+            node = node.setdefault(token, {})
+        return node
+
+    def __len__(self):
+        return len(self.skills)
+
+    def extract(self, text):
+        """
+        All dictionary skills found in `text`.
+
+        Returns:
+            list: Unique skills in dictionary order
+        """
+        if not text:
+            return []
+        tokens = tokenize(text)
+        root = self._root
+        n = len(tokens)
+        found = set()
+        for i, token in enumerate(tokens):
+            node = root.get(token)
+            if node is None:
+                # "python3" / "html5": version number on a one-word skill
+                if token[-1] in _DIGITS:
+                    stem = token.rstrip(_DIGITS)
+                    if len(stem) >= 2:
+                        skill = root.get(stem, {}).get(_END)
+                        if skill is not None:
+                            found.add(skill)
+                continue
+            j = i
+            while True:
+                skill = node.get(_END)
+                if skill is not None:
+                    found.add(skill)
+                j += 1
+                if j == n:
+                    break
+                node = node.get(tokens[j])
+                if node is None:
+                    break
+        return sorted(found, key=self._rank.__getitem__)
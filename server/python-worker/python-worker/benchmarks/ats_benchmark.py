@@ -0,0 +1,180 @@
+"""
+Benchmark: fused ATS feature extraction vs the original per-scorer scans.
+
+`legacy_scores` below is the pre-fusion experience / education / format
+scoring (each scorer lowercasing and rescanning the text), kept verbatim
+minus logging as the reference. The benchmark checks that both produce
+identical scores on every resume, then times them.
+
+Run from server/python-worker/python-worker/:
+    python benchmarks/ats_benchmark.py
+    python benchmarks/ats_benchmark.py --lengths 2000 8000 32000 --resumes 50
+"""
+
+import argparse
+import logging
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.skill_matcher_benchmark import synthetic_resume  # noqa: E402
+from utils.ats_engine import (  # noqa: E402
+    calculate_education_score,
+    calculate_experience_score,
+    calculate_format_score,
+)
+from utils.ats_features import extract_ats_features  # noqa: E402
+
+
+# ============================================================
+# REFERENCE: original scorers
+# ============================================================
+def legacy_experience_score(raw_text):
+    text_lower = raw_text.lower()
+    score = 0
+    experience_keywords = ['experience', 'work history', 'employment', 'professional background']
+    if any(keyword in text_lower for keyword in experience_keywords):
+        score += 5
+    year_patterns = [
+        r'\d+\+?\s*years?',
+        r'years?\s*of\s*experience',
+        r'\d{4}\s*-\s*\d{4}',
+        r'\d{4}\s*-\s*present',
+    ]
+    years_found = 0
+    for pattern in year_patterns:
+        if re.search(pattern, text_lower):
+            years_found += 1
+    score += min(years_found * 2, 8)
+    action_verbs = [
+        'developed', 'built', 'created', 'designed', 'implemented',
+        'managed', 'led', 'coordinated', 'achieved', 'improved',
+        'optimized', 'deployed', 'maintained', 'collaborated',
+        'engineered', 'architected', 'delivered', 'launched'
+    ]
+    verbs_found = sum(1 for verb in action_verbs if verb in text_lower)
+    score += min(verbs_found * 2, 12)
+    return {'score': score}
+
+
+def legacy_education_score(raw_text):
+    text_lower = raw_text.lower()
+    score = 0
+    degree_keywords = [
+        'bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'b.e.',
+        'm.tech', 'm.s.', 'mba', 'degree', 'university', 'college',
+        'graduate', 'undergraduate', 'diploma'
+    ]
+    degrees_found = sum(1 for keyword in degree_keywords if keyword in text_lower)
+    score += min(degrees_found * 3, 10)
+    if len(re.findall(r'\b(19|20)\d{2}\b', raw_text)) > 0:
+        score += 5
+    return {'score': score}
+
+
+def legacy_format_score(raw_text):
+    text_lower = raw_text.lower()
+    lines = raw_text.split('\n')
+    score = 0
+    headings = ['skills', 'experience', 'education', 'projects', 'summary', 'objective']
+    headings_found = sum(1 for heading in headings if heading in text_lower)
+    score += min(headings_found * 2, 8)
+    bullet_patterns = ['-', '•', '∙', '▪', '*']
+    bullet_count = sum(1 for line in lines if any(line.strip().startswith(bp) for bp in bullet_patterns))
+    if bullet_count > 0:
+        score += min(bullet_count // 2, 6)
+    paragraphs = [p for p in raw_text.split('\n\n') if p.strip()]
+    reasonable_paragraphs = sum(1 for p in paragraphs if len(p) < 300)
+    if paragraphs and (reasonable_paragraphs / len(paragraphs)) > 0.7:
+        score += 3
+    consecutive_empty = 0
+    max_consecutive = 0
+    for line in lines:
+        if not line.strip():
+            consecutive_empty += 1
+            max_consecutive = max(max_consecutive, consecutive_empty)
+        else:
+            consecutive_empty = 0
+    if max_consecutive <= 4:
+        score += 3
+    return {'score': score}
+
+
+def legacy_scores(raw_text):
+    return (
+        legacy_experience_score(raw_text)['score'],
+        legacy_education_score(raw_text)['score'],
+        legacy_format_score(raw_text)['score'],
+    )
+
+
+def fused_scores(raw_text):
+    features = extract_ats_features(raw_text)
+    return (
+        calculate_experience_score(raw_text, features)['score'],
+        calculate_education_score(raw_text, features)['score'],
+        calculate_format_score(raw_text, features)['score'],
+    )
+
+
+# ============================================================
+# DATA
+# ============================================================
+SECTION_LINES = [
+    "EXPERIENCE", "Work History", "EDUCATION", "Skills", "Projects", "Summary",
+    "Senior Software Engineer, Acme Corp (2019 - present)",
+    "Software Engineer, Initech 2016-2019",
+    "- Developed and deployed microservices; improved latency by 40%",
+    "• Led a team of 5 engineers and collaborated with product",
+    "* Architected the data platform, 3+ years of experience with Kafka",
+    "B.Tech in Computer Science, XYZ University, 2015",
+    "Master of Science (M.S.), Graduate research assistant, 2017",
+    "", "",
+]
+
+
+def structured_resume(length, rng):
+    """Synthetic prose with resume headings, dates and bullets mixed in."""
+    lines, size = [], 0
+    prose = synthetic_resume(length, rng).split(". ")
+    while size < length:
+        line = rng.choice(SECTION_LINES) if rng.random() < 0.5 else rng.choice(prose)
+        lines.append(line)
+        size += len(line) + 1
+    return "\n".join(lines)[:length]
+
+
+def time_per_call(fn, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return 1000 * (time.perf_counter() - started) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--resumes", type=int, default=30, help="Resumes per length")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+
+    print(f"\n{'chars':>8}{'legacy ms':>12}{'fused ms':>11}{'speedup':>9}{'identical':>11}")
+    print("-" * 51)
+    for length in args.lengths:
+        texts = [structured_resume(length, rng) for _ in range(args.resumes)]
+        identical = all(legacy_scores(t) == fused_scores(t) for t in texts)
+        legacy_ms = time_per_call(legacy_scores, texts, args.repeat)
+        fused_ms = time_per_call(fused_scores, texts, args.repeat)
+        print(f"{length:>8}{legacy_ms:>12.3f}{fused_ms:>11.3f}{legacy_ms / fused_ms:>8.1f}x{str(identical):>11}")
+
+
+if __name__ == "__main__":
+    main()
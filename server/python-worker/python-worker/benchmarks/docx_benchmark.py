@@ -0,0 +1,120 @@
+"""
+Benchmark: streaming DOCX extraction vs the python-docx object model.
+
+Generates table-heavy synthetic resumes (skill matrices and project tables
+with merged cells, between ordinary paragraphs) of increasing size and
+extracts each with `iter_docx_blocks` (utils.docx_stream) and with
+python-docx. Each extraction runs in a fresh process so the peak RSS is
+that of the reader alone. Also checks that both readers see the same words
+(merged cells aside: python-docx repeats a merged cell once per grid column,
+the streaming reader reports it once).
+
+Run from server/python-worker/python-worker/:
+    python benchmarks/docx_benchmark.py
+    python benchmarks/docx_benchmark.py --tables 10 50 200 --rows 20
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.skills_data import SKILLS  # noqa: E402
+
+WORDS = (
+    "designed built maintained scalable services migrated legacy systems improved "
+    "latency mentored engineers reviewed code delivered features stakeholders"
+).split()
+
+
+def table_heavy_resume(path, tables, rows, rng):
+    """Write a resume with `tables` tables of `rows` rows (first row merged)."""
+    from docx import Document
+
+    document = Document()
+    document.add_heading("Jane Doe - Senior Engineer", level=1)
+    for number in range(tables):
+        document.add_paragraph(f"Project {number}: " + " ".join(rng.sample(WORDS, 8)))
+        table = document.add_table(rows=rows, cols=4)
+        title = table.cell(0, 0).merge(table.cell(0, 3))
+        title.text = f"Skill matrix {number}"
+        for row in table.rows[1:]:
+            cells = row.cells
+            cells[0].text = rng.choice(SKILLS)
+            cells[1].text = f"{rng.randint(1, 10)} years"
+            cells[2].text = " ".join(rng.sample(WORDS, 4))
+            cells[3].text = rng.choice(["expert", "advanced", "intermediate"])
+    document.save(path)
+
+
+def peak_rss_mb():
+    """Peak RSS of this process; VmHWM is reset on exec, unlike ru_maxrss."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def extract(reader, path):
+    """
+    Child process: extract one file with one reader.
+
+    Returns:
+        tuple: (text, seconds, peak RSS in MB)
+    """
+    from utils.docx_stream import iter_docx_blocks
+    from utils.text_extractor import _iter_docx_blocks_object_model
+
+    blocks = iter_docx_blocks if reader == 'stream' else _iter_docx_blocks_object_model
+    started = time.perf_counter()
+    text = "\n".join(blocks(path))
+    seconds = time.perf_counter() - started
+    return text, seconds, peak_rss_mb()
+
+
+def run_isolated(reader, path):
+    spawn = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+        return pool.submit(extract, reader, path).result()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tables", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--rows", type=int, default=20, help="Rows per table")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+
+    print(f"\n{'tables':>7}{'file KB':>9}{'docx ms':>10}{'stream ms':>11}{'speedup':>9}"
+          f"{'docx MB':>9}{'stream MB':>11}{'same words':>12}")
+    print("-" * 78)
+    with tempfile.TemporaryDirectory() as directory:
+        for tables in args.tables:
+            path = os.path.join(directory, f"resume_{tables}.docx")
+            table_heavy_resume(path, tables, args.rows, rng)
+            docx_text, docx_seconds, docx_mb = run_isolated('python-docx', path)
+            stream_text, stream_seconds, stream_mb = run_isolated('stream', path)
+            # Merged title cells are repeated by python-docx; compare distinct words
+            same = set(docx_text.split()) == set(stream_text.split())
+            print(
+                f"{tables:>7}{os.path.getsize(path) / 1024:>9.0f}{docx_seconds * 1000:>10.1f}"
+                f"{stream_seconds * 1000:>11.1f}{docx_seconds / stream_seconds:>8.1f}x"
+                f"{docx_mb:>9.1f}{stream_mb:>11.1f}{'yes' if same else 'NO':>12}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: PDF extraction backends on a folder of PDFs.
+
+Runs every installed backend from utils.pdf_backends over the same PDFs and
+reports throughput (pages/s), peak memory and how closely its text agrees
+with a reference backend. Each backend runs in a fresh process, so peak RSS
+covers that library alone. Agreement is the Dice overlap of the word
+multisets of the normalized text (1.000 = same words, any order).
+
+Run from server/python-worker/python-worker/:
+    python benchmarks/pdf_backend_benchmark.py ../../../sample-resumes
+    python benchmarks/pdf_backend_benchmark.py resumes/ --backends pypdf2 pypdfium2 --max-pages 10
+"""
+
+import argparse
+import multiprocessing
+import os
+import resource
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.pdf_backends import available_pdf_backends, open_pdf  # noqa: E402
+
+
+def peak_rss_mb():
+    """Peak RSS of this process; VmHWM is reset on exec, unlike ru_maxrss."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def extract_corpus(backend, paths, max_pages):
+    """
+    Child process: extract every PDF with one backend.
+
+    Returns:
+        dict: texts by path (None on failure), pages, seconds, peak RSS in MB
+    """
+    from utils.text_extractor import normalize_text
+
+    texts, pages, failures = {}, 0, 0
+    started = time.perf_counter()
+    for path in paths:
+        try:
+            with open_pdf(path, backend) as document:
+                count = min(document.page_count, max_pages)
+                texts[path] = normalize_text("\n".join(document.page_text(index) for index in range(count)))
+                pages += count
+        except Exception:
+            texts[path] = None
+            failures += 1
+    seconds = time.perf_counter() - started
+    peak_mb = peak_rss_mb()
+    return {'texts': texts, 'pages': pages, 'seconds': seconds, 'failures': failures, 'peak_mb': peak_mb}
+
+
+def agreement(text, reference):
+    """Dice overlap of the two word multisets."""
+    words, reference_words = Counter(text.lower().split()), Counter(reference.lower().split())
+    total = sum(words.values()) + sum(reference_words.values())
+    if not total:
+        return 1.0
+    return 2 * sum((words & reference_words).values()) / total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Folder with PDF files (searched recursively)")
+    parser.add_argument("--backends", nargs="+", default=None, help="Default: every installed backend")
+    parser.add_argument("--reference", default="pypdf2", help="Backend the others are compared with")
+    parser.add_argument("--max-pages", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(args.corpus)
+        for name in names
+        if name.lower().endswith(".pdf")
+    )
+    if not paths:
+        parser.error(f"no PDF files found in {args.corpus}")
+
+    backends = args.backends or available_pdf_backends()
+    if args.reference not in backends:
+        backends = [args.reference] + backends
+
+    results = {}
+    spawn = multiprocessing.get_context("spawn")
+    for backend in backends:
+        with ProcessPoolExecutor(max_workers=1, mp_context=spawn) as pool:
+            results[backend] = pool.submit(extract_corpus, backend, paths, args.max_pages).result()
+
+    reference = results[args.reference]['texts']
+    print(f"\n{len(paths)} PDFs, reference backend: {args.reference}")
+    print(f"\n{'backend':<12}{'pages':>7}{'seconds':>9}{'pages/s':>9}{'peak MB':>9}{'agreement':>11}{'failed':>8}")
+    print("-" * 65)
+    for backend, result in results.items():
+        scores = [
+            agreement(text, reference[path])
+            for path, text in result['texts'].items()
+            if text is not None and reference[path] is not None
+        ]
+        mean_agreement = f"{sum(scores) / len(scores):.3f}" if scores else "-"
+        pages_per_second = result['pages'] / result['seconds'] if result['seconds'] else 0.0
+        print(
+            f"{backend:<12}{result['pages']:>7}{result['seconds']:>9.2f}{pages_per_second:>9.1f}"
+            f"{result['peak_mb']:>9.1f}{mean_agreement:>11}{result['failures']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
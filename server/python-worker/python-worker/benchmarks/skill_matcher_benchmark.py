@@ -0,0 +1,108 @@
+"""
+Benchmark: compiled skill matcher vs the old substring loops.
+
+Compares `[skill for skill in SKILLS if skill in text_lower]` (the loop the
+extractors used before) with `SkillMatcher.extract` on synthetic resumes of
+increasing length, for the real SKILLS list and for a larger dictionary to
+show how each approach scales. Also prints the skills the substring loop
+reports that the matcher rejects (hits inside other words).
+
+Run from server/python-worker/python-worker/:
+    python benchmarks/skill_matcher_benchmark.py
+    python benchmarks/skill_matcher_benchmark.py --lengths 2000 8000 32000 --extra-skills 5000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.skill_matcher import SkillMatcher  # noqa: E402
+from utils.skills_data import SKILLS  # noqa: E402
+
+FILLER = (
+    "responsible for designing building and maintaining scalable services across "
+    "multiple teams led migration of legacy systems improved performance by reducing "
+    "latency collaborated with product managers and designers mentored junior engineers "
+    "wrote documentation reviewed code participated in on-call rotations delivered "
+    "features ahead of schedule worked closely with stakeholders google cloudflare "
+    "research and development golang goal going category recruiting scripting"
+).split()
+
+
+def synthetic_resume(length, rng):
+    """Resume-like text: filler sentences with skills sprinkled in."""
+    parts, size = [], 0
+    while size < length:
+        words = rng.sample(FILLER, rng.randint(6, 14))
+        words.insert(rng.randrange(len(words)), rng.choice(SKILLS))
+        sentence = " ".join(words).capitalize() + (".\n" if rng.random() < 0.3 else ". ")
+        parts.append(sentence)
+        size += len(sentence)
+    return "".join(parts)[:length]
+
+
+def extra_skills(count, rng):
+    """Made-up multi-word skills to grow the dictionary."""
+    syllables = ["da", "ta", "flo", "ke", "ra", "mi", "no", "vex", "zen", "qu", "lo", "pi"]
+    names = set()
+    while len(names) < count:
+        word = "".join(rng.choice(syllables) for _ in range(rng.randint(2, 4)))
+        names.add(word if rng.random() < 0.6 else f"{word} {rng.choice(['js', 'db', 'ops', 'cloud'])}")
+    return sorted(names)
+
+
+def substring_loop(skills, text):
+    text_lower = text.lower()
+    return [skill for skill in skills if skill in text_lower]
+
+
+def time_per_call(fn, texts, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for text in texts:
+            fn(text)
+    return 1000 * (time.perf_counter() - started) / (repeat * len(texts))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--lengths", type=int, nargs="+", default=[2000, 8000, 32000])
+    parser.add_argument("--resumes", type=int, default=20, help="Resumes per length")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--extra-skills", type=int, default=5000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    dictionaries = {
+        f"SKILLS ({len(SKILLS)})": SKILLS,
+        f"SKILLS + {args.extra_skills}": SKILLS + extra_skills(args.extra_skills, rng),
+    }
+
+    print(f"\n{'dictionary':<20}{'chars':>8}{'loop ms':>10}{'matcher ms':>12}{'speedup':>9}")
+    print("-" * 59)
+    false_hits = Counter()
+    for name, skills in dictionaries.items():
+        started = time.perf_counter()
+        matcher = SkillMatcher(skills)
+        compile_ms = 1000 * (time.perf_counter() - started)
+        for length in args.lengths:
+            texts = [synthetic_resume(length, rng) for _ in range(args.resumes)]
+            loop_ms = time_per_call(lambda t: substring_loop(skills, t), texts, args.repeat)
+            matcher_ms = time_per_call(matcher.extract, texts, args.repeat)
+            print(f"{name:<20}{length:>8}{loop_ms:>10.3f}{matcher_ms:>12.3f}{loop_ms / matcher_ms:>8.1f}x")
+            if skills is SKILLS:
+                for text in texts:
+                    false_hits.update(set(substring_loop(skills, text)) - set(matcher.extract(text)))
+        print(f"{'':<20}(compiled in {compile_ms:.1f} ms)")
+
+    print("\nReported by the substring loop but not the matcher (SKILLS, all resumes):")
+    print(", ".join(f"{skill} x{count}" for skill, count in false_hits.most_common(15)) or "none")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ celery_app = Celery(
     'resume_parser',
     broker=RABBITMQ_URL,
     backend='rpc://',
-    include=['tasks.resume_tasks']
+    include=['tasks.resume_tasks', 'tasks.rescore_tasks']
 )
 
 # Celery configuration
@@ -26,8 +26,17 @@ celery_app.conf.update(
     task_track_started=True,
     task_time_limit=30 * 60,  # 30 minutes
     worker_prefetch_multiplier=1,
+    # parse_resume_task starts a chain of stage tasks, one queue per stage,
+    # so each stage can get its own workers, e.g.:
+    #   celery -A celery_app worker -Q resume_extract_queue --concurrency 8
+    #   celery -A celery_app worker -Q resume_parse_queue,resume_skills_queue,resume_score_queue,resume_persist_queue
     task_routes={
         'tasks.parse_resume_task': {'queue': 'resume_parse_queue'},
+        'tasks.extract_resume_text': {'queue': 'resume_extract_queue'},
+        'tasks.extract_resume_skills': {'queue': 'resume_skills_queue'},
+        'tasks.calculate_ats_score': {'queue': 'resume_score_queue'},
+        'tasks.persist_resume_result': {'queue': 'resume_persist_queue'},
+        'tasks.rescore_resume_results': {'queue': 'resume_rescore_queue'},
     },
     task_default_queue='resume_parse_queue',
 )
@@ -37,7 +46,57 @@ from kombu import Queue
 
 celery_app.conf.task_queues = (
     Queue('resume_parse_queue', durable=True),
+    Queue('resume_extract_queue', durable=True),
+    Queue('resume_skills_queue', durable=True),
+    Queue('resume_score_queue', durable=True),
+    Queue('resume_persist_queue', durable=True),
+    Queue('resume_rescore_queue', durable=True),
 )
 
+
+
+# Preload models in the main process before the pool forks, so children
+# share them copy-on-write instead of loading on their first task
+from celery.signals import worker_init, worker_process_init, worker_process_shutdown, worker_shutdown
+
+
+@worker_init.connect
+def preload_main_process(**kwargs):
+    from utils.metrics import start_metrics_server
+    from utils.preload import preload_worker
+
+    start_metrics_server()
+    preload_worker()
+
+
+@worker_process_init.connect
+def preload_child_process(**kwargs):
+    from utils.preload import preload_worker
+
+    preload_worker()
+
+
+@worker_process_shutdown.connect
+def release_child_resources(pid=None, **kwargs):
+    from utils.db import flush_writes
+    from utils.metrics import mark_process_dead
+    from utils.text_extractor import shutdown_page_pool
+
+    flush_writes()
+    shutdown_page_pool()
+    if pid is not None:
+        mark_process_dead(pid)
+
+
+@worker_shutdown.connect
+def release_main_process_resources(**kwargs):
+    # Tasks run in the main process with the solo and threads pools
+    from utils.db import flush_writes
+    from utils.text_extractor import shutdown_page_pool
+
+    flush_writes()
+    shutdown_page_pool()
+
+
 if __name__ == '__main__':
     celery_app.start()
@@ -0,0 +1,316 @@
+"""
+Bulk re-scoring of stored resumes.
+
+Recomputes `skills`, `atsScore`, `missingSkills` and `scoringBreakdown` for
+documents already in `resumeresults` from their stored `rawText`, after
+SKILLS or the ATS rules change. No files are re-read or re-parsed.
+
+The collection is streamed in `_id` order with a batched cursor that only
+fetches `rawText`. Each chunk is scored with the batch APIs and written back
+with one unordered `bulk_write`. With `processes` > 1, skill extraction and
+scoring both run on one process pool that lives for the whole run: spaCy is
+loaded once, before the pool forks, and each chunk is split across the pool.
+Then the last `_id` is saved to the
+`rescorecheckpoints` collection. An interrupted run picks up after that
+`_id` when started again with the same job name; a job that finished starts
+over from the beginning. The job name defaults to `rescore-<RULES_VERSION>`
+(utils.result_cache), so a run after the next SKILLS or rules change is a
+new job rather than a continuation of the last one.
+
+The Celery task works in slices: it stops between chunks once it has run
+for RESCORE_TASK_SECONDS and re-queues itself with the same job name until
+the checkpoint is finished, so a full-collection backfill never runs into
+a task time limit. Its soft time limit backs that up for a chunk that
+hangs; the slice is re-queued from the last checkpoint either way.
+
+Run from server/python-worker/python-worker/:
+    python -m tasks.rescore_tasks
+    python -m tasks.rescore_tasks --batch-size 1000 --processes 4
+    python -m tasks.rescore_tasks --job-name rules-v2 --restart
+
+or queue it on a worker:
+    celery_app.send_task('tasks.rescore_resume_results', kwargs={'job_name': 'rules-v2'})
+"""
+
+import argparse
+import logging
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+
+from celery.exceptions import SoftTimeLimitExceeded
+from pymongo import UpdateOne
+
+from celery_app import celery_app
+from utils.ats_engine import calculate_ats_score_batch
+from utils.db import get_db
+from utils.result_cache import RULES_VERSION
+from utils.skills_extractor import extract_skills_batch, get_skill_matcher, load_spacy_model
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+CHECKPOINTS_COLLECTION = 'rescorecheckpoints'
+
+# Only finished documents have the text we rescore from
+RESCORE_FILTER = {'status': 'completed', 'rawText': {'$type': 'string'}}
+
+# Run time of one task slice; checked between chunks
+RESCORE_TASK_SECONDS = float(os.getenv('RESCORE_TASK_SECONDS', '600'))
+RESCORE_TASK_GRACE_SECONDS = float(os.getenv('RESCORE_TASK_GRACE_SECONDS', '300'))
+
+
+def _format_duration(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def default_job_name():
+    """Checkpoint key for the current SKILLS and ATS rules."""
+    return f"rescore-{RULES_VERSION}"
+
+
+def _load_checkpoint(checkpoints, job_name):
+    """
+    Last processed `_id` and document count of an unfinished run of
+    job_name, or (None, 0) when there is none or it finished.
+    """
+    checkpoint = checkpoints.find_one({'_id': job_name})
+    if not checkpoint:
+        return None, 0
+    if checkpoint.get('finished'):
+        logger.info(f"🔁 Job '{job_name}' already finished, rescoring from the beginning")
+        return None, 0
+    return checkpoint.get('lastId'), checkpoint.get('processed', 0)
+
+
+def _save_checkpoint(checkpoints, job_name, last_id, processed, finished=False):
+    checkpoints.update_one(
+        {'_id': job_name},
+        {'$set': {
+            'lastId': last_id,
+            'processed': processed,
+            'finished': finished,
+            'updatedAt': datetime.now(timezone.utc),
+        }},
+        upsert=True,
+    )
+
+
+def _score_texts(texts):
+    """Skills and ATS results for a list of texts (also run in pool processes)."""
+    skills_lists = extract_skills_batch(texts)
+    return skills_lists, calculate_ats_score_batch(texts, skills_lists)
+
+
+def _rescore_chunk(collection, documents, executor=None, processes=1):
+    """Rescore one chunk of {'_id', 'rawText'} documents and write it back."""
+    texts = [document['rawText'] for document in documents]
+    if executor is None:
+        skills_lists, ats_results = _score_texts(texts)
+    else:
+        size = math.ceil(len(texts) / processes)
+        parts = [texts[i:i + size] for i in range(0, len(texts), size)]
+        skills_lists, ats_results = [], []
+        for part_skills, part_results in executor.map(_score_texts, parts):
+            skills_lists.extend(part_skills)
+            ats_results.extend(part_results)
+
+    operations = [
+        UpdateOne(
+            {'_id': document['_id']},
+            {'$set': {
+                'skills': skills,
+                'atsScore': ats_result['atsScore'],
+                'missingSkills': ats_result['missingSkills'],
+                'scoringBreakdown': ats_result['scoringBreakdown'],
+            }},
+        )
+        for document, skills, ats_result in zip(documents, skills_lists, ats_results)
+    ]
+    result = collection.bulk_write(operations, ordered=False)
+    return result.modified_count
+
+
+def rescore_resume_results(job_name=None, batch_size=500, processes=None, limit=None, restart=False,
+                           max_seconds=None):
+    """
+    Rescore stored resumes in `resumeresults`, resuming from a checkpoint.
+
+    Args:
+        job_name (str, optional): Checkpoint key; reuse it to resume an
+            interrupted run. Defaults to default_job_name()
+        batch_size (int): Documents per cursor batch, scoring chunk and bulk_write
+        processes (int, optional): Process pool size for skill extraction
+            and scoring; ignored in daemonic processes (Celery prefork
+            children), which cannot start a pool
+        limit (int, optional): Stop after this many documents (this run)
+        restart (bool): Ignore the saved checkpoint and start from the beginning
+        max_seconds (float, optional): Stop after the first chunk that ends
+            past this many seconds; the run can be resumed from its checkpoint
+
+    Returns:
+        dict: Run summary; `finished` is False when the run stopped early
+    """
+    job_name = job_name or default_job_name()
+    db = get_db()
+    collection = db['resumeresults']
+    checkpoints = db[CHECKPOINTS_COLLECTION]
+
+    last_id, processed_before = (None, 0) if restart else _load_checkpoint(checkpoints, job_name)
+    query = dict(RESCORE_FILTER)
+    if last_id is not None:
+        query['_id'] = {'$gt': last_id}
+        logger.info(f"↩️  Resuming '{job_name}' after _id {last_id} ({processed_before} already done)")
+
+    total = collection.count_documents(query)
+    if limit is not None:
+        total = min(total, limit)
+    logger.info(f"🔄 Rescoring {total} resumes (job '{job_name}', batch size {batch_size})")
+
+    cursor = (
+        collection.find(query, projection={'rawText': 1})
+        .sort('_id', 1)
+        .batch_size(batch_size)
+    )
+    if limit is not None:
+        cursor = cursor.limit(limit)
+
+    executor = None
+    if processes and processes > 1:
+        if multiprocessing.current_process().daemon:
+            logger.warning("⚠️  Daemonic process cannot start a pool, rescoring in-process")
+            processes = 1
+        else:
+            # Load once here; the pool processes inherit it when they fork
+            load_spacy_model()
+            get_skill_matcher()
+            executor = ProcessPoolExecutor(max_workers=processes)
+
+    started = time.perf_counter()
+    deadline = started + max_seconds if max_seconds is not None else None
+    processed = modified = 0
+    chunk = []
+    out_of_time = False
+
+    def flush():
+        nonlocal processed, modified, last_id
+        modified += _rescore_chunk(collection, chunk, executor, processes)
+        processed += len(chunk)
+        last_id = chunk[-1]['_id']
+        _save_checkpoint(checkpoints, job_name, last_id, processed_before + processed)
+        chunk.clear()
+
+        elapsed = time.perf_counter() - started
+        rate = processed / elapsed if elapsed > 0 else 0.0
+        eta = (total - processed) / rate if rate else 0.0
+        logger.info(
+            f"📊 {processed}/{total} rescored ({rate:.0f} docs/s, "
+            f"elapsed {_format_duration(elapsed)}, ETA {_format_duration(eta)})"
+        )
+
+    try:
+        for document in cursor:
+            chunk.append(document)
+            if len(chunk) >= batch_size:
+                flush()
+                if deadline is not None and time.perf_counter() >= deadline:
+                    out_of_time = True
+                    break
+        if chunk:
+            flush()
+    finally:
+        cursor.close()
+        if executor is not None:
+            executor.shutdown()
+
+    # A run cut short by `limit` or `max_seconds` can still be resumed
+    finished = not out_of_time and (limit is None or processed < limit)
+    _save_checkpoint(checkpoints, job_name, last_id, processed_before + processed, finished=finished)
+    elapsed = time.perf_counter() - started
+    logger.info(
+        f"✅ Rescore '{job_name}' {'finished' if finished else 'stopped'}: {processed} resumes, "
+        f"{modified} changed, {_format_duration(elapsed)}"
+    )
+    return {
+        'jobName': job_name,
+        'processed': processed,
+        'modified': modified,
+        'finished': finished,
+        'lastId': str(last_id) if last_id is not None else None,
+        'elapsedSeconds': round(elapsed, 2),
+    }
+
+
+@celery_app.task(
+    name='tasks.rescore_resume_results', bind=True,
+    soft_time_limit=RESCORE_TASK_SECONDS + RESCORE_TASK_GRACE_SECONDS,
+    time_limit=RESCORE_TASK_SECONDS + 2 * RESCORE_TASK_GRACE_SECONDS,
+)
+def rescore_resume_results_task(self, job_name=None, batch_size=500, limit=None, restart=False):
+    """
+    Celery task wrapper for rescore_resume_results.
+
+    Rescores for RESCORE_TASK_SECONDS, then re-queues itself with the same
+    job name until the job is finished (or `limit` documents are done).
+
+    Single-process: prefork children are daemonic and cannot start a pool,
+    so skill extraction and scoring both run in this task's process. Use
+    the CLI with --processes for a parallel backfill.
+
+    Args:
+        job_name (str, optional): Checkpoint key (default: default_job_name())
+        batch_size (int): Documents per batch
+        limit (int, optional): Stop after this many documents, over all slices
+        restart (bool): Ignore the saved checkpoint (first slice only)
+
+    Returns:
+        dict: Summary of this slice
+    """
+    # Pin the name so every slice continues the same checkpoint
+    job_name = job_name or default_job_name()
+    try:
+        summary = rescore_resume_results(
+            job_name=job_name, batch_size=batch_size, limit=limit, restart=restart,
+            max_seconds=RESCORE_TASK_SECONDS,
+        )
+    except SoftTimeLimitExceeded:
+        # A chunk hung; the checkpoint still has every chunk written before it
+        logger.warning(f"⏱️  Rescore '{job_name}' hit its soft time limit, continuing from the checkpoint")
+        summary = {'jobName': job_name, 'processed': 0, 'finished': False}
+
+    remaining = None if limit is None else limit - summary['processed']
+    if not summary['finished'] and (remaining is None or remaining > 0):
+        self.apply_async(kwargs={'job_name': job_name, 'batch_size': batch_size, 'limit': remaining})
+        logger.info(f"↪️  Re-queued rescore '{job_name}'")
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument(
+        '--job-name', default=None,
+        help='Checkpoint key, reuse to resume (default: rescore-<rules version>)',
+    )
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--processes', type=int, default=None, help='Process pool size for skills and scoring')
+    parser.add_argument('--limit', type=int, default=None, help='Stop after this many documents')
+    parser.add_argument('--restart', action='store_true', help='Ignore the saved checkpoint')
+    args = parser.parse_args()
+
+    rescore_resume_results(
+        job_name=args.job_name,
+        batch_size=args.batch_size,
+        processes=args.processes,
+        limit=args.limit,
+        restart=args.restart,
+    )
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,49 @@
+"""
+Resume processing pipeline.
+
+`parse_resume_task` is the entry point on `resume_parse_queue`. It validates
+the message, marks the resume as processing and starts a chain of stage
+tasks, each routed to its own queue (see celery_app.py):
+
+    extract  (resume_extract_queue)  file -> rawText           CPU / I/O heavy
+    skills   (resume_skills_queue)   rawText -> skills         spaCy
+    score    (resume_score_queue)    rawText + skills -> ATS   lightweight
+    persist  (resume_persist_queue)  results -> MongoDB        lightweight
+
+Stages pass a JSON payload dict along the chain, each adding its output, so
+a failed stage is retried on its own without redoing the earlier ones.
+Input errors (missing file, unsupported format, no text) mark the resume as
+failed and stop the chain; anything else is retried up to STAGE_MAX_RETRIES
+times before the resume is marked as failed.
+
+The extract, skills and score stages run under time budgets (utils.budget).
+A stage that runs out of time passes on what it has so far, and the result
+is saved as completed with `partial: True` and the `partialStage`.
+
+Writes to `resumeresults` go through the process's write buffer
+(utils.db.WriteBuffer), so the 'processing' and 'completed' updates of many
+resumes share bulk writes; a task returns once its update is queued.
+- A failed result write re-queues the persist stage (up to
+  STAGE_MAX_RETRIES times, then the resume is marked failed). A failed
+  cache-hit write starts the pipeline instead. The cache entry is queued
+  only after the result is written.
+- The persist stage acknowledges its message late, so one that dies while
+  running is redelivered. An update still queued when a process is killed
+  outright (SIGKILL, OOM) is lost; it waits at most WRITE_BUFFER_FLUSH_MS,
+  and a graceful shutdown flushes it. The resume then stays 'processing'.
+- Failed states flush the buffer before the task returns: they are rare
+  and nothing would retry them.
+"""
+
+from celery import chain
+from celery.exceptions import Ignore, SoftTimeLimitExceeded
 from celery_app import celery_app
-from utils.db import get_db
-from utils.text_extractor import extract_text
+from utils.ats_engine import calculate_ats_score, calculate_partial_ats_score
+from utils.budget import hard_time_limit, record_overrun, soft_time_limit, stage_deadline
+from utils.db import buffered_update, flush_writes
+from utils.result_cache import file_sha256, find_cached_result, store_result
+from utils.skills_extractor import extract_skills, extract_skills_simple, extract_skills_within
+from utils.text_extractor import extract_document
 from bson import ObjectId
 import logging
 import os
@@ -9,270 +52,496 @@ import os
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+STAGE_MAX_RETRIES = 3
+STAGE_RETRY_DELAY = 10  # seconds
+
+# Input problems: retrying cannot help
+PERMANENT_ERRORS = (FileNotFoundError, ValueError, NotImplementedError)
+
+
+RESULTS_COLLECTION = 'resumeresults'
+
+# Status written at start unless the resume already finished (a flush from
+# another process may land after a later one from this process)
+_UNFINISHED = {'$nin': ['completed', 'failed']}
+
+
+def _write_now(resume_id, update):
+    """
+    Update a resume through the write buffer and flush it before returning.
+
+    Pending updates of this process go out in the same bulk write.
+
+    Raises:
+        Exception: The error of the flush if this update was not written
+    """
+    errors = []
+    buffered_update(RESULTS_COLLECTION, {'_id': ObjectId(resume_id)}, update, on_failure=errors.append)
+    flush_writes()
+    if errors:
+        raise errors[0]
+
+
+def _mark_failed(resume_id, error_message):
+    """Set status 'failed' with an error message; never raises."""
+    if not resume_id:
+        return
+    try:
+        _write_now(resume_id, {
+            '$set': {
+                'status': 'failed',
+                'error': error_message
+            }
+        })
+    except Exception as db_error:
+        logger.error(f"❌ Failed to update database with error status: {db_error}")
+
+
+def _error_message(error):
+    if isinstance(error, FileNotFoundError):
+        return f"File not found: {str(error)}"
+    if isinstance(error, NotImplementedError):
+        return f"Unsupported file format: {str(error)}"
+    return str(error)
+
+
+def _handle_stage_error(task, payload, stage, error):
+    """
+    Fail or retry a pipeline stage.
+
+    Permanent input errors mark the resume as failed and stop the chain.
+    Other errors retry this stage with the same payload; once retries are
+    exhausted the resume is marked as failed and the error is re-raised.
+    """
+    resume_id = payload.get('resumeId')
+
+    if isinstance(error, PERMANENT_ERRORS):
+        logger.error(f"❌ [{stage}] {_error_message(error)} (resume {resume_id})")
+        _mark_failed(resume_id, _error_message(error))
+        raise Ignore()
+
+    if task.request.retries < task.max_retries:
+        logger.warning(
+            f"⚠️  [{stage}] {error} - retry {task.request.retries + 1}/{task.max_retries} "
+            f"(resume {resume_id})"
+        )
+        raise task.retry(exc=error, countdown=STAGE_RETRY_DELAY)
+
+    logger.error(f"❌ [{stage}] Unexpected error: {error} (resume {resume_id})")
+    logger.exception("Full traceback:")
+    _mark_failed(resume_id, str(error))
+    raise error
+
+
+def _content_hash(file_path):
+    """SHA-256 of the resume file, or None when it cannot be read."""
+    try:
+        return file_sha256(file_path)
+    except OSError as error:
+        # The extract stage reports missing / unreadable files
+        logger.warning(f"⚠️  Could not hash resume file: {error}")
+        return None
+
+
+def _start_pipeline(payload):
+    """Queue the stage pipeline; marks the resume failed if that fails."""
+    try:
+        return build_resume_pipeline(payload).apply_async()
+    except Exception as error:
+        logger.error(f"❌ Failed to start resume pipeline: {error}")
+        logger.exception("Full traceback:")
+        _mark_failed(payload['resumeId'], str(error))
+        return None
+
+
+def _complete_from_cache(task, payload, cached):
+    """
+    Mark a duplicate resume completed with the cached result.
+
+    The write is buffered; if it fails, the pipeline runs instead (and its
+    persist stage writes the result).
+    """
+    resume_id = payload['resumeId']
+    logger.info(f"♻️  Duplicate resume content ({payload['contentHash'][:12]}), reusing stored result")
+
+    def run_pipeline(error):
+        logger.warning(f"⚠️  Could not save cached result ({error}), processing the resume instead")
+        _start_pipeline(payload)
+
+    buffered_update(
+        RESULTS_COLLECTION,
+        {'_id': ObjectId(resume_id)},
+        {'$set': {'status': 'completed', **cached}},
+        on_failure=run_pipeline,
+    )
+    return {
+        "status": "completed",
+        "resumeId": resume_id,
+        "taskId": task.request.id,
+        "deduplicated": True,
+        "skillsCount": len(cached.get('skills', [])),
+        "atsScore": cached.get('atsScore'),
+    }
+
+
+def _retry_persist(payload):
+    """on_failure handler of a result write: run the persist stage again."""
+    def retry(error):
+        resume_id = payload['resumeId']
+        attempt = payload.get('persistAttempt', 0) + 1
+        if attempt > STAGE_MAX_RETRIES:
+            logger.error(f"❌ [persist] Result write failed: {error} (resume {resume_id})")
+            _mark_failed(resume_id, str(error))
+            return
+
+        logger.warning(
+            f"⚠️  [persist] Result write failed: {error} - retry {attempt}/{STAGE_MAX_RETRIES} "
+            f"(resume {resume_id})"
+        )
+        try:
+            persist_resume_result_task.apply_async(
+                args=[{**payload, 'persistAttempt': attempt}], countdown=STAGE_RETRY_DELAY
+            )
+        except Exception as publish_error:
+            logger.error(f"❌ Failed to re-queue persist stage: {publish_error}")
+            _mark_failed(resume_id, str(error))
+
+    return retry
+
+
+def _partial(payload, stage):
+    """Record a budget overrun and flag the payload as partial (first stage wins)."""
+    record_overrun(stage)
+    return {**payload, 'partialStage': payload.get('partialStage') or stage}
+
+
+def build_resume_pipeline(payload):
+    """
+    Chain of stage signatures for one resume.
+
+    Args:
+        payload (dict): resumeId, userId, filePath
+
+    Returns:
+        celery.canvas.chain: extract -> skills -> score -> persist
+    """
+    return chain(
+        extract_resume_text_task.s(payload),
+        extract_resume_skills_task.s(),
+        calculate_ats_score_task.s(),
+        persist_resume_result_task.s(),
+    )
+
 
 @celery_app.task(name='tasks.parse_resume_task', bind=True)
 def parse_resume_task(self, message):
     """
-    Celery task to extract text from resume files (PDF/DOCX).
-    Extracts raw text and updates MongoDB with results.
-    
-    NO SKILLS EXTRACTION
-    NO NLP ANALYSIS
-    NO ATS SCORING
-    
+    Entry point for resume processing.
+
+    Validates the message, sets status 'processing' and starts the stage
+    pipeline (extract -> skills -> score -> persist). The stages update
+    MongoDB themselves; this task returns as soon as the chain is queued.
+
     Args:
         message (dict): Message containing:
             - resumeId: MongoDB ObjectId of ResumeResult document
             - userId: MongoDB ObjectId of User
             - filePath: Path to uploaded resume file
-    
+
     Returns:
-        dict: Status dictionary with extraction results
+        dict: Status dictionary with the pipeline id
     """
-    resume_id = None
-    db = None
-    resume_results_collection = None
-    
+    # Log received message
+    logger.info("="*60)
+    logger.info(f"📩 RECEIVED RESUME PARSING TASK")
+    logger.info(f"Task ID: {self.request.id}")
+    logger.info("="*60)
+
+    # Extract message fields
+    resume_id = message.get('resumeId')
+    user_id = message.get('userId')
+    file_path = message.get('filePath')
+
+    logger.info(f"📋 Resume ID: {resume_id}")
+    logger.info(f"👤 User ID: {user_id}")
+    logger.info(f"📁 File Path: {file_path}")
+
+    # Validate inputs
+    if not resume_id or not file_path:
+        error = "Missing required fields: resumeId or filePath"
+        logger.error(f"❌ Validation error: {error}")
+        _mark_failed(resume_id, error)
+        return {
+            "status": "failed",
+            "resumeId": resume_id,
+            "error": error
+        }
+
     try:
-        # Log received message
-        logger.info("="*60)
-        logger.info(f"📩 RECEIVED RESUME PARSING TASK")
-        logger.info(f"Task ID: {self.request.id}")
-        logger.info("="*60)
-        
-        # Extract message fields
-        resume_id = message.get('resumeId')
-        user_id = message.get('userId')
-        file_path = message.get('filePath')
-        
-        logger.info(f"📋 Resume ID: {resume_id}")
-        logger.info(f"👤 User ID: {user_id}")
-        logger.info(f"📁 File Path: {file_path}")
-        
-        # Validate inputs
-        if not resume_id or not file_path:
-            raise ValueError("Missing required fields: resumeId or filePath")
-        
-        # Connect to MongoDB
-        db = get_db()
-        resume_results_collection = db['resumeresults']
-        
         # Update status to 'processing'
         logger.info("🔄 Updating status to 'processing'...")
-        resume_results_collection.update_one(
-            {'_id': ObjectId(resume_id)},
+        buffered_update(
+            RESULTS_COLLECTION,
+            {'_id': ObjectId(resume_id), 'status': _UNFINISHED},
             {'$set': {'status': 'processing'}}
         )
-        
+
+        content_hash = _content_hash(file_path)
+        payload = {
+            'resumeId': resume_id,
+            'userId': user_id,
+            'filePath': file_path,
+            'parseTaskId': self.request.id,
+            'contentHash': content_hash,
+        }
+
+        # Same bytes already processed under the current versions: copy
+        cached = find_cached_result(content_hash) if content_hash else None
+        if cached:
+            return _complete_from_cache(self, payload, cached)
+
+        result = build_resume_pipeline(payload).apply_async()
+    except Exception as error:
+        logger.error(f"❌ Failed to start resume pipeline: {error}")
+        logger.exception("Full traceback:")
+        _mark_failed(resume_id, str(error))
+        return {
+            "status": "failed",
+            "resumeId": resume_id,
+            "error": str(error)
+        }
+
+    logger.info(f"🚀 Resume pipeline queued (final task {result.id})")
+    return {
+        "status": "queued",
+        "resumeId": resume_id,
+        "taskId": self.request.id,
+        "pipelineId": result.id
+    }
+
+
+@celery_app.task(
+    name='tasks.extract_resume_text', bind=True, max_retries=STAGE_MAX_RETRIES,
+    soft_time_limit=soft_time_limit('extract'), time_limit=hard_time_limit('extract'),
+)
+def extract_resume_text_task(self, payload):
+    """
+    Pipeline stage 1: extract raw text from the resume file (PDF/DOCX).
+
+    Args:
+        payload (dict): Pipeline payload with filePath
+
+    Returns:
+        dict: Payload with rawText added
+    """
+    try:
+        file_path = payload['filePath']
+
         # Check if file exists
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"Resume file not found: {file_path}")
-        
+
         # Detect file extension
         _, ext = os.path.splitext(file_path)
-        ext = ext.lower()
-        logger.info(f"🔍 File type detected: {ext}")
-        
+        logger.info(f"🔍 File type detected: {ext.lower()}")
+
         # Extract text from resume
         logger.info("📝 Starting text extraction...")
-        extracted_text = extract_text(file_path)
-        
+        extraction = extract_document(file_path, deadline=stage_deadline('extract'))
+        extracted_text = extraction.text
+
         if not extracted_text or len(extracted_text.strip()) == 0:
             raise ValueError("No text could be extracted from the resume")
-        
+
         logger.info(f"✅ Text extraction successful!")
         logger.info(f"📊 Extracted {len(extracted_text)} characters")
         logger.info(f"📊 Extracted {len(extracted_text.split())} words")
-        
-        # =====================================================
-        # SKILL EXTRACTION (STEP 5)
-        # =====================================================
-        logger.info("="*60)
-        logger.info("🔍 STARTING SKILL EXTRACTION")
-        logger.info("="*60)
-        
-        from utils.skills_extractor import extract_skills
-        
+        if extraction.pages_total is not None:
+            logger.info(f"📊 Processed {extraction.pages_processed}/{extraction.pages_total} pages")
+
+        result = {
+            **payload,
+            'rawText': extracted_text,
+            'extraction': {
+                'pagesTotal': extraction.pages_total,
+                'pagesProcessed': extraction.pages_processed,
+                'truncated': extraction.truncated,
+                'parallel': extraction.parallel,
+                'backend': extraction.backend,
+                'pageMs': (
+                    [round(seconds * 1000, 1) for seconds in extraction.page_seconds]
+                    if extraction.page_seconds is not None else None
+                ),
+            },
+        }
+        return _partial(result, 'extract') if extraction.budget_exceeded else result
+    except SoftTimeLimitExceeded:
+        # Stuck inside one page: there is no text to keep
+        record_overrun('extract')
+        _handle_stage_error(self, payload, 'extract', ValueError("Text extraction exceeded its time limit"))
+    except Exception as error:
+        _handle_stage_error(self, payload, 'extract', error)
+
+
+@celery_app.task(
+    name='tasks.extract_resume_skills', bind=True, max_retries=STAGE_MAX_RETRIES,
+    soft_time_limit=soft_time_limit('skills'), time_limit=hard_time_limit('skills'),
+)
+def extract_resume_skills_task(self, payload):
+    """
+    Pipeline stage 2: detect skills in the extracted text.
+
+    Args:
+        payload (dict): Pipeline payload with rawText
+
+    Returns:
+        dict: Payload with skills added
+    """
+    try:
         # Extract skills from text
-        detected_skills = extract_skills(extracted_text)
-        
-        logger.info(f"✅ Skill extraction completed")
-        logger.info(f"📊 Detected {len(detected_skills)} skills")
-        
+        try:
+            detected_skills, complete = extract_skills_within(payload['rawText'], stage_deadline('skills'))
+        except SoftTimeLimitExceeded:
+            # Stuck inside spaCy: keep the compiled matcher's skills
+            detected_skills, complete = extract_skills_simple(payload['rawText']), False
+
         if detected_skills:
             logger.info(f"🎯 Skills: {', '.join(detected_skills[:15])}{'...' if len(detected_skills) > 15 else ''}")
         else:
             logger.info("ℹ️  No skills detected in resume")
-        
-        # =====================================================
-        # ATS SCORING (STEP 6)
-        # =====================================================
-        logger.info("="*60)
-        logger.info("🎯 STARTING ATS SCORING")
-        logger.info("="*60)
-        
-        from utils.ats_engine import calculate_ats_score
-        
-        # Calculate ATS score
-        ats_result = calculate_ats_score(extracted_text, detected_skills)
-        
-        ats_score = ats_result['atsScore']
-        missing_skills = ats_result['missingSkills']
+
+        result = {**payload, 'skills': detected_skills}
+        return result if complete else _partial(result, 'skills')
+    except Exception as error:
+        _handle_stage_error(self, payload, 'skills', error)
+
+
+@celery_app.task(
+    name='tasks.calculate_ats_score', bind=True, max_retries=STAGE_MAX_RETRIES,
+    soft_time_limit=soft_time_limit('score'), time_limit=hard_time_limit('score'),
+)
+def calculate_ats_score_task(self, resume_data):
+    """
+    Pipeline stage 3: rule-based ATS scoring.
+
+    Also usable on its own: skills are detected first when resume_data has
+    no 'skills' key.
+
+    Args:
+        resume_data (dict): Pipeline payload with rawText (and skills)
+
+    Returns:
+        dict: Payload with atsScore, missingSkills and scoringBreakdown added
+    """
+    try:
+        detected_skills = resume_data.get('skills')
+        if detected_skills is None:
+            detected_skills = extract_skills(resume_data['rawText'])
+
+        # Calculate ATS score (skill score only if time runs out)
+        partial = False
+        try:
+            ats_result = calculate_ats_score(resume_data['rawText'], detected_skills)
+        except SoftTimeLimitExceeded:
+            ats_result = calculate_partial_ats_score(resume_data['rawText'], detected_skills)
+            partial = True
         scoring_breakdown = ats_result['scoringBreakdown']
-        
-        logger.info(f"✅ ATS scoring completed: {ats_score}/100")
+        missing_skills = ats_result['missingSkills']
+
+        logger.info(f"✅ ATS scoring completed: {ats_result['atsScore']}/100")
         logger.info(f"📊 Scoring breakdown:")
         logger.info(f"   - Skills: {scoring_breakdown['skillScore']}/40")
         logger.info(f"   - Experience: {scoring_breakdown['experienceScore']}/25")
         logger.info(f"   - Education: {scoring_breakdown['educationScore']}/15")
         logger.info(f"   - Formatting: {scoring_breakdown['formatScore']}/20")
-        
+
         if missing_skills:
             logger.info(f"⚠️  Missing common skills: {', '.join(missing_skills[:5])}{'...' if len(missing_skills) > 5 else ''}")
-        
+
+        result = {
+            **resume_data,
+            'skills': detected_skills,
+            'atsScore': ats_result['atsScore'],
+            'missingSkills': missing_skills,
+            'scoringBreakdown': scoring_breakdown,
+        }
+        return _partial(result, 'score') if partial else result
+    except Exception as error:
+        _handle_stage_error(self, resume_data, 'score', error)
+
+
+@celery_app.task(
+    name='tasks.persist_resume_result', bind=True, max_retries=STAGE_MAX_RETRIES,
+    acks_late=True, reject_on_worker_lost=True,
+)
+def persist_resume_result_task(self, payload):
+    """
+    Pipeline stage 4: queue the completed result on the write buffer.
+
+    If the write fails, the stage is queued again (see _retry_persist); once
+    it succeeds, the result is also stored in the content-hash cache.
+
+    Args:
+        payload (dict): Pipeline payload with every stage's output
+
+    Returns:
+        dict: Status dictionary with processing results
+    """
+    try:
+        resume_id = payload['resumeId']
+        raw_text = payload['rawText']
+        partial_stage = payload.get('partialStage')
+
+        # Let future uploads of the same file skip the pipeline, once the
+        # result is saved (partial results depend on load, so they are not
+        # reused)
+        store_in_cache = None
+        if payload.get('contentHash') and not partial_stage:
+            def store_in_cache():
+                store_result(payload['contentHash'], payload)
+
         # Update MongoDB with complete results
-        logger.info("💾 Updating database with complete results...")
-        update_result = resume_results_collection.update_one(
+        logger.info("💾 Queueing complete results for the database...")
+        buffered_update(
+            RESULTS_COLLECTION,
             {'_id': ObjectId(resume_id)},
             {
                 '$set': {
                     'status': 'completed',
-                    'rawText': extracted_text,
-                    'skills': detected_skills,
-                    'atsScore': ats_score,
-                    'missingSkills': missing_skills,
-                    'scoringBreakdown': scoring_breakdown
+                    'rawText': raw_text,
+                    'skills': payload['skills'],
+                    'atsScore': payload['atsScore'],
+                    'missingSkills': payload['missingSkills'],
+                    'scoringBreakdown': payload['scoringBreakdown'],
+                    'extraction': payload.get('extraction'),
+                    'partial': partial_stage is not None,
+                    'partialStage': partial_stage
                 }
-            }
+            },
+            on_failure=_retry_persist(payload),
+            on_success=store_in_cache,
         )
-        
-        if update_result.modified_count > 0:
-            logger.info("✅ Database updated successfully")
-        else:
-            logger.warning("⚠️  Database update returned 0 modified count")
-        
+
+        if partial_stage:
+            logger.warning(f"⚠️  Saving partial result ('{partial_stage}' stage ran out of time)")
+
         # Log success
         logger.info("="*60)
         logger.info("✅ RESUME PROCESSING COMPLETED")
         logger.info("="*60)
-        
-        return {
-            "status": "completed",
-            "resumeId": resume_id,
-            "taskId": self.request.id,
-            "textLength": len(extracted_text),
-            "wordCount": len(extracted_text.split()),
-            "skillsCount": len(detected_skills),
-            "skills": detected_skills,
-            "atsScore": ats_score,
-            "scoringBreakdown": scoring_breakdown
-        }
-
 
-        
-    except FileNotFoundError as error:
-        logger.error(f"❌ File not found: {error}")
-        
-        # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': f"File not found: {str(error)}"
-                    }
-                }
-            )
-        
-        return {
-            "status": "failed",
-            "resumeId": resume_id,
-            "error": str(error)
-        }
-        
-    except ValueError as error:
-        logger.error(f"❌ Validation error: {error}")
-        
-        # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': str(error)
-                    }
-                }
-            )
-        
         return {
-            "status": "failed",
-            "resumeId": resume_id,
-            "error": str(error)
-        }
-        
-    except NotImplementedError as error:
-        logger.error(f"❌ Unsupported file format: {error}")
-        
-        # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            resume_results_collection.update_one(
-                {'_id': ObjectId(resume_id)},
-                {
-                    '$set': {
-                        'status': 'failed',
-                        'error': f"Unsupported file format: {str(error)}"
-                    }
-                }
-            )
-        
-        return {
-            "status": "failed",
+            "status": "completed",
             "resumeId": resume_id,
-            "error": str(error)
+            "taskId": payload.get('parseTaskId'),
+            "textLength": len(raw_text),
+            "wordCount": len(raw_text.split()),
+            "skillsCount": len(payload['skills']),
+            "skills": payload['skills'],
+            "atsScore": payload['atsScore'],
+            "scoringBreakdown": payload['scoringBreakdown'],
+            "partial": partial_stage is not None,
+            "partialStage": partial_stage
         }
-        
     except Exception as error:
-        logger.error(f"❌ Unexpected error during text extraction: {error}")
-        logger.exception("Full traceback:")
-        
-        # Update status to failed
-        if resume_id and resume_results_collection is not None:
-            try:
-                resume_results_collection.update_one(
-                    {'_id': ObjectId(resume_id)},
-                    {
-                        '$set': {
-                            'status': 'failed',
-                            'error': str(error)
-                        }
-                    }
-                )
-            except Exception as db_error:
-                logger.error(f"❌ Failed to update database with error status: {db_error}")
-        
-        return {
-            "status": "failed",
-            "resumeId": resume_id,
-            "error": str(error)
-        }
-
-
-
-@celery_app.task(name='tasks.calculate_ats_score')
-def calculate_ats_score_task(resume_data):
-    """
-    Placeholder task for ATS score calculation.
-    Will be implemented in later steps.
-    
-    Args:
-        resume_data (dict): Parsed resume data
-        
-    Returns:
-        str: Status message
-    """
-    # TODO: Implement ATS scoring logic
-    logger.info("⚠️  ATS score calculation not yet implemented")
-    return "pending"
-
+        _handle_stage_error(self, payload, 'persist', error)
@@ -3,14 +3,28 @@ ATS (Applicant Tracking System) Scoring Engine
 Rule-based scoring system for resume evaluation.
 
 NO AI, NO ML - 100% deterministic rule-based scoring.
+
+Text features are extracted once per resume by utils.ats_features; the
+scorers below are arithmetic on that feature record.
 """
 
-import re
 import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from utils.ats_features import extract_ats_features
 from utils.skills_data import SKILLS
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change alters scores for the same text and skills
+# (invalidates the content-hash result cache, see utils.result_cache)
+ATS_RULES_VERSION = 1
+
+# Long-lived pool for calculate_ats_score_batch: (pid, processes, executor)
+_score_pool = None
+
 
 def calculate_skill_score(raw_text, detected_skills):
     """
@@ -53,7 +67,7 @@ def calculate_skill_score(raw_text, detected_skills):
     }
 
 
-def calculate_experience_score(raw_text):
+def calculate_experience_score(raw_text, features=None):
     """
     Calculate experience clarity score (25 points max).
     
@@ -64,45 +78,29 @@ def calculate_experience_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (AtsFeatures, optional): Precomputed features of raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
+    if features is None:
+        features = extract_ats_features(raw_text)
     score = 0
     
     # Check for experience section (5 points)
-    experience_keywords = ['experience', 'work history', 'employment', 'professional background']
-    if any(keyword in text_lower for keyword in experience_keywords):
+    if features.experience_section:
         score += 5
         logger.debug("✓ Experience section found (+5)")
     
-    # Check for years of experience patterns (8 points)
-    year_patterns = [
-        r'\d+\+?\s*years?',  # "2 years", "3+ years"
-        r'years?\s*of\s*experience',  # "years of experience"
-        r'\d{4}\s*-\s*\d{4}',  # "2020-2023"
-        r'\d{4}\s*-\s*present',  # "2020-present"
-    ]
-    
-    years_found = 0
-    for pattern in year_patterns:
-        if re.search(pattern, text_lower):
-            years_found += 1
-    
+    # Check for years of experience patterns (8 points):
+    # "2 years", "years of experience", "2020-2023", "2020-present"
+    years_found = features.year_patterns
     year_score = min(years_found * 2, 8)
     score += year_score
     logger.debug(f"✓ Year patterns found: {years_found} (+{year_score})")
     
     # Check for action verbs (12 points)
-    action_verbs = [
-        'developed', 'built', 'created', 'designed', 'implemented',
-        'managed', 'led', 'coordinated', 'achieved', 'improved',
-        'optimized', 'deployed', 'maintained', 'collaborated',
-        'engineered', 'architected', 'delivered', 'launched'
-    ]
-    
-    verbs_found = sum(1 for verb in action_verbs if verb in text_lower)
+    verbs_found = features.action_verbs
     verb_score = min(verbs_found * 2, 12)
     score += verb_score
     logger.debug(f"✓ Action verbs found: {verbs_found} (+{verb_score})")
@@ -111,7 +109,7 @@ def calculate_experience_score(raw_text):
     return {'score': score}
 
 
-def calculate_education_score(raw_text):
+def calculate_education_score(raw_text, features=None):
     """
     Calculate education presence score (15 points max).
     
@@ -121,30 +119,23 @@ def calculate_education_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (AtsFeatures, optional): Precomputed features of raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
+    if features is None:
+        features = extract_ats_features(raw_text)
     score = 0
     
     # Check for degree keywords (10 points)
-    degree_keywords = [
-        'bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'b.e.',
-        'm.tech', 'm.s.', 'mba', 'degree', 'university', 'college',
-        'graduate', 'undergraduate', 'diploma'
-    ]
-    
-    degrees_found = sum(1 for keyword in degree_keywords if keyword in text_lower)
+    degrees_found = features.degree_keywords
     degree_score = min(degrees_found * 3, 10)
     score += degree_score
     logger.debug(f"✓ Degree keywords found: {degrees_found} (+{degree_score})")
     
     # Check for graduation year (5 points)
-    year_pattern = r'\b(19|20)\d{2}\b'
-    years_found = len(re.findall(year_pattern, raw_text))
-    
-    if years_found > 0:
+    if features.graduation_year:
         score += 5
         logger.debug(f"✓ Graduation years found (+5)")
     
@@ -152,7 +143,7 @@ def calculate_education_score(raw_text):
     return {'score': score}
 
 
-def calculate_format_score(raw_text):
+def calculate_format_score(raw_text, features=None):
     """
     Calculate formatting and structure score (20 points max).
     
@@ -164,24 +155,23 @@ def calculate_format_score(raw_text):
     
     Args:
         raw_text (str): Resume text
+        features (AtsFeatures, optional): Precomputed features of raw_text
         
     Returns:
         dict: Score and details
     """
-    text_lower = raw_text.lower()
-    lines = raw_text.split('\n')
+    if features is None:
+        features = extract_ats_features(raw_text)
     score = 0
     
     # Check for proper headings (8 points)
-    headings = ['skills', 'experience', 'education', 'projects', 'summary', 'objective']
-    headings_found = sum(1 for heading in headings if heading in text_lower)
+    headings_found = features.headings
     heading_score = min(headings_found * 2, 8)
     score += heading_score
     logger.debug(f"✓ Headings found: {headings_found} (+{heading_score})")
     
     # Check for bullet points (6 points)
-    bullet_patterns = ['-', '•', '∙', '▪', '*']
-    bullet_count = sum(1 for line in lines if any(line.strip().startswith(bp) for bp in bullet_patterns))
+    bullet_count = features.bullet_lines
     
     if bullet_count > 0:
         bullet_score = min(bullet_count // 2, 6)
@@ -190,25 +180,13 @@ def calculate_format_score(raw_text):
     
     # Check paragraph length (3 points)
     # Good resumes have concise paragraphs
-    paragraphs = [p for p in raw_text.split('\n\n') if p.strip()]
-    reasonable_paragraphs = sum(1 for p in paragraphs if len(p) < 300)
-    
-    if paragraphs and (reasonable_paragraphs / len(paragraphs)) > 0.7:
+    if features.paragraphs and (features.short_paragraphs / features.paragraphs) > 0.7:
         score += 3
         logger.debug("✓ Good paragraph length (+3)")
     
     # Check for excessive empty lines (3 points)
     # Penalize if more than 4 consecutive empty lines
-    consecutive_empty = 0
-    max_consecutive = 0
-    for line in lines:
-        if not line.strip():
-            consecutive_empty += 1
-            max_consecutive = max(max_consecutive, consecutive_empty)
-        else:
-            consecutive_empty = 0
-    
-    if max_consecutive <= 4:
+    if features.max_empty_run <= 4:
         score += 3
         logger.debug("✓ No excessive empty lines (+3)")
     
@@ -216,6 +194,86 @@ def calculate_format_score(raw_text):
     return {'score': score}
 
 
+def _empty_result():
+    """Result for a resume with no text."""
+    return {
+        "atsScore": 0,
+        "missingSkills": [],
+        "scoringBreakdown": {
+            "skillScore": 0,
+            "experienceScore": 0,
+            "educationScore": 0,
+            "formatScore": 0
+        }
+    }
+
+
+def _score_document(raw_text, detected_skills):
+    """
+    Score one non-empty resume without per-document INFO logging.
+    
+    Shared by calculate_ats_score and calculate_ats_score_batch so both
+    return exactly the same result dict.
+    """
+    # One pass over the text for every feature, then the individual scores
+    features = extract_ats_features(raw_text)
+    skill_result = calculate_skill_score(raw_text, detected_skills)
+    experience_result = calculate_experience_score(raw_text, features)
+    education_result = calculate_education_score(raw_text, features)
+    format_result = calculate_format_score(raw_text, features)
+    
+    # Extract scores
+    skill_score = skill_result['score']
+    experience_score = experience_result['score']
+    education_score = education_result['score']
+    format_score = format_result['score']
+    
+    # Calculate total ATS score
+    total_score = skill_score + experience_score + education_score + format_score
+    ats_score = int(round(total_score))
+    
+    # Ensure score is within bounds
+    ats_score = max(0, min(100, ats_score))
+    
+    return {
+        "atsScore": ats_score,
+        "missingSkills": skill_result['missing_skills'],
+        "scoringBreakdown": {
+            "skillScore": round(skill_score, 2),
+            "experienceScore": experience_score,
+            "educationScore": education_score,
+            "formatScore": format_score
+        }
+    }
+
+
+def calculate_partial_ats_score(raw_text, detected_skills):
+    """
+    Skill-only ATS score, used when full scoring runs out of time.
+    
+    Experience, education and format scores need a pass over the text and
+    are reported as 0.
+    
+    Args:
+        raw_text (str): Resume text
+        detected_skills (list): List of detected skills
+        
+    Returns:
+        dict: Same shape as calculate_ats_score
+    """
+    skill_result = calculate_skill_score(raw_text, detected_skills)
+    return {
+        "atsScore": max(0, min(100, int(round(skill_result['score'])))),
+        "missingSkills": skill_result['missing_skills'],
+        "scoringBreakdown": {
+            "skillScore": round(skill_result['score'], 2),
+            "experienceScore": 0,
+            "educationScore": 0,
+            "formatScore": 0
+        }
+    }
+
+
 def calculate_ats_score(raw_text, detected_skills):
     """
     Calculate complete ATS score based on rule-based criteria.
@@ -248,49 +306,116 @@ def calculate_ats_score(raw_text, detected_skills):
     
     if not raw_text or len(raw_text.strip()) == 0:
         logger.warning("⚠️  Empty text provided for ATS scoring")
-        return {
-            "atsScore": 0,
-            "missingSkills": [],
-            "scoringBreakdown": {
-                "skillScore": 0,
-                "experienceScore": 0,
-                "educationScore": 0,
-                "formatScore": 0
-            }
-        }
+        return _empty_result()
     
-    # Calculate individual scores
-    skill_result = calculate_skill_score(raw_text, detected_skills)
-    experience_result = calculate_experience_score(raw_text)
-    education_result = calculate_education_score(raw_text)
-    format_result = calculate_format_score(raw_text)
+    result = _score_document(raw_text, detected_skills)
+    breakdown = result['scoringBreakdown']
     
-    # Extract scores
-    skill_score = skill_result['score']
-    experience_score = experience_result['score']
-    education_score = education_result['score']
-    format_score = format_result['score']
+    logger.info(f"✅ ATS score calculation completed: {result['atsScore']}/100")
+    logger.info(f"   - Skill Score: {breakdown['skillScore']:.2f}/40")
+    logger.info(f"   - Experience Score: {breakdown['experienceScore']}/25")
+    logger.info(f"   - Education Score: {breakdown['educationScore']}/15")
+    logger.info(f"   - Format Score: {breakdown['formatScore']}/20")
     
-    # Calculate total ATS score
-    total_score = skill_score + experience_score + education_score + format_score
-    ats_score = int(round(total_score))
+    return result
+
+
+def _score_chunk(pairs):
+    """Score a list of (raw_text, detected_skills) pairs; runs in pool workers."""
+    return [
+        _score_document(raw_text, detected_skills)
+        if raw_text and raw_text.strip() else _empty_result()
+        for raw_text, detected_skills in pairs
+    ]
+
+
+def get_score_pool(processes):
+    """
+    Process pool of `processes` workers, reused by every batch call.
+
+    The pool processes stay alive between calls, so each builds the keyword
+    tables once for the whole backfill. Asking for a different size replaces
+    the pool.
+
+    Args:
+        processes (int): Pool size
+
+    Returns:
+        ProcessPoolExecutor: Shared pool (stop it with shutdown_score_pool)
+    """
+    global _score_pool
+
+    if _score_pool is not None and _score_pool[:2] != (os.getpid(), processes):
+        shutdown_score_pool()
+    if _score_pool is None:
+        _score_pool = (os.getpid(), processes, ProcessPoolExecutor(max_workers=processes))
+    return _score_pool[2]
+
+
+def shutdown_score_pool():
+    """Stop the shared scoring pool, if one was started by this process."""
+    global _score_pool
+
+    if _score_pool is not None:
+        pid, _, executor = _score_pool
+        _score_pool = None
+        if pid == os.getpid():
+            executor.shutdown()
+
+
+def calculate_ats_score_batch(texts, skills_lists, processes=None, chunk_size=256, executor=None):
+    """
+    Calculate ATS scores for many resumes at once.
     
-    # Ensure score is within bounds
-    ats_score = max(0, min(100, ats_score))
+    Returns the same result dicts as calculate_ats_score, in input order,
+    but logs one summary line for the whole batch instead of a dozen lines
+    per resume. Use this for bulk re-scoring after a rubric change.
     
-    logger.info(f"✅ ATS score calculation completed: {ats_score}/100")
-    logger.info(f"   - Skill Score: {skill_score:.2f}/40")
-    logger.info(f"   - Experience Score: {experience_score}/25")
-    logger.info(f"   - Education Score: {education_score}/15")
-    logger.info(f"   - Format Score: {format_score}/20")
+    With an `executor`, or `processes` > 1, the batch is split into chunks
+    of `chunk_size` documents and scored in parallel. Without an executor
+    the shared pool from get_score_pool is used, and it stays up between
+    calls. Pool processes import this module once, so the compiled keyword
+    tables are built once per process, not once per call or document.
+    Daemonic processes (e.g. Celery prefork children) cannot start a pool
+    and always score in-process.
     
-    return {
-        "atsScore": ats_score,
-        "missingSkills": skill_result['missing_skills'],
-        "scoringBreakdown": {
-            "skillScore": round(skill_score, 2),
-            "experienceScore": experience_score,
-            "educationScore": education_score,
-            "formatScore": format_score
-        }
-    }
+    Args:
+        texts (list): Resume texts
+        skills_lists (list): Detected skills for each text
+        processes (int, optional): Pool size; None/0/1 scores in-process
+        chunk_size (int): Documents per pool task
+        executor (concurrent.futures.Executor, optional): Caller-owned pool
+            to score on; not shut down here
+        
+    Returns:
+        list: One ATS result dict per input text
+    """
+    texts = list(texts)
+    skills_lists = list(skills_lists)
+    if len(texts) != len(skills_lists):
+        raise ValueError(
+            f"texts and skills_lists differ in length ({len(texts)} != {len(skills_lists)})"
+        )
+    
+    started = time.perf_counter()
+    pairs = list(zip(texts, skills_lists))
+    
+    if executor is None and processes and processes > 1 and not multiprocessing.current_process().daemon:
+        executor = get_score_pool(processes)
+    if executor is not None and len(pairs) > chunk_size:
+        chunks = [pairs[i:i + chunk_size] for i in range(0, len(pairs), chunk_size)]
+        results = [result for chunk in executor.map(_score_chunk, chunks) for result in chunk]
+        workers = f"{processes} process(es)" if processes else "caller's pool"
+    else:
+        workers = "1 process(es)"
+        results = _score_chunk(pairs)
+    
+    elapsed = time.perf_counter() - started
+    empty = sum(1 for raw_text, _ in pairs if not raw_text or not raw_text.strip())
+    mean_score = sum(r['atsScore'] for r in results) / len(results) if results else 0
+    logger.info(
+        f"🎯 ATS batch scored {len(results)} resumes in {elapsed:.2f}s "
+        f"({len(results) / elapsed if elapsed > 0 else 0:.0f}/s, {workers}) - "
+        f"mean score {mean_score:.1f}, {empty} empty"
+    )
+    return results
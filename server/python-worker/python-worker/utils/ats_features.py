@@ -0,0 +1,193 @@
+"""
+Fused feature extraction for the ATS scoring engine.
+
+The four ATS scorers used to lowercase the full text again and rescan it
+independently (~45 `in` checks, five regex scans, two splits and several
+per-line loops). `extract_ats_features` gathers everything they need in one
+pass per concern and returns a flat record, so the scorers in ats_engine.py
+only do arithmetic.
+
+Every feature reproduces the original check exactly (same substring and
+regex semantics), so ATS scores are unchanged:
+
+- The text is lowercased once, and each distinct keyword (experience words,
+  action verbs, degrees, headings; "experience" is shared) is looked up once
+  with a C-level substring search. A single regex alternation over the
+  keywords was measured and is several times slower than these `in` checks.
+- Regexes that start with `\\d` are slow to scan for. They are evaluated
+  around literal anchors instead ("year", "-", "19"/"20"), checking the same
+  characters the regex would.
+- Lines are stripped once and classified (blank / bullet) in a single loop.
+"""
+
+import re
+from collections import namedtuple
+
+# ============================================================
+# KEYWORD LISTS (shared with the scorers in ats_engine.py)
+# ============================================================
+EXPERIENCE_KEYWORDS = ('experience', 'work history', 'employment', 'professional background')
+
+ACTION_VERBS = (
+    'developed', 'built', 'created', 'designed', 'implemented',
+    'managed', 'led', 'coordinated', 'achieved', 'improved',
+    'optimized', 'deployed', 'maintained', 'collaborated',
+    'engineered', 'architected', 'delivered', 'launched'
+)
+
+DEGREE_KEYWORDS = (
+    'bachelor', 'master', 'phd', 'doctorate', 'b.tech', 'b.e.',
+    'm.tech', 'm.s.', 'mba', 'degree', 'university', 'college',
+    'graduate', 'undergraduate', 'diploma'
+)
+
+HEADINGS = ('skills', 'experience', 'education', 'projects', 'summary', 'objective')
+
+BULLET_CHARS = frozenset('-•∙▪*')
+
+# ============================================================
+# LOOKUP TABLES AND PATTERNS
+# ============================================================
+_KEYWORDS = tuple(dict.fromkeys(EXPERIENCE_KEYWORDS + ACTION_VERBS + DEGREE_KEYWORDS + HEADINGS))
+
+_YEARS_OF_EXPERIENCE_RE = re.compile(r'years?\s*of\s*experience')
+
+AtsFeatures = namedtuple('AtsFeatures', [
+    'experience_section',   # any EXPERIENCE_KEYWORDS present
+    'year_patterns',        # how many of the 4 year patterns match (0-4)
+    'action_verbs',         # distinct ACTION_VERBS present
+    'degree_keywords',      # distinct DEGREE_KEYWORDS present
+    'graduation_year',      # a 19xx / 20xx year is present
+    'headings',             # distinct HEADINGS present
+    'bullet_lines',         # lines starting with a bullet character
+    'paragraphs',           # non-blank paragraphs ("\n\n"-separated)
+    'short_paragraphs',     # of those, shorter than 300 characters
+    'max_empty_run',        # longest run of consecutive blank lines
+])
+
+
+def _find_keywords(text_lower):
+    """Set of keywords occurring anywhere in `text_lower` (substring match)."""
+    return {k for k in _KEYWORDS if k in text_lower}
+
+
+def _skip_space_back(text, i):
+    while i >= 0 and text[i].isspace():
+        i -= 1
+    return i
+
+
+def _skip_space(text, i):
+    n = len(text)
+    while i < n and text[i].isspace():
+        i += 1
+    return i
+
+
+def _has_number_of_years(text_lower):
+    """Equivalent of re.search(r'\\d+\\+?\\s*years?', text_lower)."""
+    i = text_lower.find('year')
+    while i != -1:
+        j = _skip_space_back(text_lower, i - 1)
+        if j >= 0 and text_lower[j] == '+':
+            j -= 1
+        if j >= 0 and text_lower[j].isdecimal():
+            return True
+        i = text_lower.find('year', i + 1)
+    return False
+
+
+def _year_ranges(text_lower):
+    """
+    Equivalents of re.search(r'\\d{4}\\s*-\\s*\\d{4}', ...) and
+    re.search(r'\\d{4}\\s*-\\s*present', ...), anchored on each "-".
+    """
+    has_range = has_present = False
+    i = text_lower.find('-')
+    while i != -1 and not (has_range and has_present):
+        j = _skip_space_back(text_lower, i - 1)
+        if j >= 3 and text_lower[j - 3:j + 1].isdecimal():
+            k = _skip_space(text_lower, i + 1)
+            after = text_lower[k:k + 4]
+            if len(after) == 4 and after.isdecimal():
+                has_range = True
+            elif text_lower.startswith('present', k):
+                has_present = True
+        i = text_lower.find('-', i + 1)
+    return has_range, has_present
+
+
+def _is_word_char(ch):
+    return ch.isalnum() or ch == '_'
+
+
+def _has_graduation_year(raw_text):
+    """Equivalent of bool(re.findall(r'\\b(19|20)\\d{2}\\b', raw_text))."""
+    n = len(raw_text)
+    for century in ('19', '20'):
+        i = raw_text.find(century)
+        while i != -1:
+            end = i + 4
+            if (end <= n
+                    and raw_text[i + 2].isdecimal() and raw_text[i + 3].isdecimal()
+                    and (i == 0 or not _is_word_char(raw_text[i - 1]))
+                    and (end == n or not _is_word_char(raw_text[end]))):
+                return True
+            i = raw_text.find(century, i + 1)
+    return False
+
+
+def extract_ats_features(raw_text):
+    """
+    Compute every input the ATS scorers need from one resume text.
+
+    Args:
+        raw_text (str): Resume text
+
+    Returns:
+        AtsFeatures: Feature record
+    """
+    text_lower = raw_text.lower()
+
+    keywords = _find_keywords(text_lower)
+
+    has_range, has_present = _year_ranges(text_lower)
+    year_patterns = (
+        _has_number_of_years(text_lower)
+        + (_YEARS_OF_EXPERIENCE_RE.search(text_lower) is not None)
+        + has_range
+        + has_present
+    )
+
+    bullet_lines = 0
+    empty_run = max_empty_run = 0
+    for line in raw_text.split('\n'):
+        stripped = line.strip()
+        if not stripped:
+            empty_run += 1
+            if empty_run > max_empty_run:
+                max_empty_run = empty_run
+        else:
+            empty_run = 0
+            if stripped[0] in BULLET_CHARS:
+                bullet_lines += 1
+
+    paragraphs = short_paragraphs = 0
+    for paragraph in raw_text.split('\n\n'):
+        if paragraph.strip():
+            paragraphs += 1
+            if len(paragraph) < 300:
+                short_paragraphs += 1
+
+    return AtsFeatures(
+        experience_section=any(k in keywords for k in EXPERIENCE_KEYWORDS),
+        year_patterns=year_patterns,
+        action_verbs=sum(1 for k in ACTION_VERBS if k in keywords),
+        degree_keywords=sum(1 for k in DEGREE_KEYWORDS if k in keywords),
+        graduation_year=_has_graduation_year(raw_text),
+        headings=sum(1 for k in HEADINGS if k in keywords),
+        bullet_lines=bullet_lines,
+        paragraphs=paragraphs,
+        short_paragraphs=short_paragraphs,
+        max_empty_run=max_empty_run,
+    )
@@ -0,0 +1,56 @@
+"""
+Per-stage time budgets for the resume pipeline.
+
+Each stage (extract, skills, score) gets a soft budget. Stages check their
+deadline between units of work (PDF pages, DOCX paragraphs, text blocks,
+scorers) and stop when it has passed, keeping what they produced so far.
+The result is then saved as `partial` with the stage that ran out of time,
+instead of holding a worker for the whole task_time_limit and saving
+nothing.
+
+Celery soft time limits back the budgets up. Stages that check their
+deadline cooperatively get the budget plus STAGE_BUDGET_GRACE_SECONDS, as a
+backstop for a single unit (one page, say) that never returns; ATS scoring
+has no units to check between and gets the budget itself.
+"""
+
+import logging
+import os
+import time
+
+from utils.metrics import BUDGET_OVERRUNS
+
+logger = logging.getLogger(__name__)
+
+STAGE_BUDGETS = {
+    'extract': float(os.getenv('EXTRACT_BUDGET_SECONDS', '20')),
+    'skills': float(os.getenv('SKILLS_BUDGET_SECONDS', '10')),
+    'score': float(os.getenv('SCORE_BUDGET_SECONDS', '5')),
+}
+STAGE_BUDGET_GRACE_SECONDS = float(os.getenv('STAGE_BUDGET_GRACE_SECONDS', '30'))
+
+# Stages that stop themselves at their deadline
+COOPERATIVE_STAGES = ('extract', 'skills')
+
+
+def stage_deadline(stage):
+    """time.monotonic() value at which `stage` is over budget."""
+    return time.monotonic() + STAGE_BUDGETS[stage]
+
+
+def soft_time_limit(stage):
+    """Celery soft time limit (seconds) backing up the stage budget."""
+    if stage in COOPERATIVE_STAGES:
+        return STAGE_BUDGETS[stage] + STAGE_BUDGET_GRACE_SECONDS
+    return STAGE_BUDGETS[stage]
+
+
+def hard_time_limit(stage):
+    """Celery hard time limit (seconds): the soft limit plus the grace period."""
+    return soft_time_limit(stage) + STAGE_BUDGET_GRACE_SECONDS
+
+
+def record_overrun(stage):
+    """Count a stage stopped by its budget."""
+    BUDGET_OVERRUNS.labels(stage=stage).inc()
+    logger.warning(f"⏱️  Stage '{stage}' exceeded its {STAGE_BUDGETS[stage]:.0f}s budget, keeping partial results")
@@ -1,14 +1,49 @@
+import logging
 import os
-from pymongo import MongoClient
+import threading
+import time
+from prometheus_client import Counter, Gauge, Histogram
+from pymongo import MongoClient, UpdateOne
+from pymongo.errors import BulkWriteError
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # MongoDB client instance
 _client = None
 _db = None
 
+# Write-behind buffer: queued updates are flushed with one unordered
+# bulk_write per collection once WRITE_BUFFER_MAX_OPS are pending or
+# WRITE_BUFFER_FLUSH_MS after the first one was queued.
+# WRITE_BUFFER_MAX_OPS=1 writes every update through immediately.
+WRITE_BUFFER_MAX_OPS = int(os.getenv('WRITE_BUFFER_MAX_OPS', '100'))
+WRITE_BUFFER_FLUSH_MS = int(os.getenv('WRITE_BUFFER_FLUSH_MS', '250'))
+
+# ============================================================
+# METRICS
+# ============================================================
+WRITE_BUFFER_DEPTH = Gauge(
+    "worker_write_buffer_depth",
+    "Updates queued in the write-behind buffer, not yet flushed to MongoDB",
+    multiprocess_mode="livesum",
+)
+WRITE_FLUSH_SECONDS = Histogram(
+    "worker_write_flush_seconds",
+    "Duration of one write-behind buffer flush (all collections)",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+WRITE_BUFFER_OPS = Counter(
+    "worker_write_buffer_ops_total",
+    "Buffered updates flushed to MongoDB, by outcome (written, failed)",
+    ["outcome"],
+)
+
+_write_buffer = None
+
 
 def get_db():
     """
@@ -59,3 +94,189 @@ def close_db():
         _client = None
         _db = None
         print('MongoDB connection closed')
+
+
+class _PendingUpdate:
+    """One queued update_one, with the updates merged into it."""
+
+    __slots__ = ('collection_name', 'filter', 'update', 'upsert', 'on_failure', 'on_success')
+
+    def __init__(self, collection_name, filter):
+        self.collection_name = collection_name
+        self.filter = filter
+        self.update = {}
+        self.upsert = False
+        self.on_failure = []
+        self.on_success = []
+
+
+class WriteBuffer:
+    """
+    Per-process write-behind buffer of MongoDB updates.
+
+    Updates to the same document (collection + filter) are merged while
+    queued, later values winning field by field, so an unordered bulk write
+    can never apply an older status after a newer one.
+
+    After each flush the `on_success` callbacks of the written updates are
+    called, and the `on_failure` callbacks of the failed ones with the
+    error; failed updates are dropped, so a caller that needs its write
+    re-queues it from on_failure. Callbacks run in the flushing thread,
+    outside the flush lock, and may queue further updates.
+
+    Queued updates are lost if the process is killed before the next flush
+    (graceful shutdown flushes, see celery_app.py). A task whose write must
+    survive that can call flush_writes() before returning.
+    """
+
+    def __init__(self, max_ops=WRITE_BUFFER_MAX_OPS, flush_ms=WRITE_BUFFER_FLUSH_MS):
+        self.max_ops = max(1, max_ops)
+        self.flush_ms = flush_ms
+        self._pending = {}  # (collection, filter key) -> _PendingUpdate
+        self._lock = threading.Lock()
+        # Flushes run one at a time, so batches reach MongoDB in queue order
+        self._flush_lock = threading.Lock()
+        self._timer = None
+
+    @property
+    def depth(self):
+        return len(self._pending)
+
+    def update(self, collection_name, filter, update, on_failure=None, on_success=None, upsert=False):
+        """
+        Queue an update_one.
+
+        Args:
+            collection_name (str): Collection in get_db()
+            filter (dict): Filter matching one document (e.g. by _id)
+            update (dict): Update document ($set, $setOnInsert, ...)
+            on_failure (callable, optional): Called with the exception if
+                the flush that carries this update fails
+            on_success (callable, optional): Called with no arguments once
+                the update is written
+            upsert (bool): Insert the document if the filter matches none
+        """
+        key = (collection_name, repr(sorted(filter.items())))
+        with self._lock:
+            pending = self._pending.get(key)
+            if pending is None:
+                pending = self._pending[key] = _PendingUpdate(collection_name, filter)
+            for op, fields in update.items():
+                pending.update.setdefault(op, {}).update(fields)
+            pending.upsert = pending.upsert or upsert
+            if on_failure is not None:
+                pending.on_failure.append(on_failure)
+            if on_success is not None:
+                pending.on_success.append(on_success)
+            WRITE_BUFFER_DEPTH.set(len(self._pending))
+            flush_now = len(self._pending) >= self.max_ops
+            if not flush_now and self._timer is None:
+                self._timer = threading.Timer(self.flush_ms / 1000, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+        if flush_now:
+            self.flush()
+
+    def flush(self):
+        """
+        Write all queued updates now, then run their callbacks.
+
+        Returns:
+            int: Number of updates that could not be written
+        """
+        with self._flush_lock:
+            written, failed = self._flush()
+
+        for pending, error in failed:
+            for callback in pending.on_failure:
+                self._run_callback(callback, error)
+        for pending in written:
+            for callback in pending.on_success:
+                self._run_callback(callback)
+        return len(failed)
+
+    @staticmethod
+    def _run_callback(callback, *args):
+        try:
+            callback(*args)
+        except Exception as callback_error:
+            logger.error(f"❌ Write buffer callback raised: {callback_error}")
+
+    def _flush(self):
+        """Bulk-write the queue; returns (written updates, [(failed update, error)])."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            entries = list(self._pending.values())
+            self._pending = {}
+            WRITE_BUFFER_DEPTH.set(0)
+
+        if not entries:
+            return [], []
+
+        started = time.perf_counter()
+        by_collection = {}
+        for pending in entries:
+            by_collection.setdefault(pending.collection_name, []).append(pending)
+
+        written, failed = [], []
+        for collection_name, batch in by_collection.items():
+            operations = [UpdateOne(pending.filter, pending.update, upsert=pending.upsert) for pending in batch]
+            try:
+                get_db()[collection_name].bulk_write(operations, ordered=False)
+                written.extend(batch)
+            except BulkWriteError as error:
+                failed_indexes = {write_error['index'] for write_error in error.details.get('writeErrors', [])}
+                for index, pending in enumerate(batch):
+                    if index in failed_indexes:
+                        failed.append((pending, error))
+                    else:
+                        written.append(pending)
+            except Exception as error:
+                failed.extend((pending, error) for pending in batch)
+
+        elapsed = time.perf_counter() - started
+        WRITE_FLUSH_SECONDS.observe(elapsed)
+        WRITE_BUFFER_OPS.labels(outcome='written').inc(len(written))
+
+        if failed:
+            WRITE_BUFFER_OPS.labels(outcome='failed').inc(len(failed))
+            logger.error(f"❌ Write buffer flush: {len(failed)}/{len(entries)} updates failed ({failed[0][1]})")
+        else:
+            logger.info(f"💾 Flushed {len(entries)} buffered updates in {elapsed * 1000:.0f} ms")
+
+        return written, failed
+
+
+def get_write_buffer():
+    """
+    Write buffer of the current process (created on first use).
+
+    Returns:
+        WriteBuffer: Shared by all tasks of this process
+    """
+    global _write_buffer
+
+    # A forked child starts with its own, empty buffer
+    if _write_buffer is None or _write_buffer[0] != os.getpid():
+        _write_buffer = (os.getpid(), WriteBuffer())
+    return _write_buffer[1]
+
+
+def buffered_update(collection_name, filter, update, on_failure=None, on_success=None, upsert=False):
+    """Queue an update_one on this process's write buffer (see WriteBuffer.update)."""
+    get_write_buffer().update(collection_name, filter, update, on_failure, on_success, upsert)
+
+
+def flush_writes():
+    """
+    Flush this process's write buffer; call before the process exits.
+
+    Returns:
+        int: Number of updates that could not be written
+    """
+    if _write_buffer is None or _write_buffer[0] != os.getpid():
+        return 0
+    return _write_buffer[1].flush()
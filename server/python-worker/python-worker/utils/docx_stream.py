@@ -0,0 +1,122 @@
+"""
+Streaming DOCX text extraction.
+
+A .docx is a zip archive whose body text lives in `word/document.xml`.
+python-docx builds the full object model for it (and re-evaluates
+`row.cells` on every access), which is slow and memory hungry on long,
+table-heavy resumes. `iter_docx_blocks` instead stream-parses the XML with
+`iterparse` and clears every element once its text is taken, so memory stays
+bounded by the largest single paragraph or table row.
+
+Paragraphs and table rows are emitted in document order. A table row is its
+cell texts joined by spaces; a merged cell is emitted once. Nested tables
+are folded into the text of the cell that contains them. Text box content
+is read from the DrawingML part only (its VML fallback copy is skipped).
+"""
+
+import zipfile
+from xml.etree.ElementTree import ParseError, iterparse
+
+DOCUMENT_PART = 'word/document.xml'
+
+_W = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+_BODY = f'{_W}body'
+_PARAGRAPH = f'{_W}p'
+_TEXT = f'{_W}t'
+_TAB = f'{_W}tab'
+_BREAKS = (f'{_W}br', f'{_W}cr')
+_TABLE = f'{_W}tbl'
+_ROW = f'{_W}tr'
+_CELL = f'{_W}tc'
+_FALLBACK = '{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback'
+
+# Raised for files that are not a well-formed .docx; callers fall back to python-docx
+DOCX_STREAM_ERRORS = (zipfile.BadZipFile, KeyError, ParseError)
+
+
+def iter_docx_blocks(file_path):
+    """
+    Yield the text of each body paragraph and table row, in document order.
+
+    Empty paragraphs and rows are skipped.
+
+    Args:
+        file_path (str): Path to the DOCX file
+
+    Yields:
+        str: Paragraph text, or a table row's cell texts joined by spaces
+
+    Raises:
+        DOCX_STREAM_ERRORS: If the file is not a readable .docx
+    """
+    with zipfile.ZipFile(file_path) as archive, archive.open(DOCUMENT_PART) as document:
+        body = None
+        paragraphs = []  # runs of each open paragraph (text boxes nest them)
+        cells = []       # paragraphs of each open table cell
+        rows = []        # cell texts of each open table row
+        fallback_depth = 0
+
+        for event, element in iterparse(document, events=('start', 'end')):
+            tag = element.tag
+
+            if event == 'start':
+                if tag == _FALLBACK:
+                    fallback_depth += 1
+                elif fallback_depth:
+                    pass
+                elif tag == _PARAGRAPH:
+                    paragraphs.append([])
+                elif tag == _CELL:
+                    cells.append([])
+                elif tag == _ROW:
+                    rows.append([])
+                elif tag == _BODY:
+                    body = element
+                continue
+
+            if tag == _FALLBACK:
+                fallback_depth -= 1
+                element.clear()
+                continue
+            if fallback_depth:
+                continue
+
+            block = None
+            if tag == _TEXT:
+                if paragraphs and element.text:
+                    paragraphs[-1].append(element.text)
+            elif tag == _TAB:
+                if paragraphs:
+                    paragraphs[-1].append('\t')
+            elif tag in _BREAKS:
+                if paragraphs:
+                    paragraphs[-1].append('\n')
+            elif tag == _PARAGRAPH:
+                text = ''.join(paragraphs.pop())
+                if paragraphs:
+                    # Text box paragraph: part of the enclosing paragraph
+                    paragraphs[-1].append(f'\n{text}\n' if text else '')
+                elif cells:
+                    cells[-1].append(text)
+                else:
+                    block = text
+            elif tag == _CELL:
+                text = '\n'.join(cells.pop()).strip()
+                if rows and text:
+                    rows[-1].append(text)
+            elif tag == _ROW:
+                text = ' '.join(rows.pop())
+                if cells:
+                    # Nested table: part of the enclosing cell
+                    cells[-1].append(text)
+                else:
+                    block = text
+            elif tag != _TABLE:
+                continue
+
+            # Everything up to this element has been read; drop it
+            element.clear()
+            if body is not None and not (paragraphs or cells or rows):
+                body.clear()
+            if block:
+                yield block
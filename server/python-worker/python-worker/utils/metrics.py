@@ -0,0 +1,56 @@
+"""
+Prometheus metrics for the resume worker.
+
+Metrics are exported over HTTP by the worker's main process when
+WORKER_METRICS_PORT is set. Tasks run in prefork child processes, so to see
+their metrics set PROMETHEUS_MULTIPROC_DIR to an empty, writable directory
+before starting the worker: every process then writes its samples there and
+the main process serves the aggregate.
+"""
+
+import logging
+import os
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, multiprocess, start_http_server
+
+logger = logging.getLogger(__name__)
+
+# ============================================================
+# METRICS
+# ============================================================
+WARMUP_SECONDS = Gauge(
+    "worker_warmup_seconds",
+    "Time spent preloading models and matchers at worker start-up, by step",
+    ["step"],
+    multiprocess_mode="max",
+)
+BUDGET_OVERRUNS = Counter(
+    "worker_stage_budget_overruns_total",
+    "Pipeline stages stopped by their time budget, with partial results kept",
+    ["stage"],
+)
+
+
+def start_metrics_server():
+    """
+    Serve /metrics on WORKER_METRICS_PORT (no-op when unset).
+
+    Call once, from the worker main process.
+    """
+    port = os.getenv('WORKER_METRICS_PORT')
+    if not port:
+        return
+
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        start_http_server(int(port), registry=registry)
+    else:
+        start_http_server(int(port))
+    logger.info(f"📈 Worker metrics served on port {port}")
+
+
+def mark_process_dead(pid):
+    """Drop a finished child's live-gauge files in multiprocess mode."""
+    if os.getenv('PROMETHEUS_MULTIPROC_DIR'):
+        multiprocess.mark_process_dead(pid)
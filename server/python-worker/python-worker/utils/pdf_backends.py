@@ -0,0 +1,196 @@
+"""
+PDF text extraction backends.
+
+Every backend opens a PDF as a document with random access to page text, so
+the page-level pipeline in text_extractor (limits, budgets, parallel page
+ranges) works the same whatever library does the parsing:
+
+    pypdf2      PyPDF2 (default, pure Python)
+    pdfplumber  pdfplumber (used by backend/ and backend1/)
+    pdfminer    pdfminer.six layout analysis
+    pypdfium2   PDFium bindings (only when pypdfium2 is installed)
+
+Pick one per deployment with PDF_BACKEND. The libraries are imported when a
+document is opened, so only the selected one has to be installed. An unknown
+or uninstalled PDF_BACKEND fails the import of this module, so the worker
+refuses to start instead of failing every PDF.
+benchmarks/pdf_backend_benchmark.py compares them on a folder of PDFs.
+"""
+
+import abc
+import importlib.util
+import inspect
+import os
+
+
+class PdfDocument(abc.ABC):
+    """
+    An open PDF. Subclasses set `page_count` and implement `page_text`.
+
+    Use as a context manager so the file is closed.
+    """
+
+    page_count = 0
+
+    @abc.abstractmethod
+    def page_text(self, index):
+        """Text of the 0-based page `index` ("" when it has none)."""
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class PyPDF2Document(PdfDocument):
+    def __init__(self, file_path):
+        from PyPDF2 import PdfReader
+
+        self._reader = PdfReader(file_path)
+        self.page_count = len(self._reader.pages)
+
+    def page_text(self, index):
+        return self._reader.pages[index].extract_text() or ""
+
+
+class PdfplumberDocument(PdfDocument):
+    def __init__(self, file_path):
+        import pdfplumber
+
+        self._pdf = pdfplumber.open(file_path)
+        self.page_count = len(self._pdf.pages)
+
+    def page_text(self, index):
+        page = self._pdf.pages[index]
+        try:
+            return page.extract_text() or ""
+        finally:
+            # pdfplumber caches parsed objects per page; drop them as we go
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+class PdfminerDocument(PdfDocument):
+    def __init__(self, file_path):
+        from pdfminer.converter import PDFPageAggregator
+        from pdfminer.layout import LAParams
+        from pdfminer.pdfdocument import PDFDocument
+        from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+        from pdfminer.pdfpage import PDFPage
+        from pdfminer.pdfparser import PDFParser
+
+        self._file = open(file_path, 'rb')
+        try:
+            document = PDFDocument(PDFParser(self._file))
+            self._pages = list(PDFPage.create_pages(document))
+        except Exception:
+            self._file.close()
+            raise
+        resources = PDFResourceManager()
+        self._device = PDFPageAggregator(resources, laparams=LAParams())
+        self._interpreter = PDFPageInterpreter(resources, self._device)
+        self.page_count = len(self._pages)
+
+    def page_text(self, index):
+        from pdfminer.layout import LTTextContainer
+
+        self._interpreter.process_page(self._pages[index])
+        layout = self._device.get_result()
+        return "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+
+    def close(self):
+        self._file.close()
+
+
+class PypdfiumDocument(PdfDocument):
+    def __init__(self, file_path):
+        import pypdfium2
+
+        self._pdf = pypdfium2.PdfDocument(file_path)
+        self.page_count = len(self._pdf)
+
+    def page_text(self, index):
+        page = self._pdf[index]
+        try:
+            textpage = page.get_textpage()
+            try:
+                # PDFium ends lines with \r\n
+                return textpage.get_text_range().replace('\r\n', '\n')
+            finally:
+                textpage.close()
+        finally:
+            page.close()
+
+    def close(self):
+        self._pdf.close()
+
+
+PDF_BACKENDS = {
+    'pypdf2': PyPDF2Document,
+    'pdfplumber': PdfplumberDocument,
+    'pdfminer': PdfminerDocument,
+    'pypdfium2': PypdfiumDocument,
+}
+
+# Module each backend needs, for availability checks
+_BACKEND_MODULES = {
+    'pypdf2': 'PyPDF2',
+    'pdfplumber': 'pdfplumber',
+    'pdfminer': 'pdfminer',
+    'pypdfium2': 'pypdfium2',
+}
+
+
+def available_pdf_backends():
+    """Names of the backends whose library is installed."""
+    return [
+        name for name in PDF_BACKENDS
+        if importlib.util.find_spec(_BACKEND_MODULES[name]) is not None
+    ]
+
+
+def _check_pdf_backend(name):
+    """
+    Validate a backend name before any document is opened.
+
+    Returns:
+        str: The name
+
+    Raises:
+        ValueError: If the backend is unknown, incomplete or not installed
+    """
+    if name not in PDF_BACKENDS:
+        raise ValueError(f"Unknown PDF backend '{name}'. Available: {', '.join(PDF_BACKENDS)}")
+    if inspect.isabstract(PDF_BACKENDS[name]):
+        raise ValueError(f"PDF backend '{name}' does not implement page_text")
+    if importlib.util.find_spec(_BACKEND_MODULES[name]) is None:
+        raise ValueError(f"PDF backend '{name}' needs the '{_BACKEND_MODULES[name]}' package, which is not installed")
+    return name
+
+
+# Checked at import: a bad value stops the worker from starting
+PDF_BACKEND = _check_pdf_backend(os.getenv('PDF_BACKEND', 'pypdf2').lower())
+
+
+def open_pdf(file_path, backend=None):
+    """
+    Open a PDF with the configured (or given) backend.
+
+    Args:
+        file_path (str): Path to the PDF file
+        backend (str, optional): Backend name; defaults to PDF_BACKEND
+
+    Returns:
+        PdfDocument: Open document (use as a context manager)
+
+    Raises:
+        ValueError: If `backend` is unknown, incomplete or not installed
+    """
+    name = PDF_BACKEND if backend is None else _check_pdf_backend(backend.lower())
+    return PDF_BACKENDS[name](file_path)
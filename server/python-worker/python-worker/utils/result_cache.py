@@ -0,0 +1,154 @@
+"""
+Content-hash cache of resume processing results.
+
+Users upload the same file again and again, and broker redeliveries replay
+tasks. Results are stored in the `resumecontentcache` collection keyed by the
+SHA-256 of the file bytes together with the extractor and rules versions
+they were produced with. On a hit the stored rawText / skills / ATS fields
+are copied into the new `resumeresults` document and the pipeline is
+skipped.
+
+Changing SKILLS invalidates the cache automatically (it is part of the
+rules version), and so does switching PDF_BACKEND (it is part of the
+extractor id); other extractor or ATS rule changes must bump
+EXTRACTOR_VERSION (utils.text_extractor) or ATS_RULES_VERSION
+(utils.ats_engine).
+"""
+
+import hashlib
+import logging
+from datetime import datetime, timezone
+
+from prometheus_client import Counter
+
+from utils.ats_engine import ATS_RULES_VERSION
+from utils.db import buffered_update, get_db
+from utils.skills_data import SKILLS
+from utils.text_extractor import EXTRACTOR_ID
+
+logger = logging.getLogger(__name__)
+
+CACHE_COLLECTION = 'resumecontentcache'
+
+# Fields copied from a cached result into resumeresults
+RESULT_FIELDS = ('rawText', 'skills', 'atsScore', 'missingSkills', 'scoringBreakdown', 'extraction')
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+_SKILLS_DIGEST = hashlib.sha1('\n'.join(sorted(SKILLS)).encode('utf-8')).hexdigest()[:12]
+RULES_VERSION = f"{ATS_RULES_VERSION}-{_SKILLS_DIGEST}"
+
+# ============================================================
+# METRICS
+# ============================================================
+LOOKUPS = Counter(
+    "worker_result_cache_lookups_total",
+    "Content-hash result cache lookups by outcome (hit = processing skipped, miss, error)",
+    ["outcome"],
+)
+
+_indexes_ready = False
+_lookups = {'hit': 0, 'miss': 0}
+
+
+def file_sha256(file_path):
+    """
+    SHA-256 of a file's bytes, read in chunks.
+
+    Args:
+        file_path (str): Path to the file
+
+    Returns:
+        str: Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _get_cache_collection():
+    global _indexes_ready
+
+    collection = get_db()[CACHE_COLLECTION]
+    if not _indexes_ready:
+        collection.create_index(
+            [('contentHash', 1), ('extractorVersion', 1), ('rulesVersion', 1)],
+            unique=True,
+            name='content_hash_versions',
+        )
+        _indexes_ready = True
+    return collection
+
+
+def _key(content_hash):
+    return {
+        'contentHash': content_hash,
+        'extractorVersion': EXTRACTOR_ID,
+        'rulesVersion': RULES_VERSION,
+    }
+
+
+def skip_rate():
+    """Share of lookups in this process that skipped processing."""
+    total = _lookups['hit'] + _lookups['miss']
+    return _lookups['hit'] / total if total else 0.0
+
+
+def find_cached_result(content_hash):
+    """
+    Cached result for this content under the current versions.
+
+    Lookup errors are logged and treated as a miss, so the cache can never
+    fail a task.
+
+    Args:
+        content_hash (str): file_sha256 of the resume
+
+    Returns:
+        dict | None: RESULT_FIELDS of the cached result, or None
+    """
+    try:
+        cached = _get_cache_collection().find_one(
+            _key(content_hash),
+            projection={field: 1 for field in RESULT_FIELDS},
+        )
+    except Exception as error:
+        LOOKUPS.labels(outcome='error').inc()
+        logger.warning(f"⚠️  Result cache lookup failed: {error}")
+        return None
+
+    outcome = 'hit' if cached else 'miss'
+    LOOKUPS.labels(outcome=outcome).inc()
+    _lookups[outcome] += 1
+    logger.info(f"🗂️  Result cache {outcome} (skip rate {skip_rate():.1%} in this process)")
+
+    if not cached:
+        return None
+    return {field: cached[field] for field in RESULT_FIELDS if field in cached}
+
+
+def store_result(content_hash, result):
+    """
+    Queue a completed result for future duplicates on the write buffer;
+    never raises. A failed write is only logged.
+
+    Args:
+        content_hash (str): file_sha256 of the resume
+        result (dict): Completed result with RESULT_FIELDS
+    """
+    try:
+        _get_cache_collection()
+        buffered_update(
+            CACHE_COLLECTION,
+            _key(content_hash),
+            {
+                '$set': {field: result[field] for field in RESULT_FIELDS if field in result},
+                '$setOnInsert': {'createdAt': datetime.now(timezone.utc)},
+            },
+            on_failure=lambda error: logger.warning(f"⚠️  Failed to store result in cache: {error}"),
+            upsert=True,
+        )
+    except Exception as error:
+        logger.warning(f"⚠️  Failed to store result in cache: {error}")
@@ -4,7 +4,9 @@ Uses spaCy for tokenization and matches against predefined skills list.
 """
 
 import logging
+import time
 import spacy
+from utils.skill_matcher import SkillMatcher
 from utils.skills_data import SKILLS
 
 logger = logging.getLogger(__name__)
@@ -12,6 +14,28 @@ logger = logging.getLogger(__name__)
 # Global spaCy model instance (loaded once)
 _nlp = None
 
+# Global compiled SKILLS matcher (built once)
+_skill_matcher = None
+_SKILL_SET = frozenset(SKILLS)
+
+# Text block size for budgeted extraction (split at paragraph breaks)
+SKILL_BLOCK_CHARS = 20000
+
+
+def get_skill_matcher():
+    """
+    Compile the SKILLS dictionary into a word-boundary matcher (once).
+
+    Returns:
+        SkillMatcher: Shared matcher over SKILLS
+    """
+    global _skill_matcher
+
+    if _skill_matcher is None:
+        _skill_matcher = SkillMatcher(SKILLS)
+        logger.info(f"✅ Skill matcher compiled ({len(_skill_matcher)} skills)")
+    return _skill_matcher
+
 
 def load_spacy_model():
     """
@@ -32,25 +56,81 @@ def load_spacy_model():
         logger.info("✅ spaCy model loaded successfully")
         return _nlp
     except OSError:
-        logger.warning("⚠️  spaCy model 'en_core_web_sm' not found")
-        logger.info("💡 Attempting to download spaCy model...")
+        # Never download in a worker: install the model at build time with
+        # `python -m spacy download en_core_web_sm`
+        logger.error("❌ spaCy model 'en_core_web_sm' not found - install it at build time")
+        logger.info("💡 Using blank spaCy model as fallback")
+        _nlp = spacy.blank("en")
+        return _nlp
+
+
+def _phrase_skills(doc):
+    """
+    SKILLS that occur as a spaCy token, bigram or trigram of `doc`.
+    
+    Args:
+        doc (spacy.tokens.Doc): spaCy tokens of lowercased text
         
-        # Try downloading the model
-        import subprocess
-        try:
-            subprocess.run(
-                ["python", "-m", "spacy", "download", "en_core_web_sm"],
-                check=True,
-                capture_output=True
-            )
-            logger.info("✅ spaCy model downloaded successfully")
-            _nlp = spacy.load("en_core_web_sm")
-            return _nlp
-        except Exception as download_error:
-            logger.error(f"❌ Failed to download spaCy model: {download_error}")
-            logger.info("💡 Using blank spaCy model as fallback")
-            _nlp = spacy.blank("en")
-            return _nlp
+    Returns:
+        set: Detected skills
+    """
+    # Extract unique tokens
+    tokens = set([token.text for token in doc])
+    
+    # Also add multi-word phrases (bigrams, trigrams)
+    # This helps catch skills like "react native", "spring boot", etc.
+    bigrams = set()
+    trigrams = set()
+    
+    for i in range(len(doc) - 1):
+        bigram = f"{doc[i].text} {doc[i+1].text}"
+        bigrams.add(bigram)
+    
+    for i in range(len(doc) - 2):
+        trigram = f"{doc[i].text} {doc[i+1].text} {doc[i+2].text}"
+        trigrams.add(trigram)
+    
+    # Combine all n-grams
+    all_phrases = tokens.union(bigrams).union(trigrams)
+    return all_phrases & _SKILL_SET
+
+
+def _detect_skills(doc, text_lower):
+    """
+    Match a tokenized resume against the SKILLS list.
+    
+    Args:
+        doc (spacy.tokens.Doc): spaCy tokens of text_lower
+        text_lower (str): Lowercased resume text
+        
+    Returns:
+        set: Detected skills
+    """
+    # Match against predefined SKILLS list:
+    # spaCy phrases that are skills + one matcher pass over the full text
+    detected_skills = set(_phrase_skills(doc))
+    detected_skills.update(get_skill_matcher().extract(text_lower))
+    return detected_skills
+
+
+def _text_blocks(text, block_chars=SKILL_BLOCK_CHARS):
+    """
+    Split text at paragraph breaks into blocks of about `block_chars`.
+    
+    spaCy makes a paragraph break its own whitespace token, which no skill
+    phrase can span, so phrases found per block equal those of the whole.
+    """
+    block = []
+    size = 0
+    for paragraph in text.split('\n\n'):
+        if block and size + len(paragraph) > block_chars:
+            yield '\n\n'.join(block)
+            block = []
+            size = 0
+        block.append(paragraph)
+        size += len(paragraph) + 2
+    if block:
+        yield '\n\n'.join(block)
 
 
 def extract_skills(text):
@@ -79,42 +159,11 @@ def extract_skills(text):
         # Load spaCy model
         nlp = load_spacy_model()
         
-        # Tokenize text with spaCy
-        doc = nlp(text_lower)
-        
-        # Extract unique tokens
-        tokens = set([token.text for token in doc])
-        
-        # Also add multi-word phrases (bigrams, trigrams)
-        # This helps catch skills like "react native", "spring boot", etc.
-        bigrams = set()
-        trigrams = set()
-        
-        for i in range(len(doc) - 1):
-            bigram = f"{doc[i].text} {doc[i+1].text}"
-            bigrams.add(bigram)
-        
-        for i in range(len(doc) - 2):
-            trigram = f"{doc[i].text} {doc[i+1].text} {doc[i+2].text}"
-            trigrams.add(trigram)
-        
-        # Combine all n-grams
-        all_phrases = tokens.union(bigrams).union(trigrams)
-        
-        # Match against predefined SKILLS list
-        detected_skills = []
-        
-        for skill in SKILLS:
-            # Check if skill appears in text
-            # We check both in phrases and in the full text
-            if skill in all_phrases or skill in text_lower:
-                detected_skills.append(skill)
-        
-        # Remove duplicates while preserving order
-        detected_skills = list(dict.fromkeys(detected_skills))
+        # Tokenize text with spaCy and match phrases + full text
+        detected_skills = _detect_skills(nlp(text_lower), text_lower)
         
         # Sort alphabetically for consistency
-        detected_skills.sort()
+        detected_skills = sorted(detected_skills)
         
         logger.info(f"✅ Skill extraction completed")
         logger.info(f"📊 Detected {len(detected_skills)} skills")
@@ -130,29 +179,81 @@ def extract_skills(text):
         return []
 
 
-def extract_skills_simple(text):
+def extract_skills_within(text, deadline):
     """
-    Simplified skill extraction without spaCy (fallback method).
-    Uses simple string matching.
+    Extract skills, stopping spaCy processing at a deadline.
+    
+    The compiled matcher runs over the whole text first (fast, finds most
+    skills). spaCy phrases are then added block by block until `deadline`
+    passes; the skills found so far are returned either way.
     
     Args:
         text (str): Resume text to extract skills from
+        deadline (float): time.monotonic() time budget end
         
     Returns:
-        list: List of detected skills
+        tuple: (sorted skills, complete) - complete is False when the
+            deadline stopped processing early
     """
     if not text or len(text.strip()) == 0:
-        return []
+        logger.warning("⚠️  Empty text provided for skill extraction")
+        return [], True
     
     text_lower = text.lower()
-    detected_skills = []
+    nlp = load_spacy_model()
     
-    for skill in SKILLS:
-        if skill in text_lower:
-            detected_skills.append(skill)
+    detected_skills = set(get_skill_matcher().extract(text_lower))
+    complete = True
+    for block in _text_blocks(text_lower):
+        if time.monotonic() >= deadline:
+            complete = False
+            break
+        detected_skills.update(_phrase_skills(nlp(block)))
     
-    # Remove duplicates and sort
-    detected_skills = list(dict.fromkeys(detected_skills))
-    detected_skills.sort()
+    detected_skills = sorted(detected_skills)
+    logger.info(f"✅ Skill extraction {'completed' if complete else 'stopped at time budget'}")
+    logger.info(f"📊 Detected {len(detected_skills)} skills")
+    return detected_skills, complete
+
+
+def extract_skills_batch(texts, batch_size=64):
+    """
+    Extract skills from many resume texts (bulk re-scoring).
     
-    return detected_skills
+    Gives the same skills as extract_skills for each text, but streams the
+    texts through the spaCy tokenizer with `pipe` and logs nothing per
+    document. Only tokens are used for matching, so the tagger / parser /
+    NER components are not run.
+    
+    Args:
+        texts (list): Resume texts
+        batch_size (int): Texts per spaCy tokenizer batch
+        
+    Returns:
+        list: One sorted skill list per input text
+    """
+    texts_lower = [text.lower() if text and text.strip() else "" for text in texts]
+    tokenizer = load_spacy_model().tokenizer
+    
+    results = []
+    for text_lower, doc in zip(texts_lower, tokenizer.pipe(texts_lower, batch_size=batch_size)):
+        results.append(sorted(_detect_skills(doc, text_lower)) if text_lower else [])
+    return results
+
+
+def extract_skills_simple(text):
+    """
+    Simplified skill extraction without spaCy (fallback method).
+    Uses the compiled skill matcher only.
+    
+    Args:
+        text (str): Resume text to extract skills from
+        
+    Returns:
+        list: List of detected skills
+    """
+    if not text or len(text.strip()) == 0:
+        return []
+    
+    # Matcher results are already unique
+    return sorted(get_skill_matcher().extract(text))
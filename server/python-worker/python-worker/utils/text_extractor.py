@@ -1,21 +1,273 @@
 import re
 import os
 import logging
-from PyPDF2 import PdfReader
+import math
+import multiprocessing
+import threading
+import time
+import types
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from prometheus_client import Histogram
 from docx import Document
+from utils.docx_stream import DOCX_STREAM_ERRORS, iter_docx_blocks
+from utils.pdf_backends import PDF_BACKEND, open_pdf
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever a change alters the extracted text of existing files
+# (invalidates the content-hash result cache, see utils.result_cache)
+EXTRACTOR_VERSION = 3
+# Extractor identity for cached results: PDF backends differ in their text
+EXTRACTOR_ID = f"{EXTRACTOR_VERSION}-{PDF_BACKEND}"
 
-def extract_text_from_pdf(file_path):
+# Extraction limits: scanned portfolios and misfiled books stop early
+PDF_MAX_PAGES = int(os.getenv('PDF_MAX_PAGES', '50'))
+EXTRACT_MAX_CHARS = int(os.getenv('EXTRACT_MAX_CHARS', '200000'))
+
+# Parallel PDF extraction: PDFs with at least PDF_PARALLEL_MIN_PAGES pages
+# (0 = never) are split into page ranges extracted on a process pool of
+# PDF_PARALLEL_PROCESSES processes. The pool is created lazily once per
+# worker process and shared by all its tasks. Daemonic processes cannot
+# start one, so with the Celery prefork pool PDFs are always extracted
+# sequentially; run the worker with `--pool threads` or `--pool solo` to
+# use it. Its processes are started by a forkserver rather than forked
+# from the (multi-threaded) worker, so they cannot inherit a held lock.
+PDF_PARALLEL_MIN_PAGES = int(os.getenv('PDF_PARALLEL_MIN_PAGES', '0'))
+PDF_PARALLEL_PROCESSES = int(os.getenv('PDF_PARALLEL_PROCESSES', '2'))
+
+# ============================================================
+# METRICS
+# ============================================================
+PAGE_SECONDS = Histogram(
+    "worker_pdf_page_seconds",
+    "Text extraction time per PDF page",
+    ["mode"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10),
+)
+
+# Control characters removed by normalize_text (keeps \t, \n and \r)
+_CONTROL_CHARS = dict.fromkeys([*range(0x00, 0x09), 0x0b, 0x0c, *range(0x0e, 0x20), 0x7f])
+_MULTIPLE_SPACES = re.compile(r' {2,}')
+
+ExtractedText = namedtuple('ExtractedText', [
+    'text',             # cleaned text
+    'pages_total',      # pages in the document (None when not paginated)
+    'pages_processed',  # pages actually extracted
+    'truncated',        # a page or character limit cut the document short
+    'page_seconds',     # extraction time of each processed page (PDF only)
+    'parallel',         # pages were extracted on the process pool
+    'budget_exceeded',  # the time budget ran out before the end of the document
+    'backend',          # PDF backend used (None for other formats)
+])
+
+_page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def normalize_text(text):
     """
-    Extract text from a PDF file using PyPDF2.
+    Clean and normalize one chunk of extracted text in a single pass.
+    
+    - Remove null characters and other control characters
+    - Replace multiple spaces with a single space
+    - Trim leading/trailing spaces from each line
+    - Collapse runs of blank lines into one paragraph break
+    - Trim leading/trailing blank lines
+    
+    Args:
+        text (str): Raw text (e.g. one PDF page)
+        
+    Returns:
+        str: Normalized text
+    """
+    lines = []
+    pending_break = False
+    for line in text.translate(_CONTROL_CHARS).split('\n'):
+        line = line.strip()
+        if not line:
+            pending_break = bool(lines)
+            continue
+        if pending_break:
+            lines.append('')
+            pending_break = False
+        if '  ' in line:
+            line = _MULTIPLE_SPACES.sub(' ', line)
+        lines.append(line)
+    return '\n'.join(lines)
+
+
+def _extract_page(document, index):
+    started = time.perf_counter()
+    page_text = document.page_text(index)
+    return index + 1, page_text, time.perf_counter() - started
+
+
+def iter_pdf_pages(document, max_pages=None):
+    """
+    Yield the text of the first `max_pages` pages, lazily.
+    
+    Pages are only parsed when the consumer asks for them, so stopping the
+    iteration stops the extraction.
+    
+    Args:
+        document (PdfDocument): Open PDF (see utils.pdf_backends)
+        max_pages (int, optional): Page limit
+        
+    Yields:
+        tuple: (1-based page number, extracted page text, seconds)
+    """
+    page_count = document.page_count
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+    for index in range(page_count):
+        yield _extract_page(document, index)
+
+
+def _extract_page_range(file_path, start, stop, backend):
+    """Pool worker: (page_num, text, seconds) for pages [start, stop)."""
+    with open_pdf(file_path, backend) as document:
+        return [_extract_page(document, index) for index in range(start, stop)]
+
+
+def _get_page_pool():
+    """
+    Process pool for page ranges, created once per worker process.
+    
+    Only call this outside daemonic processes (see _can_use_page_pool).
+    Call shutdown_page_pool before the worker process exits.
+    """
+    global _page_pool
+    
+    # Tasks on the threads pool can get here at the same time
+    with _page_pool_lock:
+        if _page_pool is None:
+            _page_pool = ProcessPoolExecutor(
+                max_workers=PDF_PARALLEL_PROCESSES,
+                mp_context=multiprocessing.get_context('forkserver'),
+            )
+            logger.info(f"🧵 PDF page pool started ({PDF_PARALLEL_PROCESSES} processes)")
+        return _page_pool
+
+
+def _can_use_page_pool():
+    # Daemonic processes (Celery prefork children) may not have children
+    return not multiprocessing.current_process().daemon
+
+
+def shutdown_page_pool():
+    """Stop this process's PDF page pool, if one was started."""
+    global _page_pool
+    
+    with _page_pool_lock:
+        if _page_pool is not None:
+            _page_pool.shutdown(wait=True, cancel_futures=True)
+            _page_pool = None
+_page_pool_lock = threading.Lock()
+
+
+def iter_pdf_pages_parallel(file_path, page_count, processes=None, backend=None):
+    """
+    Yield the text of the first `page_count` pages, extracted in parallel.
+    
+    The pages are split into about two ranges per pool process. At most
+    one range per process (plus one) is in flight, and results are yielded
+    in page order, so a consumer that stops early leaves the remaining
+    ranges unextracted.
     
     Args:
         file_path (str): Path to the PDF file
+        page_count (int): Pages to extract
+        processes (int, optional): Pool size used to size the ranges
+        backend (str, optional): PDF backend; defaults to PDF_BACKEND
+        
+    Yields:
+        tuple: (1-based page number, extracted page text, seconds)
+    """
+    processes = processes or PDF_PARALLEL_PROCESSES
+    backend = backend or PDF_BACKEND
+    pool = _get_page_pool()
+    range_size = max(1, math.ceil(page_count / (processes * 2)))
+    ranges = deque((start, min(start + range_size, page_count)) for start in range(0, page_count, range_size))
+    
+    in_flight = deque()
+    try:
+        while ranges or in_flight:
+            while ranges and len(in_flight) <= processes:
+                start, stop = ranges.popleft()
+                in_flight.append(pool.submit(_extract_page_range, file_path, start, stop, backend))
+            yield from in_flight.popleft().result()
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+def join_pages(pages, max_chars=EXTRACT_MAX_CHARS, deadline=None):
+    """
+    Normalize page texts and join them once, stopping at `max_chars`.
+    
+    Args:
+        pages (iterable): (page_num, raw_text, seconds) triples, e.g. iter_pdf_pages
+        max_chars (int): Character limit for the joined text
+        deadline (float, optional): time.monotonic() after which no further
+            page is extracted; the pages so far are kept
+        
+    Returns:
+        tuple: (text, page_seconds, hit_char_limit, budget_exceeded)
+    """
+    chunks = []
+    size = 0
+    page_seconds = []
+    hit_char_limit = False
+    budget_exceeded = False
+    
+    for page_num, page_text, seconds in pages:
+        page_seconds.append(seconds)
+        logger.debug(f"  - Page {page_num}: {len(page_text)} characters in {seconds * 1000:.1f} ms")
+        page_text = normalize_text(page_text)
+        if page_text:
+            remaining = max_chars - size
+            # A page that exactly fills the limit is kept whole; only text
+            # beyond the limit counts as truncated
+            if len(page_text) > remaining:
+                if remaining > 0:
+                    chunks.append(page_text[:remaining])
+                hit_char_limit = True
+                logger.info(f"✂️  Character limit ({max_chars}) reached on page {page_num}")
+                break
+            
+            chunks.append(page_text)
+            size += len(page_text) + 1  # + "\n" separator
+        
+        if deadline is not None and time.monotonic() >= deadline:
+            budget_exceeded = True
+            logger.warning(f"⏱️  Extraction time budget exhausted after page {page_num}")
+            break
+    
+    if isinstance(pages, types.GeneratorType):
+        pages.close()  # stop pending extraction now, not at garbage collection
+    return "\n".join(chunks).strip(), page_seconds, hit_char_limit, budget_exceeded
+
+
+def extract_pdf(file_path, max_pages=PDF_MAX_PAGES, max_chars=EXTRACT_MAX_CHARS, deadline=None, backend=None):
+    """
+    Extract and normalize text from a PDF file page by page.
+    
+    Stops after `max_pages` pages, `max_chars` characters or at `deadline`,
+    whichever comes first. PDFs with at least PDF_PARALLEL_MIN_PAGES pages
+    are extracted on the shared page pool, except in daemonic processes.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        max_pages (int): Page limit
+        max_chars (int): Character limit
+        deadline (float, optional): time.monotonic() time budget end
+        backend (str, optional): PDF backend (utils.pdf_backends); defaults
+            to PDF_BACKEND
         
     Returns:
-        str: Extracted raw text from the PDF
+        ExtractedText: Text and page statistics
         
     Raises:
         Exception: If PDF reading fails
@@ -26,37 +278,116 @@ def extract_text_from_pdf(file_path):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        reader = PdfReader(file_path)
-        text = ""
+        backend = (backend or PDF_BACKEND).lower()
+        with open_pdf(file_path, backend) as document:
+            pages_total = document.page_count
+            page_limit = min(pages_total, max_pages)
+            parallel = 0 < PDF_PARALLEL_MIN_PAGES <= page_limit and _can_use_page_pool()
+            
+            started = time.perf_counter()
+            if parallel:
+                try:
+                    text, page_seconds, hit_char_limit, budget_exceeded = join_pages(
+                        iter_pdf_pages_parallel(file_path, page_limit, backend=backend), max_chars, deadline
+                    )
+                except BrokenProcessPool as error:
+                    # A pool process died; restart the pool on the next large PDF
+                    logger.warning(f"⚠️  PDF page pool failed ({error}), extracting sequentially")
+                    shutdown_page_pool()
+                    parallel = False
+            if not parallel:
+                text, page_seconds, hit_char_limit, budget_exceeded = join_pages(
+                    iter_pdf_pages(document, max_pages), max_chars, deadline
+                )
+            elapsed = time.perf_counter() - started
         
-        # Extract text from all pages
-        for page_num, page in enumerate(reader.pages, start=1):
-            page_text = page.extract_text()
-            if page_text:
-                text += page_text + "\n"
-                logger.debug(f"  - Extracted page {page_num}: {len(page_text)} characters")
+        pages_processed = len(page_seconds)
+        # Running out of time on the last page cut nothing short
+        budget_exceeded = budget_exceeded and pages_processed < page_limit
+        truncated = hit_char_limit or budget_exceeded or pages_processed < pages_total
         
-        if not text.strip():
+        mode = 'parallel' if parallel else 'sequential'
+        for seconds in page_seconds:
+            PAGE_SECONDS.labels(mode=mode).observe(seconds)
+        
+        if truncated:
+            logger.warning(
+                f"⚠️  PDF truncated: processed {pages_processed}/{pages_total} pages "
+                f"(limits: {max_pages} pages, {max_chars} characters)"
+            )
+        
+        if not text:
             logger.warning("⚠️  PDF appears to be empty or text extraction failed")
-            return ""
+        else:
+            slowest = max(range(pages_processed), key=page_seconds.__getitem__)
+            logger.info(
+                f"✅ Successfully extracted {len(text)} characters from {pages_processed} PDF pages "
+                f"in {elapsed * 1000:.0f} ms ({backend}, {mode}; page total {sum(page_seconds) * 1000:.0f} ms, "
+                f"slowest page {slowest + 1}: {page_seconds[slowest] * 1000:.0f} ms)"
+            )
         
-        logger.info(f"✅ Successfully extracted {len(text)} characters from PDF")
-        return text
+        return ExtractedText(
+            text, pages_total, pages_processed, truncated, page_seconds, parallel, budget_exceeded, backend
+        )
         
     except Exception as error:
         logger.error(f"❌ Error extracting text from PDF: {error}")
         raise
 
 
-def extract_text_from_docx(file_path):
+def extract_text_from_pdf(file_path):
     """
-    Extract text from a DOCX file using python-docx.
+    Extract text from a PDF file using PyPDF2.
+    
+    Args:
+        file_path (str): Path to the PDF file
+        
+    Returns:
+        str: Extracted, normalized text from the PDF
+        
+    Raises:
+        Exception: If PDF reading fails
+    """
+    return extract_pdf(file_path).text
+
+
+def _iter_docx_blocks_object_model(file_path):
+    """python-docx fallback: body paragraphs, then table rows."""
+    doc = Document(file_path)
+    for para in doc.paragraphs:
+        if para.text:
+            yield para.text
+    for table in doc.tables:
+        for row in table.rows:
+            yield " ".join(cell.text for cell in row.cells if cell.text)
+
+
+def _read_docx_blocks(blocks, deadline):
+    parts = []
+    budget_exceeded = False
+    for block in blocks:
+        parts.append(block)
+        if deadline is not None and time.monotonic() >= deadline:
+            budget_exceeded = True
+            break
+    return "\n".join(parts), budget_exceeded
+
+
+def extract_docx(file_path, deadline=None):
+    """
+    Extract text from a DOCX file.
+    
+    The document XML is stream-parsed (utils.docx_stream), emitting
+    paragraphs and table rows in document order with bounded memory. Files
+    it cannot read are retried with python-docx.
     
     Args:
         file_path (str): Path to the DOCX file
+        deadline (float, optional): time.monotonic() after which no further
+            paragraph or table row is read; the text so far is kept
         
     Returns:
-        str: Extracted raw text from the DOCX
+        tuple: (raw_text, budget_exceeded)
         
     Raises:
         Exception: If DOCX reading fails
@@ -67,34 +398,47 @@ def extract_text_from_docx(file_path):
         if not os.path.exists(file_path):
             raise FileNotFoundError(f"File not found: {file_path}")
         
-        doc = Document(file_path)
-        text = ""
-        
-        # Extract text from all paragraphs
-        for para in doc.paragraphs:
-            if para.text:
-                text += para.text + "\n"
+        started = time.perf_counter()
+        reader = 'stream'
+        try:
+            text, budget_exceeded = _read_docx_blocks(iter_docx_blocks(file_path), deadline)
+        except DOCX_STREAM_ERRORS as error:
+            logger.warning(f"⚠️  Streaming DOCX parse failed ({error}), falling back to python-docx")
+            reader = 'python-docx'
+            text, budget_exceeded = _read_docx_blocks(_iter_docx_blocks_object_model(file_path), deadline)
+        elapsed = time.perf_counter() - started
         
-        # Extract text from tables (if any)
-        for table in doc.tables:
-            for row in table.rows:
-                for cell in row.cells:
-                    if cell.text:
-                        text += cell.text + " "
-                text += "\n"
+        if budget_exceeded:
+            logger.warning(f"⏱️  Extraction time budget exhausted after {len(text)} DOCX characters")
         
         if not text.strip():
             logger.warning("⚠️  DOCX appears to be empty")
-            return ""
+            return "", budget_exceeded
         
-        logger.info(f"✅ Successfully extracted {len(text)} characters from DOCX")
-        return text
+        logger.info(f"✅ Successfully extracted {len(text)} characters from DOCX in {elapsed * 1000:.0f} ms ({reader})")
+        return text, budget_exceeded
         
     except Exception as error:
         logger.error(f"❌ Error extracting text from DOCX: {error}")
         raise
 
 
+def extract_text_from_docx(file_path):
+    """
+    Extract text from a DOCX file.
+    
+    Args:
+        file_path (str): Path to the DOCX file
+        
+    Returns:
+        str: Extracted raw text from the DOCX
+        
+    Raises:
+        Exception: If DOCX reading fails
+    """
+    return extract_docx(file_path)[0]
+
+
 def extract_text_from_doc(file_path):
     """
     Extract text from a DOC file (legacy Microsoft Word format).
@@ -137,36 +481,22 @@ def clean_text(raw_text):
         return ""
     
     logger.debug("🧹 Cleaning extracted text...")
-    
-    # Replace multiple spaces with single space
-    text = re.sub(r' +', ' ', raw_text)
-    
-    # Replace multiple newlines with double newline (paragraph separator)
-    text = re.sub(r'\n\s*\n+', '\n\n', text)
-    
-    # Remove leading/trailing whitespace from each line
-    lines = [line.strip() for line in text.split('\n')]
-    text = '\n'.join(lines)
-    
-    # Remove leading/trailing whitespace from entire text
-    text = text.strip()
-    
-    # Remove null characters and other control characters
-    text = re.sub(r'[\x00-\x08\x0b-\x0c\x0e-\x1f\x7f]', '', text)
-    
+    text = normalize_text(raw_text)
     logger.debug(f"✅ Text cleaned: {len(text)} characters")
     return text
 
 
-def extract_text(file_path):
+def extract_document(file_path, deadline=None):
     """
-    Main extraction function that detects file type and extracts text accordingly.
+    Detect the file type and extract cleaned text with extraction statistics.
     
     Args:
         file_path (str): Path to the resume file
+        deadline (float, optional): time.monotonic() time budget end; text
+            extracted until then is returned with budget_exceeded set
         
     Returns:
-        str: Cleaned extracted text
+        ExtractedText: Cleaned text, page counts and truncation flag
         
     Raises:
         ValueError: If file extension is not supported
@@ -178,11 +508,14 @@ def extract_text(file_path):
     
     logger.info(f"🔍 Detected file extension: {ext}")
     
-    # Extract based on file type
+    # PDFs are normalized page by page while extracting
     if ext == '.pdf':
-        raw_text = extract_text_from_pdf(file_path)
-    elif ext == '.docx':
-        raw_text = extract_text_from_docx(file_path)
+        return extract_pdf(file_path, deadline=deadline)
+    
+    # Extract based on file type
+    budget_exceeded = False
+    if ext == '.docx':
+        raw_text, budget_exceeded = extract_docx(file_path, deadline)
     elif ext == '.doc':
         raw_text = extract_text_from_doc(file_path)
     else:
@@ -190,5 +523,26 @@ def extract_text(file_path):
     
     # Clean the extracted text
     cleaned_text = clean_text(raw_text)
+    truncated = budget_exceeded or len(cleaned_text) > EXTRACT_MAX_CHARS
+    if len(cleaned_text) > EXTRACT_MAX_CHARS:
+        logger.warning(f"⚠️  Text truncated to {EXTRACT_MAX_CHARS} characters")
+        cleaned_text = cleaned_text[:EXTRACT_MAX_CHARS]
     
-    return cleaned_text
+    return ExtractedText(cleaned_text, None, None, truncated, None, False, budget_exceeded, None)
+
+
+def extract_text(file_path):
+    """
+    Main extraction function that detects file type and extracts text accordingly.
+    
+    Args:
+        file_path (str): Path to the resume file
+        
+    Returns:
+        str: Cleaned extracted text
+        
+    Raises:
+        ValueError: If file extension is not supported
+        Exception: If extraction fails
+    """
+    return extract_document(file_path).text
@@ -0,0 +1,61 @@
+"""
+Copy shared/skill_matcher.py into every service that imports it.
+
+The Python services run from their own directories, so each ships its own
+copy of the matcher. This script keeps those copies identical to the shared
+file; with --check it only reports copies that differ (exit status 1).
+
+Run from the repository root:
+    python shared/sync_skill_matcher.py
+    python shared/sync_skill_matcher.py --check
+"""
+
+import argparse
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE = os.path.join("shared", "skill_matcher.py")
+
+# Copy path -> service that imports it
+TARGETS = {
+    os.path.join("ml-service", "skill_matcher.py"): "ml-service",
+    os.path.join("server", "python-worker", "python-worker", "utils", "skill_matcher.py"): "python-worker",
+    os.path.join("backend", "app", "services", "skill_matcher.py"): "backend",
+    os.path.join("backend1", "backend", "app", "skill_matcher.py"): "backend1",
+}
+
+
+def _read(path):
+    try:
+        with open(os.path.join(ROOT, path), "rb") as file:
+            return file.read()
+    except FileNotFoundError:
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="Only report copies that differ")
+    args = parser.parse_args()
+
+    source = _read(SOURCE)
+    stale = [path for path in TARGETS if _read(path) != source]
+
+    if args.check:
+        for path in stale:
+            print(f"out of date: {path} ({TARGETS[path]})")
+        if stale:
+            print("run: python shared/sync_skill_matcher.py")
+        return 1 if stale else 0
+
+    for path in stale:
+        with open(os.path.join(ROOT, path), "wb") as file:
+            file.write(source)
+        print(f"updated {path} ({TARGETS[path]})")
+    print(f"{len(TARGETS)} copies in sync with {SOURCE}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())